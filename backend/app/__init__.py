@@ -0,0 +1,6 @@
+from .config import STARTUP_PROFILE
+from .startup import startup_profiler
+
+# Installed before any other app module loads, so their imports are timed too
+if STARTUP_PROFILE:
+    startup_profiler.install()
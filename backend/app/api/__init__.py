@@ -1,2 +1,3 @@
 from .routes import router
+from .admin import router as admin_router
 from .websocket import connection_manager, handle_game_message
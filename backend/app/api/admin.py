@@ -0,0 +1,139 @@
+from datetime import datetime
+import hmac
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel
+
+from ..config import ADMIN_TOKEN
+from ..profiling import MAX_PROFILE_SECONDS, SamplingProfiler, profile_for, slow_callback_detector
+from ..startup import startup_profiler
+from ..tracing import tracer
+
+
+def require_admin(x_admin_token: str = Header("")):
+    """Allow the request only with the configured admin token."""
+    if not ADMIN_TOKEN:
+        # Pretend the admin API does not exist when no token is configured
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+router = APIRouter(prefix="/api/admin", dependencies=[Depends(require_admin)])
+
+
+class SlowCallbackRequest(BaseModel):
+    threshold_ms: float = 100
+
+
+class TraceSamplingRequest(BaseModel):
+    sample_rate: float
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile(seconds: float = 10, interval_ms: float = 10, mode: Literal["cpu", "wall"] = "cpu"):
+    """
+    Sample the server for a few seconds and return collapsed stacks,
+    ready for flamegraph.pl or speedscope.
+    """
+    if not 0 < seconds <= MAX_PROFILE_SECONDS:
+        raise HTTPException(status_code=400, detail=f"seconds must be between 0 and {MAX_PROFILE_SECONDS}")
+    if interval_ms < 1:
+        raise HTTPException(status_code=400, detail="interval_ms must be at least 1")
+    if SamplingProfiler.running():
+        raise HTTPException(status_code=409, detail="A profile is already running")
+
+    profiler = await profile_for(seconds, interval_ms / 1000, mode)
+    return PlainTextResponse(
+        profiler.collapsed(),
+        headers={
+            "Content-Disposition": 'attachment; filename="profile.folded"',
+            "X-Profile-Samples": str(profiler.sample_count),
+        },
+    )
+
+
+@router.get("/startup")
+async def startup():
+    """How long the last boot took, by phase and (with STARTUP_PROFILE=1) by import."""
+    return startup_profiler.to_dict()
+
+
+@router.get("/slow-callbacks")
+async def slow_callbacks():
+    """Detector state and the most recent slow event loop steps."""
+    return {
+        "enabled": slow_callback_detector.installed,
+        "threshold_ms": (slow_callback_detector.threshold or 0) * 1000,
+        "recent": [s.to_dict() for s in slow_callback_detector.recent],
+    }
+
+
+@router.post("/slow-callbacks")
+async def enable_slow_callbacks(request: SlowCallbackRequest):
+    """Start logging event loop steps slower than threshold_ms."""
+    if request.threshold_ms <= 0:
+        raise HTTPException(status_code=400, detail="threshold_ms must be positive")
+    slow_callback_detector.install(request.threshold_ms / 1000)
+    return await slow_callbacks()
+
+
+@router.delete("/slow-callbacks")
+async def disable_slow_callbacks():
+    """Stop the slow callback detector."""
+    slow_callback_detector.uninstall()
+    return await slow_callbacks()
+
+
+@router.get("/traces")
+async def traces(format: Literal["jsonl", "chrome"] = "jsonl"):
+    """Export buffered hand spans as JSON lines or a Chrome trace (chrome://tracing, Perfetto)."""
+    if format == "chrome":
+        return JSONResponse(
+            tracer.export_chrome(),
+            headers={"Content-Disposition": 'attachment; filename="trace.json"'},
+        )
+    return PlainTextResponse("".join(tracer.export_jsonl()), media_type="application/x-ndjson")
+
+
+@router.post("/traces")
+async def set_trace_sampling(request: TraceSamplingRequest):
+    """Set the fraction of hands to trace (0 turns tracing off)."""
+    if not 0 <= request.sample_rate <= 1:
+        raise HTTPException(status_code=400, detail="sample_rate must be between 0 and 1")
+    tracer.sample_rate = request.sample_rate
+    return {"sample_rate": tracer.sample_rate, "spans": len(tracer.spans)}
+
+
+@router.delete("/traces")
+async def clear_traces():
+    """Empty the span buffer."""
+    tracer.clear()
+    return {"sample_rate": tracer.sample_rate, "spans": 0}
+
+
+@router.get("/hand-history")
+async def hand_history(
+    game_id: Optional[str] = None,
+    player: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    format: Literal["text", "jsonl"] = "text",
+):
+    """
+    Stream finished hands as PokerStars-style text or JSON lines: of one game,
+    or of every live and logged game, optionally for one player (with their
+    hole cards) and a time range (UTC unless given a timezone).
+    """
+    from ..game.history import game_events, stream_hand_histories
+
+    if game_id is not None and game_events(game_id) is None:
+        raise HTTPException(status_code=404, detail="Game not found")
+    extension, media_type = ("jsonl", "application/x-ndjson") if format == "jsonl" else ("txt", "text/plain")
+    return StreamingResponse(
+        stream_hand_histories(game_id, player, since, until, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="hands.{extension}"'},
+    )
@@ -0,0 +1,166 @@
+"""
+Inbound WebSocket messages.
+
+Every message type a client may send has a schema, a frozen dataclass, and
+is registered with its handler by @message_handler. parse_message turns raw
+text into (handler, schema instance) or raises MessageError: frames over
+MAX_MESSAGE_SIZE are refused before any decoding, and fields are checked
+against a field table compiled once at registration, so handlers (and the
+GameLoop behind them) only ever see well-formed, typed messages.
+
+Fields may be sent at the top level or, as older clients do, inside
+"params"; other keys are ignored.
+"""
+
+from dataclasses import MISSING, dataclass, field, fields
+import json
+from typing import Any, Awaitable, Callable, Optional, Union, get_args, get_origin, get_type_hints
+
+from ..config import MAX_MESSAGE_SIZE
+from ..game.actions import PreAction
+from ..game.game_loop import KNOWN_ACTIONS
+from .. import metrics
+
+try:
+    from orjson import loads as _loads
+except ImportError:  # Optional: stdlib decoder
+    _loads = json.loads
+
+MAX_AMOUNT = 10**12  # Far beyond any stack; keeps hostile integers out of the game code
+
+MESSAGES_REJECTED = metrics.counter(
+    "poker_messages_rejected_total", "Inbound WebSocket messages refused before dispatch", ("reason",)
+)
+
+
+class MessageError(ValueError):
+    """An inbound message that cannot be dispatched; the text is safe to send back."""
+
+    def __init__(self, message: str, reason: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+@dataclass(frozen=True, slots=True)
+class StartGame:
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class Pong:
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class Action:
+    action: str = field(metadata={"choices": KNOWN_ACTIONS})
+    amount: Optional[int] = field(default=None, metadata={"max": MAX_AMOUNT})
+
+
+@dataclass(frozen=True, slots=True)
+class SetPreAction:
+    pre_action: Optional[str] = field(default=None, metadata={"choices": frozenset(p.value for p in PreAction)})
+
+
+Handler = Callable[[str, str, Any], Awaitable[None]]
+
+
+@dataclass(frozen=True, slots=True)
+class _Field:
+    name: str
+    kind: type  # str or int
+    required: bool
+    default: Any
+    nullable: bool
+    choices: Optional[frozenset]
+    maximum: Optional[int]
+
+
+def _compile(schema: type) -> tuple[_Field, ...]:
+    """The field table parse_message checks messages of this schema against."""
+    hints = get_type_hints(schema)
+    compiled = []
+    for f in fields(schema):
+        kind, nullable = hints[f.name], False
+        if get_origin(kind) is Union and type(None) in get_args(kind):
+            (kind,) = [arg for arg in get_args(kind) if arg is not type(None)]
+            nullable = True
+        if kind not in (str, int):
+            raise TypeError(f"{schema.__name__}.{f.name}: unsupported field type {kind}")
+        compiled.append(_Field(
+            name=f.name,
+            kind=kind,
+            required=f.default is MISSING,
+            default=None if f.default is MISSING else f.default,
+            nullable=nullable,
+            choices=f.metadata.get("choices"),
+            maximum=f.metadata.get("max"),
+        ))
+    return tuple(compiled)
+
+
+# message type -> (schema, its field table, handler)
+_HANDLERS: dict[str, tuple[type, tuple[_Field, ...], Handler]] = {}
+
+
+def message_handler(msg_type: str, schema: type):
+    """Register the handler for one message type: handler(game_id, nickname, message)."""
+    table = _compile(schema)
+
+    def register(handler: Handler) -> Handler:
+        _HANDLERS[msg_type] = (schema, table, handler)
+        return handler
+    return register
+
+
+def _check(spec: _Field, value: Any) -> Any:
+    if value is None:
+        if spec.nullable:
+            return None
+        raise MessageError(f"Missing {spec.name}", "invalid_field")
+    if spec.kind is int:
+        # JSON numbers from JavaScript may arrive as floats (e.g. 60.0); bools are not numbers
+        if type(value) is float and value.is_integer():
+            value = int(value)
+        if type(value) is not int:
+            raise MessageError(f"{spec.name} must be a whole number", "invalid_field")
+        if value < 0 or (spec.maximum is not None and value > spec.maximum):
+            raise MessageError(f"{spec.name} out of range", "invalid_field")
+    elif type(value) is not str:
+        raise MessageError(f"{spec.name} must be a string", "invalid_field")
+    if spec.choices is not None and value not in spec.choices:
+        raise MessageError(f"Unknown {spec.name}: {value[:32]}", "invalid_field")
+    return value
+
+
+def parse_message(text: str) -> tuple[Handler, Any]:
+    """Check and decode one inbound message. Raises MessageError if it is refused."""
+    # Characters, not bytes: the frame is already a str, and this bounds the decoder's work
+    if len(text) > MAX_MESSAGE_SIZE:
+        raise MessageError("Message too large", "too_large")
+    try:
+        data = _loads(text)
+    except ValueError:
+        raise MessageError("Malformed message", "malformed") from None
+    if type(data) is not dict:
+        raise MessageError("Malformed message", "malformed")
+
+    msg_type = data.get("type")
+    entry = _HANDLERS.get(msg_type) if type(msg_type) is str else None
+    if entry is None:
+        shown = msg_type[:32] if type(msg_type) is str else msg_type
+        raise MessageError(f"Unknown message type: {shown}", "unknown_type")
+    schema, table, handler = entry
+
+    params = data.get("params")
+    if type(params) is not dict:
+        params = {}
+    values = {}
+    for spec in table:
+        value = data.get(spec.name, params.get(spec.name))
+        if value is None and not spec.nullable and not spec.required:
+            value = spec.default
+        if value is None and spec.required:
+            raise MessageError(f"No {spec.name} specified", "invalid_field")
+        values[spec.name] = _check(spec, value)
+    return handler, schema(**values)
@@ -0,0 +1,49 @@
+"""
+Inbound message rate limiting.
+
+Each game player (per game and nickname) and each lobby socket gets a token
+bucket: it holds up to `burst` tokens, refills at `rate` tokens a second, and
+every message takes one. Messages arriving at an empty bucket are dropped
+without a reply (replying would let a flood make the server do work again),
+and a connection that keeps sending into an empty bucket is disconnected.
+Bookkeeping is a few float operations per message, updated lazily when a
+message arrives; nothing runs between messages.
+"""
+
+from enum import Enum
+import time
+from typing import Optional
+
+
+class Verdict(str, Enum):
+    ALLOW = "allow"
+    DROP = "drop"
+    DISCONNECT = "disconnect"
+
+
+class TokenBucket:
+    """One connection's allowance of inbound messages."""
+
+    __slots__ = ("rate", "burst", "tokens", "updated", "strikes", "max_strikes")
+
+    def __init__(self, rate: float, burst: int, max_strikes: int, now: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic() if now is None else now
+        self.strikes = 0  # Messages dropped since the last one allowed
+        self.max_strikes = max_strikes
+
+    def take(self, now: Optional[float] = None) -> Verdict:
+        """Spend a token on one message, if there is one."""
+        if now is None:
+            now = time.monotonic()
+        tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if tokens >= 1:
+            self.tokens = tokens - 1
+            self.strikes = 0
+            return Verdict.ALLOW
+        self.tokens = tokens
+        self.strikes += 1
+        return Verdict.DISCONNECT if self.strikes >= self.max_strikes else Verdict.DROP
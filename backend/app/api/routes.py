@@ -1,9 +1,13 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
 
-from ..game import game_manager
+from ..game import game_manager, TABLE_PRESETS
 from ..db import get_leaderboard
-from .websocket import connection_manager
+from ..tournament import loaded_tournament_manager
+from .. import metrics
+from .admin import require_admin
+from .websocket import connection_manager, game_broadcast
 
 router = APIRouter(prefix="/api")
 
@@ -19,12 +23,26 @@ async def broadcast_lobby_update():
 
 class CreateGameRequest(BaseModel):
     nickname: str
+    table: str = "standard"  # A TABLE_PRESETS name
 
 
 class JoinGameRequest(BaseModel):
     nickname: str
 
 
+class AddBotRequest(BaseModel):
+    strategy: str = "equity"
+
+
+class CreateTournamentRequest(BaseModel):
+    nickname: str
+    table: str = "standard"  # A TABLE_PRESETS name; its seats are the table size
+
+
+class TournamentPlayerRequest(BaseModel):
+    nickname: str
+
+
 @router.get("/games")
 async def list_games():
     """List all games waiting for players."""
@@ -39,7 +57,11 @@ async def create_game(request: CreateGameRequest, background_tasks: BackgroundTa
     if not nickname:
         raise HTTPException(status_code=400, detail="Nickname is required")
 
-    game = game_manager.create_game(nickname)
+    config = TABLE_PRESETS.get(request.table)
+    if config is None:
+        raise HTTPException(status_code=400, detail=f"Unknown table type: {request.table}")
+
+    game = game_manager.create_game(nickname, config)
     background_tasks.add_task(broadcast_lobby_update)
     return {"game": game.to_dict()}
 
@@ -82,6 +104,135 @@ async def join_game(game_id: str, request: JoinGameRequest, background_tasks: Ba
     return {"game": game.to_dict()}
 
 
+@router.post("/games/{game_id}/bots")
+async def add_bot(game_id: str, request: AddBotRequest, background_tasks: BackgroundTasks):
+    """Fill a seat in a waiting game with a server-side bot."""
+    from ..bots import bot_manager
+
+    bot, error = bot_manager.add_bot(game_id, request.strategy)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+
+    game = game_manager.get_game(game_id)
+    background_tasks.add_task(broadcast_lobby_update)
+
+    async def notify_game_players():
+        await connection_manager.broadcast_to_game(game_id, {
+            "type": "player_joined",
+            "payload": {
+                "nickname": bot.nickname,
+                "game": game.to_dict()
+            }
+        })
+
+    background_tasks.add_task(notify_game_players)
+
+    return {"game": game.to_dict(), "nickname": bot.nickname}
+
+
+def _get_tournament(tournament_id: str):
+    # Until one is created, tournaments aren't even loaded
+    tournament_manager = loaded_tournament_manager()
+    return tournament_manager.get_tournament(tournament_id) if tournament_manager else None
+
+
+@router.get("/tournaments")
+async def list_tournaments():
+    """List tournaments that are registering or running."""
+    tournament_manager = loaded_tournament_manager()
+    if tournament_manager is None:
+        return {"tournaments": []}
+    from ..tournament import TournamentStatus
+
+    tournaments = [
+        t for t in tournament_manager.list_tournaments() if t.status != TournamentStatus.FINISHED
+    ]
+    return {"tournaments": [t.to_dict(leaders=3) for t in tournaments]}
+
+
+@router.post("/tournaments")
+async def create_tournament(request: CreateTournamentRequest):
+    """Create a tournament; the creator is registered and starts it."""
+    nickname = request.nickname.strip().lower()
+    if not nickname:
+        raise HTTPException(status_code=400, detail="Nickname is required")
+
+    config = TABLE_PRESETS.get(request.table)
+    if config is None:
+        raise HTTPException(status_code=400, detail=f"Unknown table type: {request.table}")
+
+    from ..tournament import tournament_manager
+    tournament = tournament_manager.create_tournament(nickname, config)
+    return {"tournament": tournament.to_dict()}
+
+
+@router.get("/tournaments/{tournament_id}")
+async def get_tournament(tournament_id: str, leaders: int = 10):
+    """Tournament status, tables, chip leaders and finishing places so far."""
+    tournament = _get_tournament(tournament_id)
+    if not tournament:
+        raise HTTPException(status_code=404, detail="Tournament not found")
+    return {"tournament": tournament.to_dict(leaders=leaders)}
+
+
+@router.get("/tournaments/{tournament_id}/players/{nickname}")
+async def get_tournament_player(tournament_id: str, nickname: str):
+    """A player's table, stack and rank (or finishing place once out)."""
+    tournament = _get_tournament(tournament_id)
+    if not tournament or not tournament.standings:
+        raise HTTPException(status_code=404, detail="Tournament not found or not started")
+
+    nickname = nickname.strip().lower()
+    if nickname in tournament.standings:
+        return {
+            "nickname": nickname,
+            "game_id": tournament.table_of.get(nickname),
+            "chips": tournament.standings.chips(nickname),
+            "rank": tournament.standings.rank(nickname),
+            "players_remaining": len(tournament.standings),
+        }
+    for placement in tournament.placements:
+        if placement["nickname"] == nickname:
+            return placement
+    raise HTTPException(status_code=404, detail="Player not in this tournament")
+
+
+@router.post("/tournaments/{tournament_id}/register")
+async def register_for_tournament(tournament_id: str, request: TournamentPlayerRequest):
+    """Register for a tournament that has not started."""
+    nickname = request.nickname.strip().lower()
+    if not nickname:
+        raise HTTPException(status_code=400, detail="Nickname is required")
+
+    tournament_manager = loaded_tournament_manager()
+    if tournament_manager is None:
+        raise HTTPException(status_code=400, detail="Tournament not found")
+    tournament, error = tournament_manager.register(tournament_id, nickname)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+    return {"tournament": tournament.to_dict()}
+
+
+@router.post("/tournaments/{tournament_id}/start")
+async def start_tournament(tournament_id: str, request: TournamentPlayerRequest):
+    """Seat the field and deal the first hands (creator only)."""
+    tournament_manager = loaded_tournament_manager()
+    if tournament_manager is None:
+        raise HTTPException(status_code=400, detail="Tournament not found")
+    tournament, error = tournament_manager.check_start(tournament_id, request.nickname.strip().lower())
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+
+    await tournament.start(game_broadcast)
+    return {"tournament": tournament.to_dict()}
+
+
+@router.get("/metrics", response_class=PlainTextResponse, dependencies=[Depends(require_admin)])
+async def metrics_endpoint():
+    """Metrics in the Prometheus text exposition format (admin token required)."""
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
+
 @router.get("/leaderboard")
 async def leaderboard(limit: int = 100):
     """Get all-time leaderboard rankings."""
@@ -0,0 +1,160 @@
+"""
+Read-only spectator channels.
+
+Each game with spectators has one SpectatorChannel. The game loop's
+broadcast hands it public events only; each event is JSON-encoded once and
+queued on the channel, and a pump task copies the text into every
+spectator's own bounded queue, drained by that spectator's writer task. So
+the game loop pays one encode and one queue put per event however many
+people are watching, and a slow spectator only ever backs up (and is then
+dropped from) its own queue.
+
+With a delay (SPECTATOR_DELAY_SECONDS), events reach spectators that much
+later and everyone's hole cards are revealed too, TV style: they are
+gathered from the private hand_started messages and published lazily, as
+one event in front of the hand's next public event.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+from fastapi import WebSocket
+
+from ..config import SPECTATOR_DELAY_SECONDS, SPECTATOR_QUEUE_SIZE
+from .. import metrics
+
+logger = logging.getLogger(__name__)
+
+_SPECTATOR_MESSAGES_SENT = metrics.MESSAGES_SENT.labels("spectator")
+SPECTATORS_DROPPED = metrics.counter(
+    "poker_spectators_dropped_total", "Spectators disconnected for falling too far behind"
+)
+
+
+class Spectator:
+    """One spectator socket and the queue of encoded messages waiting to be sent to it."""
+
+    def __init__(self, channel: "SpectatorChannel", websocket: WebSocket):
+        self.channel = channel
+        self.websocket = websocket
+        self.queue: asyncio.Queue[str] = asyncio.Queue(SPECTATOR_QUEUE_SIZE)
+        self.task = asyncio.create_task(self._write())
+
+    def push(self, text: str) -> bool:
+        """Queue a message without waiting. Returns False if this spectator is too far behind."""
+        try:
+            self.queue.put_nowait(text)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    async def _write(self):
+        try:
+            while True:
+                text = await self.queue.get()
+                await self.websocket.send_text(text)
+                if metrics.enabled:
+                    _SPECTATOR_MESSAGES_SENT.inc()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # The socket is gone; the receive loop will see the disconnect too
+            self.channel.remove(self)
+
+    def close(self):
+        self.task.cancel()
+
+
+class SpectatorChannel:
+    """All spectators of one game, fed from a single encoded copy of each event."""
+
+    def __init__(self, game_id: str, delay: float = SPECTATOR_DELAY_SECONDS):
+        self.game_id = game_id
+        self.delay = delay
+        self.spectators: dict[WebSocket, Spectator] = {}
+        self.queue: asyncio.Queue[tuple[float, str]] = asyncio.Queue()  # (due time, encoded event)
+        self._pending_cards: dict[str, list] = {}  # Hole cards not yet revealed (delayed channels)
+        self._pending_hand: Optional[int] = None
+        self._pump = asyncio.create_task(self._fan_out())
+
+    def __len__(self) -> int:
+        return len(self.spectators)
+
+    @property
+    def reveals_cards(self) -> bool:
+        return self.delay > 0
+
+    def add(self, websocket: WebSocket) -> Spectator:
+        spectator = Spectator(self, websocket)
+        self.spectators[websocket] = spectator
+        return spectator
+
+    def remove(self, spectator: Spectator):
+        if self.spectators.pop(spectator.websocket, None) is not None:
+            spectator.close()
+
+    def close(self):
+        for spectator in list(self.spectators.values()):
+            self.remove(spectator)
+        self._pump.cancel()
+
+    def send_snapshot(self, spectator: Spectator, text: str):
+        """The state on joining goes through the same delay as the events that follow it."""
+        if self.delay > 0:
+            asyncio.get_running_loop().call_later(self.delay, spectator.push, text)
+        else:
+            spectator.push(text)
+
+    def publish(self, message: dict, viewer_nickname: Optional[str] = None):
+        """
+        Offer a game loop event to spectators (called from the broadcast
+        callback, so it never waits). Private messages are dropped, except
+        that a delayed channel keeps the hole cards from hand_started.
+        """
+        from .websocket import encode_message
+
+        if not self.spectators:
+            return
+        if viewer_nickname:
+            if self.reveals_cards and message["type"] == "hand_started":
+                payload = message["payload"]
+                if payload["hand_number"] != self._pending_hand:
+                    self._pending_hand = payload["hand_number"]
+                    self._pending_cards = {}
+                self._pending_cards[viewer_nickname] = payload["hole_cards"]
+            return
+
+        if self._pending_cards:
+            self._enqueue(encode_message({
+                "type": "hole_cards",
+                "payload": {"hand_number": self._pending_hand, "hole_cards": self._pending_cards},
+            }))
+            self._pending_cards = {}
+        self._enqueue(encode_message(message))
+
+    def _enqueue(self, text: str):
+        self.queue.put_nowait((asyncio.get_running_loop().time() + self.delay, text))
+
+    async def _fan_out(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            due, text = await self.queue.get()
+            # Events are queued in order, so holding back the oldest delays them all equally
+            wait = due - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            lagging = [s for s in list(self.spectators.values()) if not s.push(text)]
+            for spectator in lagging:
+                logger.info("Dropping spectator of game %s: too far behind", self.game_id)
+                if metrics.enabled:
+                    SPECTATORS_DROPPED.inc()
+                self.remove(spectator)
+                asyncio.create_task(_close_quietly(spectator.websocket))
+
+
+async def _close_quietly(websocket: WebSocket):
+    try:
+        await websocket.close(code=4001, reason="Too far behind")
+    except Exception:
+        pass
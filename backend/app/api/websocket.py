@@ -1,8 +1,69 @@
 from fastapi import WebSocket, WebSocketDisconnect
 from typing import Optional
+import asyncio
 import json
+import time
 
+from ..config import (
+    GAME_MESSAGE_BURST, GAME_MESSAGE_RATE, HEARTBEAT_INTERVAL_SECONDS, HEARTBEAT_TIMEOUT_SECONDS,
+    LOBBY_MESSAGE_BURST, LOBBY_MESSAGE_RATE, MAX_SPECTATORS_PER_GAME, RATE_LIMIT_MAX_STRIKES,
+)
 from ..game import game_manager, GameStatus
+from ..game.actions import PreAction
+from ..game.game_loop import get_game_loop
+from ..game.presence import Presence, presence_board
+from ..bots import loaded_bot_manager
+from .. import metrics
+from ..tracing import tracer
+from .messages import (
+    MESSAGES_REJECTED, Action, MessageError, Pong, SetPreAction, StartGame, message_handler, parse_message,
+)
+from .ratelimit import TokenBucket, Verdict
+from .spectators import SpectatorChannel
+
+_GAME_BROADCAST_SECONDS = metrics.BROADCAST_SECONDS.labels("game")
+_LOBBY_BROADCAST_SECONDS = metrics.BROADCAST_SECONDS.labels("lobby")
+_GAME_MESSAGES_SENT = metrics.MESSAGES_SENT.labels("game")
+_LOBBY_MESSAGES_SENT = metrics.MESSAGES_SENT.labels("lobby")
+MESSAGES_THROTTLED = metrics.counter(
+    "poker_messages_throttled_total", "Inbound WebSocket messages dropped by the rate limiter", ("channel",)
+)
+RATE_LIMIT_DISCONNECTS = metrics.counter(
+    "poker_rate_limit_disconnects_total", "Connections closed for flooding", ("channel",)
+)
+CONNECTIONS_REAPED = metrics.counter(
+    "poker_connections_reaped_total", "Connections closed for not answering heartbeats", ("channel",)
+)
+
+
+def encode_message(message: dict) -> str:
+    """JSON-encode an outgoing message (once, however many recipients it has)."""
+    with tracer.child("encode"):
+        if not metrics.enabled:
+            return json.dumps(message)
+        start = time.perf_counter()
+        text = json.dumps(message)
+        metrics.ENCODE_SECONDS.observe(time.perf_counter() - start)
+        return text
+
+
+async def _close_quietly(websocket: WebSocket, code: int, reason: str):
+    try:
+        await websocket.close(code=code, reason=reason)
+    except Exception:
+        pass
+
+
+class Peer:
+    """A lobby, game or spectator socket (a game_id without a nickname) watched by the heartbeat."""
+
+    __slots__ = ("game_id", "nickname", "last_seen", "away")
+
+    def __init__(self, game_id: Optional[str] = None, nickname: Optional[str] = None):
+        self.game_id = game_id
+        self.nickname = nickname
+        self.last_seen = asyncio.get_running_loop().time()
+        self.away = False
 
 
 class ConnectionManager:
@@ -11,18 +72,28 @@ class ConnectionManager:
     def __init__(self):
         # game_id -> {nickname -> WebSocket}
         self._game_connections: dict[str, dict[str, WebSocket]] = {}
-        # Lobby subscribers (not in a game yet)
-        self._lobby_connections: list[WebSocket] = []
+        # Lobby subscribers (not in a game yet), with their inbound message allowance
+        self._lobby_connections: dict[WebSocket, TokenBucket] = {}
+        # game_id -> read-only spectators of that game
+        self._spectator_channels: dict[str, SpectatorChannel] = {}
+        # Spectator sockets' inbound message allowances (they should only answer pings)
+        self._spectator_buckets: dict[WebSocket, TokenBucket] = {}
+        # Inbound message allowances: game_id -> {nickname -> bucket} (kept across
+        # reconnects while the game has connections)
+        self._game_buckets: dict[str, dict[str, TokenBucket]] = {}
+        # Every lobby, game and spectator socket, for the heartbeat
+        self._peers: dict[WebSocket, Peer] = {}
 
     async def connect_to_lobby(self, websocket: WebSocket):
         """Add a connection to the lobby."""
         await websocket.accept()
-        self._lobby_connections.append(websocket)
+        self._lobby_connections[websocket] = TokenBucket(LOBBY_MESSAGE_RATE, LOBBY_MESSAGE_BURST, RATE_LIMIT_MAX_STRIKES)
+        self._peers[websocket] = Peer()
 
     def disconnect_from_lobby(self, websocket: WebSocket):
         """Remove a connection from the lobby."""
-        if websocket in self._lobby_connections:
-            self._lobby_connections.remove(websocket)
+        self._lobby_connections.pop(websocket, None)
+        self._peers.pop(websocket, None)
 
     async def connect_to_game(self, websocket: WebSocket, game_id: str, nickname: str) -> Optional[str]:
         """
@@ -41,44 +112,216 @@ class ConnectionManager:
         if game_id not in self._game_connections:
             self._game_connections[game_id] = {}
 
+        replaced = self._game_connections[game_id].get(nickname)
+        if replaced is not None:
+            self._peers.pop(replaced, None)
         self._game_connections[game_id][nickname] = websocket
+        self._peers[websocket] = Peer(game_id, nickname)
+        buckets = self._game_buckets.setdefault(game_id, {})
+        if nickname not in buckets:
+            buckets[nickname] = TokenBucket(GAME_MESSAGE_RATE, GAME_MESSAGE_BURST, RATE_LIMIT_MAX_STRIKES)
+        self._set_presence(game_id, nickname, Presence.CONNECTED)
         return None
 
-    def disconnect_from_game(self, game_id: str, nickname: str):
-        """Remove a player's connection from a game."""
-        if game_id in self._game_connections:
-            if nickname in self._game_connections[game_id]:
-                del self._game_connections[game_id][nickname]
-            if not self._game_connections[game_id]:
-                del self._game_connections[game_id]
+    def disconnect_from_game(self, game_id: str, nickname: str, websocket: Optional[WebSocket] = None):
+        """Remove a player's connection from a game (only if it is still `websocket`, when given)."""
+        if websocket is not None:
+            self._peers.pop(websocket, None)
+        connections = self._game_connections.get(game_id)
+        if connections is None or nickname not in connections:
+            return
+        if websocket is not None and connections[nickname] is not websocket:
+            return  # The player has already reconnected on a new socket
+        self._peers.pop(connections.pop(nickname), None)
+        if not connections:
+            del self._game_connections[game_id]
+            self._game_buckets.pop(game_id, None)
+        self._set_presence(game_id, nickname, Presence.GONE)
+
+    def _set_presence(self, game_id: str, nickname: str, presence: Presence):
+        if presence_board.get(game_id, nickname) == presence:
+            return
+        presence_board.set(game_id, nickname, presence)
+        loop = get_game_loop(game_id)
+        if loop:
+            loop.presence_changed(nickname)
+
+    def touch(self, websocket: WebSocket):
+        """Note that a client sent something: it is alive."""
+        peer = self._peers.get(websocket)
+        if peer is None:
+            return
+        peer.last_seen = asyncio.get_running_loop().time()
+        if peer.away:
+            peer.away = False
+            self._set_presence(peer.game_id, peer.nickname, Presence.CONNECTED)
+
+    async def run_heartbeat(
+        self, interval: float = HEARTBEAT_INTERVAL_SECONDS, timeout: float = HEARTBEAT_TIMEOUT_SECONDS
+    ):
+        """
+        Ping every lobby, game and spectator socket each interval, and close the ones
+        that have sent nothing for `timeout` (runs for the server's lifetime).
+        A player silent for two intervals is reported away.
+        """
+        loop = asyncio.get_running_loop()
+        ping = encode_message({"type": "ping"})
+        while True:
+            await asyncio.sleep(interval)
+            now = loop.time()
+            alive = []
+            for websocket, peer in list(self._peers.items()):
+                silent = now - peer.last_seen
+                if silent > timeout:
+                    self._reap(websocket, peer)
+                    continue
+                if silent > 2 * interval and peer.nickname and not peer.away:
+                    peer.away = True
+                    self._set_presence(peer.game_id, peer.nickname, Presence.AWAY)
+                alive.append(websocket)
+            if alive:
+                await asyncio.gather(*(self._ping(websocket, ping, interval) for websocket in alive))
+
+    async def _ping(self, websocket: WebSocket, text: str, timeout: float):
+        try:
+            await asyncio.wait_for(websocket.send_text(text), timeout)
+        except Exception:
+            pass  # A dead socket stops answering and is reaped
+
+    def _reap(self, websocket: WebSocket, peer: Peer):
+        if peer.nickname:
+            self.disconnect_from_game(peer.game_id, peer.nickname, websocket)
+            channel = "game"
+        elif peer.game_id:
+            self.disconnect_spectator(peer.game_id, websocket)
+            channel = "spectator"
+        else:
+            self.disconnect_from_lobby(websocket)
+            channel = "lobby"
+        if metrics.enabled:
+            CONNECTIONS_REAPED.labels(channel).inc()
+        # Its receive loop sees the close and finishes the usual disconnect
+        asyncio.create_task(_close_quietly(websocket, 4002, "No heartbeat"))
+
+    def check_game_message(self, game_id: str, nickname: str) -> Verdict:
+        """Rate-limit one inbound message from a player."""
+        bucket = self._game_buckets.get(game_id, {}).get(nickname)
+        if bucket is None:
+            return Verdict.ALLOW
+        return self._count_verdict(bucket.take(), "game")
+
+    def check_lobby_message(self, websocket: WebSocket) -> Verdict:
+        """Rate-limit one inbound message on a lobby socket."""
+        bucket = self._lobby_connections.get(websocket)
+        if bucket is None:
+            return Verdict.ALLOW
+        return self._count_verdict(bucket.take(), "lobby")
+
+    def check_spectator_message(self, websocket: WebSocket) -> Verdict:
+        """Rate-limit one inbound message on a spectator socket."""
+        bucket = self._spectator_buckets.get(websocket)
+        if bucket is None:
+            return Verdict.ALLOW
+        return self._count_verdict(bucket.take(), "spectator")
+
+    @staticmethod
+    def _count_verdict(verdict: Verdict, channel: str) -> Verdict:
+        if verdict is not Verdict.ALLOW and metrics.enabled:
+            MESSAGES_THROTTLED.labels(channel).inc()
+            if verdict is Verdict.DISCONNECT:
+                RATE_LIMIT_DISCONNECTS.labels(channel).inc()
+        return verdict
+
+    async def connect_spectator(self, websocket: WebSocket, game_id: str) -> Optional[str]:
+        """
+        Subscribe a read-only connection to a game's public events.
+        Returns error message if connection fails, None on success.
+        """
+        game = game_manager.get_game(game_id)
+        if not game:
+            return "Game not found"
+
+        channel = self._spectator_channels.get(game_id)
+        if channel and len(channel) >= MAX_SPECTATORS_PER_GAME:
+            return "Too many spectators"
+
+        await websocket.accept()
+        if channel is None:
+            channel = self._spectator_channels[game_id] = SpectatorChannel(game_id)
+        spectator = channel.add(websocket)
+        self._peers[websocket] = Peer(game_id)
+        self._spectator_buckets[websocket] = TokenBucket(LOBBY_MESSAGE_RATE, LOBBY_MESSAGE_BURST, RATE_LIMIT_MAX_STRIKES)
+        # Spectators see what everyone at the table sees: no hole cards
+        channel.send_snapshot(spectator, encode_message({
+            "type": "spectating",
+            "payload": {"game": game.to_dict(), "delay_seconds": channel.delay},
+        }))
+        return None
+
+    def disconnect_spectator(self, game_id: str, websocket: WebSocket):
+        """Remove a spectator, and the game's channel with its last spectator."""
+        self._peers.pop(websocket, None)
+        self._spectator_buckets.pop(websocket, None)
+        channel = self._spectator_channels.get(game_id)
+        if not channel:
+            return
+        spectator = channel.spectators.get(websocket)
+        if spectator:
+            channel.remove(spectator)
+        if not channel.spectators:
+            channel.close()
+            del self._spectator_channels[game_id]
+
+    def publish_to_spectators(self, game_id: str, message: dict, viewer_nickname: Optional[str] = None):
+        """Hand an event to the game's spectator channel, if anyone is watching (never waits)."""
+        channel = self._spectator_channels.get(game_id)
+        if channel:
+            channel.publish(message, viewer_nickname)
 
     async def broadcast_to_lobby(self, message: dict):
         """Send a message to all lobby subscribers."""
+        start = time.perf_counter() if metrics.enabled else 0.0
+        text = encode_message(message)
         dead_connections = []
-        for websocket in self._lobby_connections:
+        # Iterate over a snapshot: connections can change while we await sends
+        recipients = list(self._lobby_connections)
+        for websocket in recipients:
             try:
-                await websocket.send_text(json.dumps(message))
+                await websocket.send_text(text)
             except Exception:
                 dead_connections.append(websocket)
         for ws in dead_connections:
-            self._lobby_connections.remove(ws)
+            self.disconnect_from_lobby(ws)
+
+        if metrics.enabled:
+            _LOBBY_BROADCAST_SECONDS.observe(time.perf_counter() - start)
+            _LOBBY_MESSAGES_SENT.inc(len(recipients) - len(dead_connections))
 
     async def broadcast_to_game(self, game_id: str, message: dict, exclude_nickname: Optional[str] = None):
         """Send a message to all players in a game."""
         if game_id not in self._game_connections:
             return
 
+        start = time.perf_counter() if metrics.enabled else 0.0
+        text = encode_message(message)
+        sent = 0
         dead_connections = []
-        for nickname, websocket in self._game_connections[game_id].items():
+        # Iterate over a snapshot: players can connect while we await sends
+        for nickname, websocket in list(self._game_connections[game_id].items()):
             if nickname == exclude_nickname:
                 continue
             try:
-                await websocket.send_text(json.dumps(message))
+                await websocket.send_text(text)
+                sent += 1
             except Exception:
                 dead_connections.append(nickname)
 
         for nickname in dead_connections:
-            del self._game_connections[game_id][nickname]
+            self.disconnect_from_game(game_id, nickname)
+
+        if metrics.enabled:
+            _GAME_BROADCAST_SECONDS.observe(time.perf_counter() - start)
+            _GAME_MESSAGES_SENT.inc(sent)
 
     async def send_to_player(self, game_id: str, nickname: str, message: dict):
         """Send a message to a specific player in a game."""
@@ -88,78 +331,122 @@ class ConnectionManager:
             return
 
         try:
-            await self._game_connections[game_id][nickname].send_text(json.dumps(message))
+            await self._game_connections[game_id][nickname].send_text(encode_message(message))
         except Exception:
-            del self._game_connections[game_id][nickname]
+            self.disconnect_from_game(game_id, nickname)
+            return
+        if metrics.enabled:
+            _GAME_MESSAGES_SENT.inc()
 
     def get_game_connections(self, game_id: str) -> dict[str, WebSocket]:
         """Get all connections for a game."""
         return self._game_connections.get(game_id, {})
 
+    def collect_metrics(self):
+        """Update connection gauges (called at scrape time)."""
+        metrics.CONNECTIONS.labels("game").set(sum(len(c) for c in self._game_connections.values()))
+        metrics.CONNECTIONS.labels("lobby").set(len(self._lobby_connections))
+        metrics.CONNECTIONS.labels("spectator").set(sum(len(c) for c in self._spectator_channels.values()))
+
 
 # Singleton instance
 connection_manager = ConnectionManager()
+metrics.registry.add_collector(connection_manager.collect_metrics)
 
 
 async def game_broadcast(game_id: str, message: dict, viewer_nickname: Optional[str] = None):
     """Broadcast callback for game loop - sends to specific player or all players."""
-    if viewer_nickname:
-        # Send only to specific player
-        await connection_manager.send_to_player(game_id, viewer_nickname, message)
-    else:
-        # Broadcast to all players in game
-        await connection_manager.broadcast_to_game(game_id, message)
-
-
-async def handle_game_message(game_id: str, nickname: str, message: dict):
-    """Process a message from a player in a game."""
-    from ..game.game_loop import get_game_loop, create_game_loop
-
-    msg_type = message.get("type")
-
-    if msg_type == "start_game":
-        game, error = game_manager.start_game(game_id, nickname)
-        if error:
-            await connection_manager.send_to_player(game_id, nickname, {
-                "type": "error",
-                "payload": {"message": error}
-            })
+    with tracer.child("broadcast", type=message["type"], to=viewer_nickname or "all"):
+        if viewer_nickname:
+            # Send only to specific player
+            await connection_manager.send_to_player(game_id, viewer_nickname, message)
         else:
-            # Notify lobby that game is no longer available
-            await connection_manager.broadcast_to_lobby({
-                "type": "lobby_update",
-                "payload": {
-                    "games": [g.to_dict() for g in game_manager.list_waiting_games()]
-                }
-            })
-
-            # Create and start game loop
-            loop = create_game_loop(game, game_broadcast)
-            await loop.start_game()
-
-    elif msg_type == "action":
-        loop = get_game_loop(game_id)
-        if not loop:
-            await connection_manager.send_to_player(game_id, nickname, {
-                "type": "error",
-                "payload": {"message": "Game not active"}
-            })
-            return
+            # Broadcast to all players in game
+            await connection_manager.broadcast_to_game(game_id, message)
+        connection_manager.publish_to_spectators(game_id, message, viewer_nickname)
+        bot_manager = loaded_bot_manager()
+        if bot_manager is not None:
+            await bot_manager.dispatch(game_id, message, viewer_nickname)
 
-        action_type = message.get("action")
-        params = message.get("params", {})
 
-        if not action_type:
-            await connection_manager.send_to_player(game_id, nickname, {
-                "type": "error",
-                "payload": {"message": "No action specified"}
-            })
-            return
+@message_handler("start_game", StartGame)
+async def handle_start_game(game_id: str, nickname: str, message: StartGame):
+    from ..game.game_loop import create_game_loop
+
+    game, error = game_manager.start_game(game_id, nickname)
+    if error:
+        await connection_manager.send_to_player(game_id, nickname, {
+            "type": "error",
+            "payload": {"message": error}
+        })
+        return
+
+    # Notify lobby that game is no longer available
+    await connection_manager.broadcast_to_lobby({
+        "type": "lobby_update",
+        "payload": {
+            "games": [g.to_dict() for g in game_manager.list_waiting_games()]
+        }
+    })
+
+    # Create and start game loop
+    loop = create_game_loop(game, game_broadcast)
+    await loop.start_game()
+
+
+@message_handler("action", Action)
+async def handle_action(game_id: str, nickname: str, message: Action):
+    loop = get_game_loop(game_id)
+    if not loop:
+        await connection_manager.send_to_player(game_id, nickname, {
+            "type": "error",
+            "payload": {"message": "Game not active"}
+        })
+        return
+
+    params = {} if message.amount is None else {"amount": message.amount}
+    await loop.handle_action(nickname, message.action, params)
+
+
+@message_handler("pre_action", SetPreAction)
+async def handle_pre_action(game_id: str, nickname: str, message: SetPreAction):
+    loop = get_game_loop(game_id)
+    if not loop:
+        await connection_manager.send_to_player(game_id, nickname, {
+            "type": "error",
+            "payload": {"message": "Game not active"}
+        })
+        return
+
+    pre_action = PreAction(message.pre_action) if message.pre_action else None
+    error = loop.set_pre_action(nickname, pre_action)
+    if error:
+        await connection_manager.send_to_player(game_id, nickname, {
+            "type": "error",
+            "payload": {"message": error}
+        })
+        return
+    await connection_manager.send_to_player(game_id, nickname, {
+        "type": "pre_action",
+        "payload": {"pre_action": message.pre_action}
+    })
+
+
+@message_handler("pong", Pong)
+async def handle_pong(game_id: str, nickname: str, message: Pong):
+    pass  # Any message from the client counts as a heartbeat (see ConnectionManager.touch)
 
-        await loop.handle_action(nickname, action_type, params)
 
-    else:
+async def handle_game_message(game_id: str, nickname: str, text: str):
+    """Validate a raw message from a player in a game and dispatch it to its handler."""
+    try:
+        handler, message = parse_message(text)
+    except MessageError as e:
+        if metrics.enabled:
+            MESSAGES_REJECTED.labels(e.reason).inc()
         await connection_manager.send_to_player(game_id, nickname, {
             "type": "error",
-            "payload": {"message": f"Unknown message type: {msg_type}"}
+            "payload": {"message": str(e)}
         })
+        return
+    await handler(game_id, nickname, message)
@@ -0,0 +1,22 @@
+import sys
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from .manager import BotManager
+
+
+def __getattr__(name: str):
+    # Bots, and the equity code their strategies use, load on first use, not with the app
+    if name in ("Bot", "BotManager", "bot_manager"):
+        from . import manager
+        return getattr(manager, name)
+    if name == "STRATEGIES":
+        from .strategies import STRATEGIES
+        return STRATEGIES
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def loaded_bot_manager() -> Optional["BotManager"]:
+    """The bot manager if bots have been loaded, else None: no game has bots to notify or stop."""
+    manager = sys.modules.get(f"{__name__}.manager")
+    return manager.bot_manager if manager is not None else None
@@ -0,0 +1,209 @@
+"""
+Server-side bot seats.
+
+Bots join like any player (GameManager.join_game), see the events the game
+loop broadcasts (fed in by the broadcast callback) and act through
+GameLoop.handle_action. Each decision runs in a shared executor under a time
+budget; the event loop only builds the view and applies the result.
+"""
+
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+import logging
+import random
+import time
+from typing import Optional
+
+from ..config import BOT_DECISION_BUDGET_SECONDS, BOT_EXECUTOR, BOT_EXECUTOR_WORKERS, BOT_THINK_SECONDS
+from ..game.manager import game_manager
+from ..game.poker import Card
+from ..sim.policies import Decision, TurnView
+from .. import metrics
+from .strategies import STRATEGIES, decide
+
+logger = logging.getLogger(__name__)
+
+BOT_DECISION_SECONDS = metrics.histogram(
+    "poker_bot_decision_seconds", "Time for a bot strategy to decide, including executor queueing"
+)
+BOT_DECISION_TIMEOUTS = metrics.counter(
+    "poker_bot_decision_timeouts_total", "Bot decisions that missed the time budget"
+)
+
+
+def _log_task_error(task: asyncio.Task):
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Bot turn failed", exc_info=task.exception())
+
+
+class Bot:
+    """A bot seat: what it has been told about the current hand."""
+
+    def __init__(self, game_id: str, nickname: str, strategy: str):
+        self.game_id = game_id
+        self.nickname = nickname
+        self.strategy = strategy
+        self.rng = random.Random()
+        self.hand_number = 0
+        self.hole_cards: list[Card] = []
+        self.community_cards: list[Card] = []
+        self.task: Optional[asyncio.Task] = None
+
+    def on_event(self, message: dict):
+        msg_type = message["type"]
+        payload = message["payload"]
+        if msg_type == "hand_started":
+            self.hand_number = payload["hand_number"]
+            self.hole_cards = [Card.from_dict(c) for c in payload["hole_cards"]]
+            self.community_cards = []
+        elif msg_type == "community_cards":
+            self.community_cards = [Card.from_dict(c) for c in payload["all_community_cards"]]
+
+
+class BotManager:
+    """All bots in the process, by game."""
+
+    def __init__(self):
+        self._bots: dict[str, dict[str, Bot]] = {}
+        self._executor: Optional[Executor] = None
+
+    def add_bot(self, game_id: str, strategy: str = "equity") -> tuple[Optional[Bot], Optional[str]]:
+        """
+        Seat a new bot in a waiting game.
+        Returns (bot, error_message). If successful, error_message is None.
+        """
+        if strategy not in STRATEGIES:
+            return None, f"Unknown strategy: {strategy}"
+
+        game = game_manager.get_game(game_id)
+        if not game:
+            return None, "Game not found"
+
+        number = 1
+        while game.has_player(f"bot-{number}"):
+            number += 1
+        nickname = f"bot-{number}"
+
+        game, error = game_manager.join_game(game_id, nickname)
+        if error:
+            return None, error
+
+        bot = Bot(game_id, nickname, strategy)
+        self._bots.setdefault(game_id, {})[nickname] = bot
+        return bot, None
+
+    def is_bot(self, game_id: str, nickname: str) -> bool:
+        return nickname in self._bots.get(game_id, ())
+
+    def get_bots(self, game_id: str) -> list[Bot]:
+        return list(self._bots.get(game_id, {}).values())
+
+    def remove_game(self, game_id: str):
+        """Drop a game's bots and cancel any decision in progress."""
+        for bot in self._bots.pop(game_id, {}).values():
+            if bot.task and not bot.task.done():
+                bot.task.cancel()
+
+    async def dispatch(self, game_id: str, message: dict, viewer_nickname: Optional[str] = None):
+        """Deliver a game loop event to the game's bots (called by the broadcast callback)."""
+        bots = self._bots.get(game_id)
+        if not bots:
+            return
+
+        if viewer_nickname:
+            bot = bots.get(viewer_nickname)
+            if bot:
+                bot.on_event(message)
+            return
+
+        for bot in bots.values():
+            bot.on_event(message)
+
+        msg_type = message["type"]
+        if msg_type == "turn":
+            bot = bots.get(message["payload"]["current_player"])
+            if bot:
+                # Never act inside the broadcast: the game loop is mid-update
+                bot.task = asyncio.create_task(self.play_turn(bot, message["payload"]))
+                bot.task.add_done_callback(_log_task_error)
+        elif msg_type == "game_ended":
+            self.remove_game(game_id)
+
+    async def play_turn(self, bot: Bot, payload: dict):
+        from ..game.actions import get_current_player_nickname
+        from ..game.game_loop import get_game_loop
+
+        loop = get_game_loop(bot.game_id)
+        if not loop or not loop.game.active_hand:
+            return
+        game = loop.game
+        hand = game.active_hand
+        hand_number = game.current_hand_num
+        player_hand = hand.player_hands[bot.nickname]
+
+        view = TurnView(
+            nickname=bot.nickname,
+            valid_actions=payload["valid_actions"],
+            hole_cards=bot.hole_cards,
+            community_cards=bot.community_cards,
+            pot=payload["pot"],
+            current_bet=payload["current_bet"],
+            my_bet=player_hand.current_bet,
+            chips=game.get_player(bot.nickname).chips,
+            opponents=hand.players_in_hand - 1,
+        )
+
+        start = time.perf_counter()
+        decision = await self.decide(bot, view)
+        remaining = BOT_THINK_SECONDS - (time.perf_counter() - start)
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+
+        # The turn may have timed out while we were thinking
+        if game.current_hand_num != hand_number or get_current_player_nickname(game) != bot.nickname:
+            return
+        await loop.handle_action(bot.nickname, decision.action, decision.params)
+
+    async def decide(self, bot: Bot, view: TurnView) -> Decision:
+        """Run the bot's strategy off the event loop; check/fold if it is too slow or fails."""
+        start = time.perf_counter()
+        future = asyncio.get_running_loop().run_in_executor(
+            self.executor, decide, bot.strategy, view, bot.rng.getrandbits(64)
+        )
+        try:
+            return await asyncio.wait_for(future, BOT_DECISION_BUDGET_SECONDS)
+        except asyncio.TimeoutError:
+            BOT_DECISION_TIMEOUTS.inc()
+            logger.warning("Bot %s in game %s ran out of time", bot.nickname, bot.game_id)
+        except Exception:
+            logger.exception("Bot %s in game %s failed to decide", bot.nickname, bot.game_id)
+        finally:
+            if metrics.enabled:
+                BOT_DECISION_SECONDS.observe(time.perf_counter() - start)
+        return Decision("check") if "check" in view.valid_actions else Decision("fold")
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if BOT_EXECUTOR == "process":
+                # Only imported when configured; most deployments use threads
+                from concurrent.futures import ProcessPoolExecutor
+                import multiprocessing
+                # spawn: forking a process that runs an event loop and threads is unsafe
+                self._executor = ProcessPoolExecutor(
+                    BOT_EXECUTOR_WORKERS, mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._executor = ThreadPoolExecutor(BOT_EXECUTOR_WORKERS, thread_name_prefix="bot")
+        return self._executor
+
+    def shutdown(self):
+        for game_id in list(self._bots):
+            self.remove_game(game_id)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Singleton instance
+bot_manager = BotManager()
@@ -0,0 +1,92 @@
+"""
+Bot strategies.
+
+A strategy is a simulator Policy: a plain function of (TurnView, Random) that
+returns a Decision. Strategies run in an executor, so they may take a while
+(e.g. an equity simulation), but they must not touch game state directly.
+"""
+
+import random
+
+from ..game.equity import equity
+from ..game.poker import HandRank, hand_value, preflop_equity
+from ..sim.policies import POLICIES, Decision, Policy, TurnView
+
+# hand_value packs the hand class above five 4-bit tiebreakers
+_CLASS_SHIFT = 20
+
+
+def _fallback(view: TurnView) -> Decision:
+    """Check if it is free, otherwise fold."""
+    return Decision("check") if "check" in view.valid_actions else Decision("fold")
+
+
+def _pot_raise(view: TurnView, fraction: float) -> Decision:
+    """Raise by a fraction of the pot, clamped to the legal range."""
+    to_call = view.to_call
+    target = view.current_bet + int(fraction * (view.pot + to_call))
+    return Decision("raise", max(view.min_raise_to, min(target, view.max_raise_to)))
+
+
+def _continue(view: TurnView) -> Decision:
+    return Decision("check") if "check" in view.valid_actions else Decision("call")
+
+
+def equity_policy(view: TurnView, rng: random.Random) -> Decision:
+    """
+    Bet for value with a clear edge, call when the pot odds are right,
+    otherwise check or fold. Preflop equity comes from the table, postflop
+    from the shared equity cache.
+    """
+    opponents = max(1, view.opponents)
+    eq = equity(view.hole_cards, view.community_cards, opponents)
+    fair_share = 1 / (opponents + 1)
+    to_call = view.to_call
+    pot_odds = to_call / (view.pot + to_call) if to_call else 0.0
+
+    if eq > 1.5 * fair_share and view.min_raise_to is not None and rng.random() < 0.8:
+        return _pot_raise(view, 0.5 + eq / 2)
+    if to_call == 0 or eq >= pot_odds + 0.03:
+        return _continue(view)
+    return _fallback(view)
+
+
+def table_policy(view: TurnView, rng: random.Random) -> Decision:
+    """
+    Cheap lookups only: the preflop table before the flop, then the made
+    hand class. No simulation, so it suits many bots on a small box.
+    """
+    to_call = view.to_call
+    if not view.community_cards:
+        eq = preflop_equity(view.hole_cards, min(max(1, view.opponents), 3))
+        fair_share = 1 / (min(max(1, view.opponents), 3) + 1)
+        if eq > 1.4 * fair_share and view.min_raise_to is not None:
+            return _pot_raise(view, 0.75)
+        if eq > fair_share or to_call <= view.pot // 4:
+            return _continue(view)
+        return _fallback(view)
+
+    made = hand_value(view.hole_cards + view.community_cards) >> _CLASS_SHIFT
+    if made >= HandRank.TWO_PAIR and view.min_raise_to is not None:
+        return _pot_raise(view, 0.66)
+    if made >= HandRank.PAIR or to_call == 0:
+        return _continue(view)
+    return _fallback(view)
+
+
+STRATEGIES: dict[str, Policy] = {
+    "equity": equity_policy,
+    "table": table_policy,
+    "passive": POLICIES["passive"],
+    "random": POLICIES["random"],
+}
+
+
+def decide(strategy: str, view: TurnView, seed: int) -> Decision:
+    """
+    Entry point for executor workers (a module-level function, so it pickles).
+    Takes a seed rather than the bot's Random: a process pool would get a
+    pickled copy of that, so the bot's own Random would never advance.
+    """
+    decision = STRATEGIES[strategy](view, random.Random(seed))
+    return decision if decision is not None else _fallback(view)
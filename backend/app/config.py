@@ -7,13 +7,80 @@ BIG_BLIND = 20
 HAND_LIMIT = 50
 TURN_TIMER_SECONDS = 30
 
-# Player limits
+# Player limits (MAX_SEATS is the largest table any preset may use)
 MIN_PLAYERS = 2
-MAX_PLAYERS = 4
+MAX_PLAYERS = 6
+MAX_SEATS = 10
 
-# Points awarded by placement (1st place = index 0)
+# Points awarded by placement (1st place = index 0); later places score 0
 POINTS_BY_PLACEMENT = [10, 5, 2, 1]
 
+# Tournaments: entrants allowed, and a per-table hand cap high enough never to end one early
+TOURNAMENT_MIN_ENTRANTS = 2
+TOURNAMENT_MAX_ENTRANTS = 1000
+TOURNAMENT_HAND_LIMIT = 1_000_000
+
+# Server-side bots: decisions run in an executor ("thread" shares the equity
+# cache across all tables; "process" sidesteps the GIL for heavy strategies)
+BOT_EXECUTOR = os.getenv("BOT_EXECUTOR", "thread")
+BOT_EXECUTOR_WORKERS = int(os.getenv("BOT_EXECUTOR_WORKERS", "4"))
+BOT_DECISION_BUDGET_SECONDS = 2.0  # Slower decisions fall back to check/fold
+BOT_THINK_SECONDS = 1.0  # Minimum time before a bot acts, so humans can follow
+
+# Inbound WebSocket messages longer than this (characters) are refused undecoded
+MAX_MESSAGE_SIZE = 2048
+
+# Inbound message rate limits (token buckets): a sustained rate per second and
+# a burst, per player in a game and per lobby or spectator socket (which only
+# ever answer pings). A connection that sends
+# this many messages in a row into an empty bucket is disconnected
+GAME_MESSAGE_RATE = float(os.getenv("GAME_MESSAGE_RATE", "5"))
+GAME_MESSAGE_BURST = int(os.getenv("GAME_MESSAGE_BURST", "10"))
+LOBBY_MESSAGE_RATE = float(os.getenv("LOBBY_MESSAGE_RATE", "1"))
+LOBBY_MESSAGE_BURST = int(os.getenv("LOBBY_MESSAGE_BURST", "5"))
+RATE_LIMIT_MAX_STRIKES = 50
+
+# Heartbeats: lobby and game sockets are pinged this often, and closed after
+# this long without any message from the client. A player whose socket is gone
+# is folded after a short grace instead of the full turn timer
+HEARTBEAT_INTERVAL_SECONDS = float(os.getenv("HEARTBEAT_INTERVAL_SECONDS", "15"))
+HEARTBEAT_TIMEOUT_SECONDS = float(os.getenv("HEARTBEAT_TIMEOUT_SECONDS", "45"))
+DISCONNECTED_TURN_SECONDS = 3
+
+# Game event logs (app/game/events.py) are also written as JSON lines to
+# <GAME_LOG_DIR>/<game id>.jsonl when this is set
+GAME_LOG_DIR = os.getenv("GAME_LOG_DIR", "")
+
+# All-in run-outs: once no more betting is possible the rest of the board is
+# dealt in one message; clients show a street this often, and the pause before
+# the next hand grows to match. Each player's chance of winning is attached
+# per street (exact from the flop, from this many sampled boards preflop; 0 = off)
+RUNOUT_STREET_SECONDS = float(os.getenv("RUNOUT_STREET_SECONDS", "1"))
+RUNOUT_EQUITY_TRIALS = int(os.getenv("RUNOUT_EQUITY_TRIALS", "500"))
+
+# Spectators: events reach them this many seconds late (0 = live, without
+# hole cards; with a delay everyone's hole cards are shown), and a spectator
+# this many messages behind is disconnected
+SPECTATOR_DELAY_SECONDS = float(os.getenv("SPECTATOR_DELAY_SECONDS", "0"))
+SPECTATOR_QUEUE_SIZE = 256
+MAX_SPECTATORS_PER_GAME = int(os.getenv("MAX_SPECTATORS_PER_GAME", "1000"))
+
+# Observability: set METRICS_ENABLED=0 to turn off hot-path instrumentation
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") != "0"
+
+# Admin diagnostics (/api/admin/*) are disabled unless ADMIN_TOKEN is set
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+# Log the time each module import takes at startup (boot phases are always logged)
+STARTUP_PROFILE = os.getenv("STARTUP_PROFILE", "0") == "1"
+
+# Log event loop steps slower than this at startup (0 = off; can be toggled at runtime)
+SLOW_CALLBACK_MS = float(os.getenv("SLOW_CALLBACK_MS", "0"))
+
+# Fraction of hands recorded as trace spans (0 = off), and how many spans to keep
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0"))
+TRACE_BUFFER_SIZE = int(os.getenv("TRACE_BUFFER_SIZE", "20000"))
+
 # Database
 DATABASE_URL = os.getenv("DATABASE_URL", "")
 
@@ -1,3 +1,10 @@
 from .database import database, connect_db, disconnect_db
-from .models import metadata, game_results, game_result_players
-from .queries import create_tables, get_leaderboard
+from .queries import SCHEMA_VERSION, get_leaderboard, get_schema_version, migrate_schema, save_game_result
+
+
+def __getattr__(name: str):
+    # The SQLAlchemy table definitions load on first use, not with the app
+    if name in ("metadata", "game_results", "game_result_players"):
+        from . import models
+        return getattr(models, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,7 +1,14 @@
-from databases import Database
 from ..config import DATABASE_URL
 
-database = Database(DATABASE_URL) if DATABASE_URL else None
+
+def _create_database():
+    # Imported only when a database is configured: `databases` pulls in
+    # SQLAlchemy, the biggest import of a cold start
+    from databases import Database
+    return Database(DATABASE_URL)
+
+
+database = _create_database() if DATABASE_URL else None
 
 
 async def connect_db():
@@ -1,31 +1,86 @@
+from contextlib import contextmanager
+import logging
+import time
+import uuid
+
 from .database import database
+from .. import metrics
 
-CREATE_TABLES_STATEMENTS = [
-    """
-    CREATE TABLE IF NOT EXISTS game_results (
-        id VARCHAR(36) PRIMARY KEY,
-        played_at TIMESTAMP NOT NULL DEFAULT NOW()
-    )
-    """,
-    """
-    CREATE TABLE IF NOT EXISTS game_result_players (
-        id VARCHAR(36) PRIMARY KEY,
-        game_result_id VARCHAR(36) NOT NULL REFERENCES game_results(id) ON DELETE CASCADE,
-        nickname VARCHAR(50) NOT NULL,
-        placement INTEGER NOT NULL,
-        points_awarded INTEGER NOT NULL
-    )
-    """,
-    "CREATE INDEX IF NOT EXISTS idx_game_result_players_nickname ON game_result_players(nickname)",
-    "CREATE INDEX IF NOT EXISTS idx_game_result_players_game_result_id ON game_result_players(game_result_id)",
+logger = logging.getLogger(__name__)
+
+# Each migration runs once, in order, on the first boot that finds the
+# database behind it; migration N brings the schema to version N. Boots with
+# an up-to-date schema only read schema_version.
+MIGRATIONS: list[list[str]] = [
+    # 1: results tables (IF NOT EXISTS: databases from before versioning already have them)
+    [
+        """
+        CREATE TABLE IF NOT EXISTS game_results (
+            id VARCHAR(36) PRIMARY KEY,
+            played_at TIMESTAMP NOT NULL DEFAULT NOW()
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS game_result_players (
+            id VARCHAR(36) PRIMARY KEY,
+            game_result_id VARCHAR(36) NOT NULL REFERENCES game_results(id) ON DELETE CASCADE,
+            nickname VARCHAR(50) NOT NULL,
+            placement INTEGER NOT NULL,
+            points_awarded INTEGER NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_game_result_players_nickname ON game_result_players(nickname)",
+        "CREATE INDEX IF NOT EXISTS idx_game_result_players_game_result_id ON game_result_players(game_result_id)",
+    ],
 ]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+CREATE_SCHEMA_VERSION_TABLE = "CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)"
+
+
+@contextmanager
+def _timed(query: str):
+    """Record a query's latency."""
+    if not metrics.enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.DB_QUERY_SECONDS.labels(query).observe(time.perf_counter() - start)
+
 
+async def get_schema_version() -> int:
+    """The last migration applied to the database (0 for a new database)."""
+    try:
+        with _timed("schema_version"):
+            version = await database.fetch_val("SELECT MAX(version) FROM schema_version")
+    except Exception:
+        # No schema_version table: a new database, or one from before versioning
+        return 0
+    return version or 0
 
-async def create_tables():
-    """Create database tables if they don't exist."""
-    if database:
-        for statement in CREATE_TABLES_STATEMENTS:
-            await database.execute(statement)
+
+async def migrate_schema() -> int:
+    """Apply any migrations the database is missing. Returns how many ran."""
+    if not database:
+        return 0
+    version = await get_schema_version()
+    if version >= SCHEMA_VERSION:
+        return 0
+
+    async with database.transaction():
+        await database.execute(CREATE_SCHEMA_VERSION_TABLE)
+        for number in range(version + 1, SCHEMA_VERSION + 1):
+            for statement in MIGRATIONS[number - 1]:
+                with _timed("migrate_schema"):
+                    await database.execute(statement)
+            await database.execute(
+                "INSERT INTO schema_version (version) VALUES (:version)", values={"version": number}
+            )
+    logger.info("Migrated database schema from version %d to %d", version, SCHEMA_VERSION)
+    return SCHEMA_VERSION - version
 
 
 async def get_leaderboard(limit: int = 100):
@@ -43,5 +98,33 @@ async def get_leaderboard(limit: int = 100):
         ORDER BY total_points DESC
         LIMIT :limit
     """
-    rows = await database.fetch_all(query=query, values={"limit": limit})
+    with _timed("leaderboard"):
+        rows = await database.fetch_all(query=query, values={"limit": limit})
     return [dict(row._mapping) for row in rows]
+
+
+async def save_game_result(placements: list[dict]):
+    """Save a finished game's placements."""
+    if not database or not database.is_connected:
+        return
+    from .models import game_results, game_result_players
+
+    game_id = str(uuid.uuid4())
+
+    with _timed("save_game_result"):
+        # Insert game result
+        await database.execute(
+            game_results.insert().values(id=game_id)
+        )
+
+        # Insert player results
+        for placement in placements:
+            await database.execute(
+                game_result_players.insert().values(
+                    id=str(uuid.uuid4()),
+                    game_result_id=game_id,
+                    nickname=placement["nickname"],
+                    placement=placement["position"],
+                    points_awarded=placement["points"],
+                )
+            )
@@ -1,5 +1,6 @@
 from .models import Game, GamePlayer, GameStatus, Hand, PlayerHand, Pot, BettingRound
 from .manager import game_manager
+from .table_config import BlindLevel, TableConfig, TABLE_PRESETS
 from .poker import Card, Deck, Rank, Suit, HandRank, evaluate_hand, compare_hands
 from . import actions
 from . import game_loop
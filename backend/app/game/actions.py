@@ -1,8 +1,8 @@
 """Player actions for poker betting."""
 
+from enum import Enum
 from typing import Optional, Tuple
 from .models import Game, Hand, PlayerHand, BettingRound, Pot
-from ..config import BIG_BLIND
 
 
 class ActionError(Exception):
@@ -10,28 +10,42 @@ class ActionError(Exception):
     pass
 
 
-def get_current_player_nickname(game: Game) -> Optional[str]:
-    """Get the nickname of the player whose turn it is."""
-    if not game.active_hand:
-        return None
+class PreAction(str, Enum):
+    """A decision registered before the player's turn, played as soon as the turn comes."""
+    FOLD = "fold"
+    CHECK_FOLD = "check_fold"
+    CHECK = "check"  # Cancelled if someone bets first
+    CALL_ANY = "call_any"
 
-    active_players = game.get_active_players()
-    hand = game.active_hand
 
-    # Find players still in the hand (not folded, not all-in)
-    players_in_hand = [
-        p for p in active_players
-        if p.nickname in hand.player_hands
-        and not hand.player_hands[p.nickname].folded
-        and not hand.player_hands[p.nickname].is_all_in
-    ]
+def resolve_pre_action(pre_action: PreAction, valid_actions: dict) -> Optional[str]:
+    """The action a pre-action stands for now, or None if a bet has invalidated it."""
+    can_check = "check" in valid_actions
+    if pre_action == PreAction.FOLD:
+        return "fold"
+    if pre_action == PreAction.CHECK_FOLD:
+        return "check" if can_check else "fold"
+    if pre_action == PreAction.CHECK:
+        return "check" if can_check else None
+    return "check" if can_check else "call"
 
-    if not players_in_hand:
-        return None
 
-    # Current player based on index
-    idx = hand.current_player_idx % len(players_in_hand)
-    return players_in_hand[idx].nickname
+def betting_closed(hand: Hand) -> bool:
+    """No more betting is possible: at most one player can still act, and they owe nothing."""
+    ring = hand.action_ring
+    if len(ring) > 1:
+        return False
+    for seat in ring:
+        return hand.player_hands[hand.seats[seat]].current_bet >= hand.current_bet
+    return True
+
+
+def get_current_player_nickname(game: Game) -> Optional[str]:
+    """Get the nickname of the player whose turn it is."""
+    hand = game.active_hand
+    if not hand or hand.current_seat is None:
+        return None
+    return hand.seats[hand.current_seat]
 
 
 def validate_turn(game: Game, nickname: str) -> None:
@@ -92,7 +106,7 @@ def fold(game: Game, nickname: str) -> None:
     hand = game.active_hand
     player_hand = hand.player_hands[nickname]
     player_hand.folded = True
-    hand.players_acted_this_round.add(nickname)
+    hand.players_in_hand -= 1
 
     advance_action(game)
 
@@ -108,7 +122,6 @@ def check(game: Game, nickname: str) -> None:
     if to_call > 0:
         raise ActionError(f"Cannot check, must call {to_call} or fold")
 
-    hand.players_acted_this_round.add(nickname)
     advance_action(game)
 
 
@@ -129,13 +142,11 @@ def call(game: Game, nickname: str) -> int:
     actual_call = min(to_call, game_player.chips)
 
     game_player.chips -= actual_call
-    player_hand.current_bet += actual_call
-    player_hand.total_bet += actual_call
+    hand.add_bet(player_hand, actual_call)
 
     if game_player.chips == 0:
         player_hand.is_all_in = True
 
-    hand.players_acted_this_round.add(nickname)
     advance_action(game)
 
     return actual_call
@@ -170,21 +181,18 @@ def raise_bet(game: Game, nickname: str, total_amount: int) -> int:
     raise_amount = total_amount - hand.current_bet
 
     game_player.chips -= additional
-    player_hand.current_bet = total_amount
-    player_hand.total_bet += additional
+    hand.add_bet(player_hand, additional)
 
     # Update hand state
     hand.min_raise = max(hand.min_raise, raise_amount)
     hand.current_bet = total_amount
     hand.last_raiser = nickname
 
-    # Reset who needs to act (everyone except raiser who hasn't folded/all-in)
-    hand.players_acted_this_round = {nickname}
-
     if game_player.chips == 0:
         player_hand.is_all_in = True
 
-    advance_action(game)
+    # Everyone else still able to act must respond to the raise
+    advance_action(game, reopened=True)
 
     return additional
 
@@ -204,71 +212,61 @@ def all_in(game: Game, nickname: str) -> int:
     new_total = player_hand.current_bet + amount
 
     game_player.chips = 0
-    player_hand.current_bet = new_total
-    player_hand.total_bet += amount
+    hand.add_bet(player_hand, amount)
     player_hand.is_all_in = True
 
     # If this is a raise
-    if new_total > hand.current_bet:
+    reopened = new_total > hand.current_bet
+    if reopened:
         raise_amount = new_total - hand.current_bet
         hand.min_raise = max(hand.min_raise, raise_amount)
         hand.current_bet = new_total
         hand.last_raiser = nickname
-        # Reset who needs to act
-        hand.players_acted_this_round = {nickname}
-    else:
-        hand.players_acted_this_round.add(nickname)
 
-    advance_action(game)
+    advance_action(game, reopened=reopened)
 
     return amount
 
 
-def advance_action(game: Game) -> None:
+def advance_action(game: Game, reopened: bool = False) -> None:
     """
     Advance to the next player or next betting round.
-    This is called after each action.
+    This is called after each action by the current player; reopened means
+    the action raised, so everyone else who can still act must act again.
+
+    Constant time: the seats that can act form a ring, and the round ends
+    when the closing seat (the last one due to act) has acted.
     """
     hand = game.active_hand
-    active_players = game.get_active_players()
-
-    # Get players still in hand
-    players_in_hand = [
-        p for p in active_players
-        if p.nickname in hand.player_hands
-        and not hand.player_hands[p.nickname].folded
-    ]
+    seat = hand.current_seat
+    ring = hand.action_ring
+    player_hand = hand.player_hands[hand.seats[seat]]
 
     # Check if only one player remains (everyone else folded)
-    if len(players_in_hand) <= 1:
+    if hand.players_in_hand <= 1:
         # Hand is over, will be resolved in game loop
         hand.betting_round = BettingRound.SHOWDOWN
+        hand.current_seat = None
         return
 
-    # Players who can still act (not folded, not all-in)
-    can_act = [
-        p for p in players_in_hand
-        if not hand.player_hands[p.nickname].is_all_in
-    ]
-
-    # Check if betting round is complete
-    all_acted = all(
-        p.nickname in hand.players_acted_this_round
-        for p in can_act
-    )
+    next_seat = ring.next(seat)
+    if reopened:
+        # Action now closes with the player just before the raiser, unless
+        # nobody else can respond
+        round_over = ring.prev(seat) == seat
+        hand.closing_seat = ring.prev(seat)
+    else:
+        round_over = seat == hand.closing_seat
 
-    all_matched = all(
-        hand.player_hands[p.nickname].current_bet == hand.current_bet
-        or hand.player_hands[p.nickname].is_all_in
-        for p in players_in_hand
-    )
+    if player_hand.folded or player_hand.is_all_in:
+        ring.remove(seat)
 
-    if (all_acted and all_matched) or len(can_act) == 0:
+    if round_over or not ring:
         # Move to next betting round
         advance_betting_round(game)
     else:
         # Move to next player
-        hand.current_player_idx = (hand.current_player_idx + 1) % len(can_act)
+        hand.current_seat = next_seat
 
 
 def advance_betting_round(game: Game) -> None:
@@ -280,12 +278,9 @@ def advance_betting_round(game: Game) -> None:
 
     # Reset for new round
     hand.current_bet = 0
-    hand.players_acted_this_round = set()
+    hand.min_raise = hand.big_blind
     hand.last_raiser = None
 
-    for ph in hand.player_hands.values():
-        ph.current_bet = 0
-
     # Advance the round
     rounds = [BettingRound.PREFLOP, BettingRound.FLOP, BettingRound.TURN, BettingRound.RIVER, BettingRound.SHOWDOWN]
     current_idx = rounds.index(hand.betting_round)
@@ -293,47 +288,35 @@ def advance_betting_round(game: Game) -> None:
     if current_idx < len(rounds) - 1:
         hand.betting_round = rounds[current_idx + 1]
 
-    # Reset action to first active player after dealer
-    active_players = game.get_active_players()
-    players_can_act = [
-        p for p in active_players
-        if p.nickname in hand.player_hands
-        and not hand.player_hands[p.nickname].folded
-        and not hand.player_hands[p.nickname].is_all_in
-    ]
+    # Action starts with the first player after the button who can still act
+    open_round(hand, hand.action_ring.first_after(hand.dealer_position))
+
 
-    if players_can_act:
-        # Find first player after dealer
-        dealer_pos = game.dealer_position
-        for i in range(len(active_players)):
-            idx = (dealer_pos + 1 + i) % len(active_players)
-            player = active_players[idx]
-            if player in players_can_act:
-                hand.current_player_idx = players_can_act.index(player)
-                break
+def open_round(hand: Hand, first_seat: Optional[int]) -> None:
+    """Give the action to first_seat; the round closes with the player before it."""
+    hand.current_seat = first_seat
+    hand.closing_seat = hand.action_ring.prev(first_seat) if first_seat is not None else None
 
 
 def collect_bets_into_pot(game: Game) -> None:
-    """Collect all current bets into the pot(s), handling side pots."""
+    """Collect all current bets into the pot(s) and clear them, handling side pots."""
     hand = game.active_hand
 
-    # Get all players still in hand
-    active_players = game.get_active_players()
+    # Get all players still in hand, in seat order
     players_in_hand = [
-        p.nickname for p in active_players
-        if p.nickname in hand.player_hands
-        and not hand.player_hands[p.nickname].folded
+        nickname for nickname in hand.seats
+        if nickname is not None and not hand.player_hands[nickname].folded
     ]
 
-    # Get bets sorted by total amount
-    bets = [(nick, hand.player_hands[nick].total_bet) for nick in players_in_hand]
-    bets.sort(key=lambda x: x[1])
-
     # Simple pot collection for now (side pot logic can be enhanced)
-    total_collected = sum(ph.current_bet for ph in hand.player_hands.values())
+    total_collected = hand.round_bets
 
     if not hand.pots:
         hand.pots.append(Pot(amount=0, eligible_players=players_in_hand.copy()))
 
     hand.pots[0].amount += total_collected
     hand.pots[0].eligible_players = players_in_hand.copy()
+
+    for ph in hand.player_hands.values():
+        ph.current_bet = 0
+    hand.round_bets = 0
@@ -0,0 +1,156 @@
+"""
+Hand equity with a process-wide cache keyed by suit-isomorphic situations.
+
+Suits have no order in hold'em, so (A♠K♠ on Q♠7♦2♥) and (A♥K♥ on Q♥7♣2♦)
+have the same equity. canonicalize() gives both situations one key: each
+suit is described by the ranks it holds in the hole and on the board, and
+the suits are relabelled in sorted order of those descriptions. This is
+equivalent to trying all 24 suit permutations and keeping the smallest
+form, but it costs one pass over the cards.
+"""
+
+from functools import lru_cache
+from itertools import combinations
+import random
+from typing import Iterable
+
+from .poker import FULL_DECK, Card, Rank, Suit, hand_value, preflop_table, starting_hand_index
+from .. import metrics
+
+# Distinct situations kept; a flop key is ~100 bytes, so this is a few MB
+EQUITY_CACHE_SIZE = 50_000
+# Monte Carlo deals per equity calculation (standard error about 0.5%)
+EQUITY_TRIALS = 5_000
+
+# (hole rank mask, board rank mask) for each of the 4 suits, in canonical order
+CanonicalKey = tuple[tuple[int, int], ...]
+
+
+def _rank_masks(cards: Iterable[Card]) -> list[int]:
+    masks = [0, 0, 0, 0]
+    for card in cards:
+        masks[card.suit] |= 1 << card.rank
+    return masks
+
+
+def canonicalize(hole_cards: list[Card], board: list[Card]) -> CanonicalKey:
+    """Key shared by every suit permutation of the same hole cards and board."""
+    return tuple(sorted(zip(_rank_masks(hole_cards), _rank_masks(board)), reverse=True))
+
+
+def _cards_from_masks(masks: Iterable[int]) -> list[Card]:
+    cards = []
+    for suit, mask in zip(Suit, masks):
+        for rank in Rank:
+            if mask >> rank & 1:
+                cards.append(Card(rank, suit))
+    return cards
+
+
+def canonical_cards(key: CanonicalKey) -> tuple[list[Card], list[Card]]:
+    """The representative hole cards and board for a key (suits relabelled in key order)."""
+    return _cards_from_masks(h for h, _ in key), _cards_from_masks(b for _, b in key)
+
+
+def equity(hole_cards: list[Card], board: list[Card], opponents: int = 1) -> float:
+    """
+    Share of the pot these hole cards win on average (ties split) against
+    random hands, given the board so far. Preflop uses the precomputed table;
+    otherwise results are cached by canonical situation.
+    """
+    if not board and opponents <= preflop_table().max_opponents:
+        return preflop_table().equity(starting_hand_index(hole_cards), opponents)
+    return _cached_equity(canonicalize(hole_cards, board), opponents)
+
+
+# lru_cache is thread-safe, so executor threads (e.g. bots) can share it
+@lru_cache(maxsize=EQUITY_CACHE_SIZE)
+def _cached_equity(key: CanonicalKey, opponents: int) -> float:
+    hole_cards, board = canonical_cards(key)
+    # Seeded by the situation, so a result never depends on which table asked first
+    return simulate_equity(hole_cards, board, opponents, EQUITY_TRIALS, random.Random(hash((key, opponents))))
+
+
+def simulate_equity(
+    hole_cards: list[Card], board: list[Card], opponents: int, trials: int, rng: random.Random
+) -> float:
+    """Monte Carlo equity: deal the rest of the board and the opponents' hands."""
+    used = set(hole_cards) | set(board)
+    deck = [c for c in FULL_DECK if c not in used]
+    missing = 5 - len(board)
+    needed = missing + 2 * opponents
+    won = 0.0
+    for _ in range(trials):
+        cards = rng.sample(deck, needed)
+        full_board = board + cards[:missing]
+        mine = hand_value(hole_cards + full_board)
+        ties = 1
+        for i in range(missing, needed, 2):
+            value = hand_value(cards[i:i + 2] + full_board)
+            if value > mine:
+                break
+            if value == mine:
+                ties += 1
+        else:
+            won += 1.0 / ties
+    return won / trials
+
+
+def showdown_equity(hands: list[list[Card]], board: list[Card], trials: int, rng: random.Random) -> list[float]:
+    """
+    Each hand's share of the pot (ties split) against the others, all hole
+    cards known: exact when at most two board cards are to come, otherwise
+    from `trials` sampled boards.
+    """
+    used = set(board).union(*hands)
+    deck = [c for c in FULL_DECK if c not in used]
+    missing = 5 - len(board)
+    if missing <= 2:
+        boards = combinations(deck, missing)
+    else:
+        boards = (rng.sample(deck, missing) for _ in range(trials))
+    shares = [0.0] * len(hands)
+    count = 0
+    for rest in boards:
+        full_board = board + list(rest)
+        values = [hand_value(hole + full_board) for hole in hands]
+        best = max(values)
+        winners = [i for i, value in enumerate(values) if value == best]
+        for i in winners:
+            shares[i] += 1.0 / len(winners)
+        count += 1
+    return [share / count for share in shares]
+
+
+def runout_equity(hands: list[list[Card]], boards: list[list[Card]], trials: int) -> list[list[float]]:
+    """
+    showdown_equity at each stage of a run-out, seeded by the cards so a
+    replayed deal gets the same numbers. Tens of milliseconds preflop, so
+    callers on the event loop run it in an executor.
+    """
+    dealt = [c for hole in hands for c in hole]
+    return [
+        showdown_equity(hands, board, trials, random.Random(hash((*dealt, *board))))
+        for board in boards
+    ]
+
+
+def cache_info():
+    return _cached_equity.cache_info()
+
+
+def clear_cache():
+    _cached_equity.cache_clear()
+
+
+def _collect_metrics():
+    info = _cached_equity.cache_info()
+    EQUITY_CACHE_HITS.set_total(info.hits)
+    EQUITY_CACHE_MISSES.set_total(info.misses)
+    EQUITY_CACHE_ENTRIES.set(info.currsize)
+
+
+EQUITY_CACHE_HITS = metrics.counter("poker_equity_cache_hits_total", "Equity lookups answered from the cache")
+EQUITY_CACHE_MISSES = metrics.counter("poker_equity_cache_misses_total", "Equity lookups that ran a simulation")
+EQUITY_CACHE_ENTRIES = metrics.gauge("poker_equity_cache_entries", "Situations in the equity cache")
+metrics.registry.add_collector(_collect_metrics)
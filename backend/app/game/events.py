@@ -0,0 +1,397 @@
+"""
+Event-sourced game state.
+
+Every state transition GameLoop makes is a compact event (a small dict with a
+type "t"), applied to the Game by apply_event and appended to the game's
+GameLog. The loop decides what happens (who acts, which cards are dealt, who
+won); apply_event only carries it out, using the same functions in
+actions.py, so replaying a log rebuilds exactly the state the live game had:
+
+    start   players, seats, stacks and table config
+    deal    a hand: number, button, blinds and each player's hole cards
+    blinds  post the blinds and give the action to the first player
+    act     a player's action ("to" is the raise-to amount)
+    street  the cards of the next street
+    runout  no more betting: the cards of each street left
+    award   chips won, by nickname
+    out     a player is eliminated
+    clear   the hand is over and leaves the table
+    end     final placements
+
+Cards are logged as they are dealt, never the deck or the randomness that
+shuffled it: live decks come from the OS CSPRNG, and a log shows nothing about
+cards that are still to come.
+
+A game-level snapshot is kept every SNAPSHOT_EVERY_HANDS hands, taken as a
+hand is cleared, so a replay starts from the latest snapshot instead of the first event.
+With GAME_LOG_DIR set each log is also written as JSON lines to
+<dir>/<game id>.jsonl, a hand at a time, by a background thread so the event
+loop never waits on the disk; load_log reads it back (e.g. to rebuild a game
+after a crash or to reproduce a bug report).
+
+Tournament tables log their hands too, but players moved between tables and
+tournament eliminations are not events, so only ordinary games replay; their
+start event is marked "tournament".
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from datetime import datetime
+import json
+import logging
+import os
+from typing import IO, Any, Iterable, Iterator, Optional
+
+from ..config import GAME_LOG_DIR
+from . import actions
+from .models import BettingRound, Game, GamePlayer, GameStatus, Hand, PlayerHand, Pot
+from .poker import Card
+from .seating import SeatRing, next_occupied
+from .table_config import BlindLevel, TableConfig
+
+SNAPSHOT_EVERY_HANDS = 10
+
+Event = dict[str, Any]
+
+logger = logging.getLogger(__name__)
+
+
+def start_event(game: Game, tournament: bool = False) -> Event:
+    event = {
+        "t": "start",
+        "id": game.id,
+        "creator": game.creator,
+        "created_at": game.created_at.isoformat(),
+        "config": asdict(game.config),
+        "players": [[p.nickname, p.seat, p.chips] for p in game.players],
+    }
+    if tournament:
+        event["tournament"] = True
+    return event
+
+
+def codes(cards: Iterable[Card]) -> list[str]:
+    """Cards as they are logged."""
+    return [c.code for c in cards]
+
+
+def _cards(codes: Iterable[str]) -> list[Card]:
+    return [Card.from_code(code) for code in codes]
+
+
+def new_game(event: Event) -> Game:
+    """The game a start event describes, before the event is applied."""
+    config = dict(event["config"])
+    config["blind_levels"] = tuple(BlindLevel(**level) for level in config["blind_levels"])
+    config["points_by_placement"] = tuple(config["points_by_placement"])
+    game = Game(
+        id=event["id"],
+        creator=event["creator"],
+        created_at=datetime.fromisoformat(event["created_at"]),
+        config=TableConfig(**config),
+    )
+    for nickname, seat, chips in event["players"]:
+        game.add_player(nickname, chips, seat=seat)
+    return game
+
+
+def apply_event(game: Game, event: Event) -> Any:
+    """
+    Carry out one transition. Returns what the transition produced (the
+    amount an action put in, the cards dealt, ...). Raises ActionError for an
+    action the rules don't allow, leaving the game unchanged.
+    """
+    return _REDUCERS[event["t"]](game, event)
+
+
+def _start(game: Game, event: Event):
+    game.status = GameStatus.ACTIVE
+    game.current_hand_num = 0
+    # The button starts on the first occupied seat
+    game.dealer_position = next_occupied(game.seats, len(game.seats) - 1)
+
+
+def _deal(game: Game, event: Event) -> Hand:
+    active_players = game.get_active_players()
+    seats = [
+        p.nickname if p is not None and not p.is_eliminated else None
+        for p in game.seats
+    ]
+    game.current_hand_num = event["n"]
+    game.dealer_position = event["button"]
+    hand = Hand(
+        hand_number=event["n"],
+        dealer_position=event["button"],
+        min_raise=event["bb"],
+        small_blind=event["sb"],
+        big_blind=event["bb"],
+        seats=seats,
+        players_in_hand=len(active_players),
+    )
+    hand.pots = [Pot(amount=0, eligible_players=[p.nickname for p in active_players])]
+    for player in active_players:
+        hand.player_hands[player.nickname] = PlayerHand(
+            nickname=player.nickname,
+            seat=player.seat,
+            hole_cards=_cards(event["hole"][player.nickname]),
+        )
+    game.active_hand = hand
+    return hand
+
+
+def _blinds(game: Game, event: Event) -> tuple[tuple[str, int], tuple[str, int]]:
+    """Post the blinds. Returns (small blind, big blind) as (nickname, amount)."""
+    hand = game.active_hand
+    if hand.players_in_hand == 2:
+        # Heads up: dealer is SB, other is BB
+        sb_seat = hand.dealer_position
+    else:
+        sb_seat = next_occupied(hand.seats, hand.dealer_position)
+    bb_seat = next_occupied(hand.seats, sb_seat)
+
+    posted = []
+    for seat, blind in ((sb_seat, hand.small_blind), (bb_seat, hand.big_blind)):
+        player = game.seats[seat]
+        amount = min(blind, player.chips)
+        player.chips -= amount
+        hand.add_bet(hand.player_hands[player.nickname], amount)
+        if player.chips == 0:
+            hand.player_hands[player.nickname].is_all_in = True
+        posted.append((player.nickname, amount))
+
+    # Blinds stay as open bets; they are collected into the pot with the other bets.
+    # A big blind all-in for less than the small blind doesn't lower the bet to call.
+    hand.current_bet = max(posted[0][1], posted[1][1])
+
+    # First to act is the player after the BB (the SB/dealer heads up);
+    # the BB closes the round if nobody raises
+    hand.action_ring = SeatRing(len(hand.seats), (
+        ph.seat for ph in hand.player_hands.values() if not ph.is_all_in
+    ))
+    actions.open_round(hand, hand.action_ring.first_after(bb_seat))
+    return posted[0], posted[1]
+
+
+def _act(game: Game, event: Event) -> Optional[int]:
+    nickname, action = event["p"], event["a"]
+    if action == "fold":
+        actions.fold(game, nickname)
+    elif action == "check":
+        actions.check(game, nickname)
+    elif action == "call":
+        return actions.call(game, nickname)
+    elif action == "raise":
+        return actions.raise_bet(game, nickname, event["to"])
+    elif action == "all_in":
+        return actions.all_in(game, nickname)
+    else:
+        raise actions.ActionError(f"Unknown action: {action}")
+    return None
+
+
+def _street(game: Game, event: Event) -> list[Card]:
+    cards = _cards(event["cards"])
+    game.active_hand.community_cards.extend(cards)
+    return cards
+
+
+def _runout(game: Game, event: Event) -> list[list]:
+    """Deal out the board with betting closed. Returns each street's cards."""
+    hand = game.active_hand
+    actions.collect_bets_into_pot(game)
+    hand.betting_round = BettingRound.SHOWDOWN
+    hand.current_seat = None
+    streets = [_cards(street) for street in event["streets"]]
+    for cards in streets:
+        hand.community_cards.extend(cards)
+    return streets
+
+
+def _award(game: Game, event: Event):
+    # Bets from an unfinished round (e.g. everyone folded) still belong in the pot
+    actions.collect_bets_into_pot(game)
+    for nickname, amount in event["won"].items():
+        game.get_player(nickname).chips += amount
+
+
+def _clear(game: Game, event: Event):
+    game.active_hand = None
+
+
+def _out(game: Game, event: Event) -> int:
+    """Eliminate a player. Returns their finishing position."""
+    player = game.get_player(event["p"])
+    player.is_eliminated = True
+    player.chips = 0
+    game.elimination_order.append(player.nickname)
+    player.elimination_position = len(game.players) - len(game.elimination_order) + 1
+    return player.elimination_position
+
+
+def _end(game: Game, event: Event) -> list[GamePlayer]:
+    """Finish the game. Returns the players still in, best stack first."""
+    game.status = GameStatus.FINISHED
+    active_players = sorted(game.get_active_players(), key=lambda p: p.chips, reverse=True)
+    for i, player in enumerate(active_players):
+        player.elimination_position = i + 1
+    return active_players
+
+
+_REDUCERS = {
+    "start": _start,
+    "deal": _deal,
+    "blinds": _blinds,
+    "act": _act,
+    "street": _street,
+    "runout": _runout,
+    "award": _award,
+    "out": _out,
+    "clear": _clear,
+    "end": _end,
+}
+
+
+def snapshot(game: Game) -> dict:
+    """The state of a game between hands, as JSON-ready data."""
+    return {
+        **start_event(game),
+        "t": "snap",
+        "status": game.status.value,
+        "current_hand_num": game.current_hand_num,
+        "dealer_position": game.dealer_position,
+        "elimination_order": list(game.elimination_order),
+        "eliminated": {
+            p.nickname: p.elimination_position for p in game.players if p.is_eliminated
+        },
+    }
+
+
+def restore(snap: dict) -> Game:
+    """The game a snapshot was taken of."""
+    game = new_game(snap)
+    game.status = GameStatus(snap["status"])
+    game.current_hand_num = snap["current_hand_num"]
+    game.dealer_position = snap["dealer_position"]
+    game.elimination_order = list(snap["elimination_order"])
+    for nickname, position in snap["eliminated"].items():
+        player = game.get_player(nickname)
+        player.is_eliminated = True
+        player.elimination_position = position
+    return game
+
+
+# Log files are written by one thread, so each log's writes stay in order
+_writer: Optional[ThreadPoolExecutor] = None
+
+
+def _log_writer() -> ThreadPoolExecutor:
+    global _writer
+    if _writer is None:
+        _writer = ThreadPoolExecutor(1, thread_name_prefix="game-log")
+    return _writer
+
+
+class GameLog:
+    """One game's events, with snapshots every SNAPSHOT_EVERY_HANDS hands."""
+
+    def __init__(self, game_id: str, directory: Optional[str] = None, snapshot_every: int = SNAPSHOT_EVERY_HANDS):
+        """directory defaults to GAME_LOG_DIR; "" keeps the log in memory only."""
+        if directory is None:
+            directory = GAME_LOG_DIR
+        self.game_id = game_id
+        self.events: list[Event] = []
+        self.snapshots: list[tuple[int, dict]] = []  # (events before it, snapshot)
+        self.snapshot_every = snapshot_every
+        self._hands_since_snapshot = 0
+        self._path = os.path.join(directory, f"{game_id}.jsonl") if directory else None
+        self._pending: list[str] = []  # Lines of the hand in play, written when it ends
+        self._file: Optional[IO[str]] = None  # Only used on the writer thread
+
+    def record(self, game: Game, event: Event) -> Any:
+        """Apply an event to the game and append it. Nothing is appended if it raises."""
+        result = apply_event(game, event)
+        self.events.append(event)
+        if self._path is not None:
+            self._pending.append(json.dumps(event, separators=(",", ":")) + "\n")
+        if event["t"] == "clear":
+            self._hands_since_snapshot += 1
+            if self._hands_since_snapshot >= self.snapshot_every:
+                self._add_snapshot(game)
+        if event["t"] in ("clear", "end"):
+            self._flush()
+        return result
+
+    def _add_snapshot(self, game: Game):
+        snap = snapshot(game)
+        self.snapshots.append((len(self.events), snap))
+        self._hands_since_snapshot = 0
+        if self._path is not None:
+            self._pending.append(json.dumps(snap, separators=(",", ":")) + "\n")
+
+    def replay(self, upto: Optional[int] = None) -> Game:
+        """The game as it was after the first `upto` events (all of them by default)."""
+        return replay(self.events, self.snapshots, upto)
+
+    def _flush(self):
+        if self._pending:
+            text = "".join(self._pending)
+            self._pending = []
+            _log_writer().submit(self._write, self._path, text)
+
+    def _write(self, path: str, text: str):
+        try:
+            if self._file is None:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                self._file = open(path, "a", encoding="utf-8")
+            self._file.write(text)
+            self._file.flush()
+        except OSError:
+            logger.exception("Could not write the log of game %s", self.game_id)
+
+    def close(self, wait: bool = False):
+        """Write what is left and close the file. With wait, block until it is on disk."""
+        if self._path is None:
+            return
+        self._flush()
+        done = _log_writer().submit(self._close_file)
+        self._path = None
+        if wait:
+            done.result()
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def replay(events: list[Event], snapshots: Iterable[tuple[int, dict]] = (), upto: Optional[int] = None) -> Game:
+    """Rebuild a game from its events, starting at the latest usable snapshot."""
+    upto = len(events) if upto is None else upto
+    start, base = 0, None
+    for index, snap in snapshots:  # In log order
+        if index <= upto:
+            start, base = index, snap
+    game = restore(base) if base is not None else new_game(events[0])
+    for event in events[start:upto]:
+        apply_event(game, event)
+    return game
+
+
+def iter_log(path: str) -> Iterator[Event]:
+    """Stream the lines of a log written with GAME_LOG_DIR, snapshots included."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break  # Cut short by a crash
+            yield json.loads(line)
+
+
+def load_log(path: str) -> tuple[list[Event], list[tuple[int, dict]]]:
+    """Read a log written with GAME_LOG_DIR: (events, snapshots)."""
+    events, snapshots = [], []
+    for event in iter_log(path):
+        if event["t"] == "snap":
+            snapshots.append((len(events), event))
+        else:
+            events.append(event)
+    return events, snapshots
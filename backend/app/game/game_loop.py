@@ -1,34 +1,94 @@
 """Full game loop management - hand lifecycle, dealing, showdown."""
 
 import asyncio
-import uuid
+import functools
+import logging
+import time
 from typing import Optional, Callable, Awaitable
 
-from .models import Game, Hand, PlayerHand, Pot, BettingRound, GameStatus
-from .poker import Deck, Card, evaluate_hand, compare_hands
-from .actions import fold, get_current_player_nickname
-from ..config import SMALL_BLIND, BIG_BLIND, HAND_LIMIT, TURN_TIMER_SECONDS, POINTS_BY_PLACEMENT
-from ..db import database, game_results, game_result_players
+from .models import Game, BettingRound, GameStatus
+from .poker import Card, Deck, evaluate_hand, new_rng
+from .actions import (
+    PreAction, betting_closed, fold, get_current_player_nickname, resolve_pre_action,
+)
+from .events import GameLog, codes, start_event
+from .presence import Presence, presence_board
+from .seating import next_occupied
+from ..config import DISCONNECTED_TURN_SECONDS, RUNOUT_EQUITY_TRIALS, RUNOUT_STREET_SECONDS
+from ..db import save_game_result
+from .. import metrics
+from ..tracing import NO_SPAN, tracer
+
+logger = logging.getLogger(__name__)
+
+# Pause between the end of one hand and the start of the next
+NEXT_HAND_DELAY_SECONDS = 3
+
+# Action names used as metric labels; anything else is counted as "invalid"
+KNOWN_ACTIONS = frozenset({"fold", "check", "call", "raise", "all_in"})
+
+_STREET_BY_BOARD_SIZE = {3: BettingRound.FLOP, 4: BettingRound.TURN, 5: BettingRound.RIVER}
+_BOARD_SIZE_BY_STREET = {street: size for size, street in _STREET_BY_BOARD_SIZE.items()}
+
+
+PRE_ACTIONS_PLAYED = metrics.counter(
+    "poker_pre_actions_played_total", "Turns played from a pre-action without prompting the player", ("pre_action",)
+)
 
 
 # Type for broadcast callback
 BroadcastCallback = Callable[[str, dict, Optional[str]], Awaitable[None]]
 
 
+def traced_step(name: str):
+    """Record a GameLoop coroutine method as a trace span when the hand is sampled."""
+    def decorator(method):
+        @functools.wraps(method)
+        async def wrapper(self: "GameLoop", *args, **kwargs):
+            if not self.traced:
+                return await method(self, *args, **kwargs)
+            with tracer.span(name, self.game.id, self.game.current_hand_num):
+                return await method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
 class GameLoop:
     """Manages the game loop for a single game."""
 
-    def __init__(self, game: Game, broadcast: BroadcastCallback):
+    # Tournament tables gain and lose players outside the event log, so their logs don't replay
+    in_tournament = False
+
+    def __init__(self, game: Game, broadcast: BroadcastCallback, seed: Optional[int] = None):
         self.game = game
         self.broadcast = broadcast  # async fn(game_id, message, viewer_nickname)
-        self.deck: Optional[Deck] = None
+        # Per-game RNG: OS CSPRNG by default, seeded PRNG for reproducible games
+        self.rng = new_rng(seed)
+        self.deck = Deck(self.rng)
+        self.log = GameLog(game.id)  # Every state transition, for replay
         self.turn_timer_task: Optional[asyncio.Task] = None
+        self.turn_deadline = 0.0  # Loop time the current turn's full timer runs out
+        # nickname -> (pre-action, hand number, betting round it was registered in)
+        self.pre_actions: dict[str, tuple[PreAction, int, BettingRound]] = {}
+        self.next_hand_task: Optional[asyncio.Task] = None
+        self.traced = False  # Whether the current hand is sampled for tracing
+        self.config = game.config
+        self.started_at = 0.0  # Loop time when play began (for timed blind levels)
+
+    def record(self, event: dict):
+        """Make a state transition: apply the event to the game and log it."""
+        return self.log.record(self.game, event)
+
+    def span(self, name: str, **attrs):
+        """Trace span for a step of the current hand (a no-op unless the hand is sampled)."""
+        if not self.traced:
+            return NO_SPAN
+        return tracer.span(name, self.game.id, self.game.current_hand_num, **attrs)
 
     async def start_game(self):
         """Start the game - called when creator starts it."""
-        self.game.status = GameStatus.ACTIVE
-        self.game.current_hand_num = 0
-        self.game.dealer_position = 0
+        self.record(start_event(self.game, tournament=self.in_tournament))
+        self.started_at = asyncio.get_running_loop().time()
 
         await self.broadcast(self.game.id, {
             "type": "game_started",
@@ -46,36 +106,46 @@ class GameLoop:
             await self.end_game()
             return
 
-        if self.game.current_hand_num >= HAND_LIMIT:
+        if self.game.current_hand_num >= self.config.hand_limit:
             await self.end_game()
             return
 
         self.game.current_hand_num += 1
-
-        # Rotate dealer
+        self.pre_actions.clear()
+        self.traced = tracer.sample()
+        if not self.traced:
+            # Don't attribute this hand's broadcasts to a span inherited from the last one
+            tracer.detach()
+        await self.deal_hand(active_players)
+
+    @traced_step("start_hand")
+    async def deal_hand(self, active_players: list):
+        """Set up the hand, post blinds, deal hole cards and prompt the first player."""
+        # Rotate dealer: the button moves to the next seat with a player still in the game
+        seats = [
+            p.nickname if p is not None and not p.is_eliminated else None
+            for p in self.game.seats
+        ]
+        button = self.game.dealer_position
         if self.game.current_hand_num > 1:
-            self.game.dealer_position = (self.game.dealer_position + 1) % len(active_players)
+            button = next_occupied(seats, button)
 
-        # Create new hand
-        self.deck = Deck()
+        # The log gets the cards dealt, never the deck, so it can't tell what comes next
+        self.deck.reset()
         self.deck.shuffle()
-
-        hand = Hand(
-            hand_number=self.game.current_hand_num,
-            dealer_position=self.game.dealer_position,
-            min_raise=BIG_BLIND,
-        )
-        hand.pots = [Pot(amount=0, eligible_players=[p.nickname for p in active_players])]
-
-        # Create player hands and deal hole cards
-        for player in active_players:
-            hole_cards = self.deck.deal(2)
-            hand.player_hands[player.nickname] = PlayerHand(
-                nickname=player.nickname,
-                hole_cards=hole_cards,
-            )
-
-        self.game.active_hand = hand
+        hole = {player.nickname: codes(self.deck.deal(2)) for player in active_players}
+
+        elapsed = asyncio.get_running_loop().time() - self.started_at
+        blinds = self.config.blinds_for(self.game.current_hand_num, elapsed)
+        hand = self.record({
+            "t": "deal",
+            "n": self.game.current_hand_num,
+            "button": button,
+            "sb": blinds.small_blind,
+            "bb": blinds.big_blind,
+            "hole": hole,
+            "at": round(time.time()),
+        })
 
         # Post blinds
         await self.post_blinds()
@@ -87,6 +157,8 @@ class GameLoop:
                 "payload": {
                     "hand_number": hand.hand_number,
                     "dealer_position": hand.dealer_position,
+                    "small_blind": hand.small_blind,
+                    "big_blind": hand.big_blind,
                     "hole_cards": [c.to_dict() for c in hand.player_hands[player.nickname].hole_cards],
                     "your_position": self.game.get_player_position(player.nickname),
                 }
@@ -95,54 +167,16 @@ class GameLoop:
         # Start turn timer for first player
         await self.prompt_current_player()
 
+    @traced_step("post_blinds")
     async def post_blinds(self):
         """Post small and big blinds."""
-        active_players = self.game.get_active_players()
-        hand = self.game.active_hand
-        num_players = len(active_players)
-
-        # Determine blind positions
-        if num_players == 2:
-            # Heads up: dealer is SB, other is BB
-            sb_idx = self.game.dealer_position
-            bb_idx = (self.game.dealer_position + 1) % num_players
-        else:
-            sb_idx = (self.game.dealer_position + 1) % num_players
-            bb_idx = (self.game.dealer_position + 2) % num_players
-
-        sb_player = active_players[sb_idx]
-        bb_player = active_players[bb_idx]
-
-        # Post small blind
-        sb_amount = min(SMALL_BLIND, sb_player.chips)
-        sb_player.chips -= sb_amount
-        hand.player_hands[sb_player.nickname].current_bet = sb_amount
-        hand.player_hands[sb_player.nickname].total_bet = sb_amount
-        if sb_player.chips == 0:
-            hand.player_hands[sb_player.nickname].is_all_in = True
-
-        # Post big blind
-        bb_amount = min(BIG_BLIND, bb_player.chips)
-        bb_player.chips -= bb_amount
-        hand.player_hands[bb_player.nickname].current_bet = bb_amount
-        hand.player_hands[bb_player.nickname].total_bet = bb_amount
-        if bb_player.chips == 0:
-            hand.player_hands[bb_player.nickname].is_all_in = True
-
-        hand.current_bet = bb_amount
-        hand.pots[0].amount = sb_amount + bb_amount
-
-        # First to act is player after BB (or SB in heads up preflop)
-        if num_players == 2:
-            hand.current_player_idx = 0  # SB acts first in heads up preflop
-        else:
-            hand.current_player_idx = 0  # Will be adjusted in prompt_current_player
+        (sb_nickname, sb_amount), (bb_nickname, bb_amount) = self.record({"t": "blinds"})
 
         await self.broadcast(self.game.id, {
             "type": "blinds_posted",
             "payload": {
-                "small_blind": {"nickname": sb_player.nickname, "amount": sb_amount},
-                "big_blind": {"nickname": bb_player.nickname, "amount": bb_amount},
+                "small_blind": {"nickname": sb_nickname, "amount": sb_amount},
+                "big_blind": {"nickname": bb_nickname, "amount": bb_amount},
             }
         }, None)
 
@@ -153,73 +187,152 @@ class GameLoop:
             await self.resolve_hand()
             return
 
-        current_nickname = get_current_player_nickname(self.game)
-        if not current_nickname:
-            # No one left to act, advance round or resolve
-            await self.check_round_end()
+        if betting_closed(hand):
+            # Everyone (or all but one) is all-in: nobody is left to prompt
+            await self.run_out()
             return
 
+        current_nickname = get_current_player_nickname(self.game)
+
         from .actions import get_valid_actions
         valid_actions = get_valid_actions(self.game, current_nickname)
 
+        if self.pre_actions:
+            action = await self.take_pre_action(current_nickname, valid_actions)
+            if action:
+                # Decided already: no turn message, no timer
+                await self.handle_action(current_nickname, action, {})
+                return
+
+        # Start turn timer before announcing the turn: the player (or a bot) may
+        # act while the broadcast is still awaiting other sockets
+        self.turn_deadline = asyncio.get_running_loop().time() + self.config.turn_timer_seconds
+        seconds = self.turn_seconds(current_nickname, self.config.turn_timer_seconds)
+        self.start_turn_timer(current_nickname, seconds)
+
         await self.broadcast(self.game.id, {
             "type": "turn",
             "payload": {
                 "current_player": current_nickname,
                 "valid_actions": valid_actions,
-                "time_remaining": TURN_TIMER_SECONDS,
+                "time_remaining": seconds,
                 "current_bet": hand.current_bet,
                 "pot": hand.get_total_pot(),
             }
         }, None)
 
-        # Start turn timer
+    def set_pre_action(self, nickname: str, pre_action: Optional[PreAction]) -> Optional[str]:
+        """
+        Register what to play on the player's next turn in this betting round
+        (None clears it). Returns an error message, or None on success.
+        """
+        hand = self.game.active_hand
+        player_hand = hand.player_hands.get(nickname) if hand else None
+        if not player_hand or player_hand.folded or player_hand.is_all_in:
+            return "You are not in this hand"
+        if pre_action is None:
+            self.pre_actions.pop(nickname, None)
+            return None
+        if get_current_player_nickname(self.game) == nickname:
+            return "It is already your turn"
+        self.pre_actions[nickname] = (pre_action, self.game.current_hand_num, hand.betting_round)
+        return None
+
+    async def take_pre_action(self, nickname: str, valid_actions: dict) -> Optional[str]:
+        """Use up the player's pre-action for this turn. Returns the action to play, if any."""
+        entry = self.pre_actions.pop(nickname, None)
+        if entry is None:
+            return None
+        pre_action, hand_num, betting_round = entry
+        if hand_num != self.game.current_hand_num or betting_round != self.game.active_hand.betting_round:
+            return None  # Set in an earlier betting round
+        action = resolve_pre_action(pre_action, valid_actions)
+        if action is None:
+            await self.send_to_player(nickname, {
+                "type": "pre_action_cleared",
+                "payload": {"pre_action": pre_action.value, "reason": "The bet changed"},
+            })
+        elif metrics.enabled:
+            PRE_ACTIONS_PLAYED.labels(pre_action.value).inc()
+        return action
+
+    def turn_seconds(self, nickname: str, remaining: float) -> float:
+        """How long to wait for a player: a player whose socket is gone gets only a short grace."""
+        if presence_board.get(self.game.id, nickname) == Presence.GONE:
+            return min(remaining, DISCONNECTED_TURN_SECONDS)
+        return remaining
+
+    def start_turn_timer(self, nickname: str, seconds: float):
         self.cancel_turn_timer()
-        self.turn_timer_task = asyncio.create_task(
-            self.turn_timeout(current_nickname)
-        )
+        self.turn_timer_task = asyncio.create_task(self.turn_timeout(nickname, seconds))
+
+    def presence_changed(self, nickname: str):
+        """Re-time the running turn if its player just left (or came back before it ran out)."""
+        if not self.turn_timer_task or self.turn_timer_task.done():
+            return
+        if get_current_player_nickname(self.game) != nickname:
+            return
+        remaining = self.turn_deadline - asyncio.get_running_loop().time()
+        self.start_turn_timer(nickname, self.turn_seconds(nickname, max(remaining, 0.0)))
 
     def cancel_turn_timer(self):
         """Cancel the current turn timer."""
         if self.turn_timer_task and not self.turn_timer_task.done():
             self.turn_timer_task.cancel()
 
-    async def turn_timeout(self, nickname: str):
+    def cancel_tasks(self):
+        """Cancel the turn timer and any scheduled next hand."""
+        self.cancel_turn_timer()
+        if self.next_hand_task and not self.next_hand_task.done():
+            self.next_hand_task.cancel()
+
+    async def turn_timeout(self, nickname: str, seconds: float):
         """Handle turn timeout - auto-fold."""
         try:
-            await asyncio.sleep(TURN_TIMER_SECONDS)
+            await asyncio.sleep(seconds)
 
             # Check if still this player's turn
             current = get_current_player_nickname(self.game)
             if current == nickname:
+                # This task now drives the game on; handle_action must not cancel it
+                self.turn_timer_task = None
+                if metrics.enabled:
+                    metrics.TURN_TIMEOUTS.inc()
                 await self.handle_action(nickname, "fold", {})
         except asyncio.CancelledError:
             pass
 
     async def handle_action(self, nickname: str, action_type: str, params: dict):
         """Handle a player action."""
+        with self.span("action", player=nickname, action=action_type):
+            if not metrics.enabled:
+                await self._handle_action(nickname, action_type, params)
+                return
+
+            start = time.perf_counter()
+            try:
+                await self._handle_action(nickname, action_type, params)
+            finally:
+                label = action_type if action_type in KNOWN_ACTIONS else "invalid"
+                metrics.HANDLE_ACTION_SECONDS.labels(label).observe(time.perf_counter() - start)
+
+    async def _handle_action(self, nickname: str, action_type: str, params: dict):
         from . import actions
 
         self.cancel_turn_timer()
 
         hand = self.game.active_hand
-        if not hand:
-            return
+        if not hand or hand.betting_round == BettingRound.SHOWDOWN:
+            return  # No hand, or it is being run out and resolved
 
         try:
-            if action_type == "fold":
-                actions.fold(self.game, nickname)
-            elif action_type == "check":
-                actions.check(self.game, nickname)
-            elif action_type == "call":
-                amount = actions.call(self.game, nickname)
-                params["amount"] = amount
-            elif action_type == "raise":
-                amount = actions.raise_bet(self.game, nickname, params.get("amount", 0))
-                params["amount"] = amount
-            elif action_type == "all_in":
-                amount = actions.all_in(self.game, nickname)
-                params["amount"] = amount
+            if action_type in KNOWN_ACTIONS:
+                event = {"t": "act", "p": nickname, "a": action_type}
+                if action_type == "raise":
+                    event["to"] = params.get("amount", 0)
+                amount = self.record(event)
+                if amount is not None:
+                    params["amount"] = amount
             else:
                 await self.send_to_player(nickname, {
                     "type": "error",
@@ -256,15 +369,8 @@ class GameLoop:
         if not hand:
             return
 
-        active_players = self.game.get_active_players()
-        players_in_hand = [
-            p for p in active_players
-            if p.nickname in hand.player_hands
-            and not hand.player_hands[p.nickname].folded
-        ]
-
         # If only one player left, they win
-        if len(players_in_hand) <= 1:
+        if hand.players_in_hand <= 1:
             await self.resolve_hand()
             return
 
@@ -273,27 +379,27 @@ class GameLoop:
             await self.resolve_hand()
             return
 
+        # Nobody can bet any more: deal the rest at once rather than street by street
+        if betting_closed(hand):
+            await self.run_out()
+            return
+
         # Check if we need to deal community cards
-        if hand.betting_round == BettingRound.FLOP and len(hand.community_cards) == 0:
-            await self.deal_community_cards(3)
-        elif hand.betting_round == BettingRound.TURN and len(hand.community_cards) == 3:
-            await self.deal_community_cards(1)
-        elif hand.betting_round == BettingRound.RIVER and len(hand.community_cards) == 4:
-            await self.deal_community_cards(1)
+        if len(hand.community_cards) < _BOARD_SIZE_BY_STREET.get(hand.betting_round, 0):
+            await self.deal_community_cards()
 
         # Prompt next player
         await self.prompt_current_player()
 
-    async def deal_community_cards(self, count: int):
-        """Deal community cards (flop/turn/river)."""
+    @traced_step("deal_community_cards")
+    async def deal_community_cards(self):
+        """Deal the next street (flop/turn/river)."""
         hand = self.game.active_hand
-
-        # Burn one card
-        self.deck.deal_one()
-
-        # Deal community cards
-        new_cards = self.deck.deal(count)
-        hand.community_cards.extend(new_cards)
+        self.deck.deal_one()  # Burn
+        new_cards = self.record({
+            "t": "street",
+            "cards": codes(self.deck.deal(1 if hand.community_cards else 3)),
+        })
 
         await self.broadcast(self.game.id, {
             "type": "community_cards",
@@ -304,7 +410,69 @@ class GameLoop:
             }
         }, None)
 
-    async def resolve_hand(self):
+    @traced_step("run_out")
+    async def run_out(self):
+        """
+        Deal the rest of the board at once when no more betting is possible,
+        announce it in one message, and resolve the hand. The streets are shown
+        RUNOUT_STREET_SECONDS apart by clients, so the pause before the next
+        hand is stretched by as much.
+        """
+        self.cancel_turn_timer()
+        hand = self.game.active_hand
+        contenders = [
+            nickname for nickname in hand.seats
+            if nickname is not None and nickname in hand.player_hands and not hand.player_hands[nickname].folded
+        ]
+        holes = [hand.player_hands[nickname].hole_cards for nickname in contenders]
+
+        # Burn and deal street by street, as if the betting had gone on
+        dealt = []
+        board_size = len(hand.community_cards)
+        while board_size < 5:
+            self.deck.deal_one()  # Burn
+            dealt.append(codes(self.deck.deal(1 if board_size else 3)))
+            board_size += len(dealt[-1])
+
+        boards = [list(hand.community_cards)]
+        streets = []
+        for cards in self.record({"t": "runout", "streets": dealt}):
+            boards.append(boards[-1] + cards)
+            streets.append({
+                "betting_round": _STREET_BY_BOARD_SIZE[len(boards[-1])].value,
+                "cards": [c.to_dict() for c in cards],
+            })
+
+        equity = None
+        if streets and RUNOUT_EQUITY_TRIALS:
+            from .equity import runout_equity
+
+            stages = await asyncio.get_running_loop().run_in_executor(
+                None, runout_equity, holes, boards, RUNOUT_EQUITY_TRIALS
+            )
+            equity, *after_street = [
+                {nickname: round(share, 4) for nickname, share in zip(contenders, shares)} for shares in stages
+            ]
+            for street, street_equity in zip(streets, after_street):
+                street["equity"] = street_equity
+
+        if streets:
+            await self.broadcast(self.game.id, {
+                "type": "run_out",
+                "payload": {
+                    "hole_cards": {
+                        nickname: [c.to_dict() for c in hole] for nickname, hole in zip(contenders, holes)
+                    },
+                    "equity": equity,
+                    "streets": streets,
+                    "all_community_cards": [c.to_dict() for c in hand.community_cards],
+                    "street_seconds": RUNOUT_STREET_SECONDS,
+                }
+            }, None)
+        await self.resolve_hand(extra_pause=len(streets) * RUNOUT_STREET_SECONDS)
+
+    @traced_step("resolve_hand")
+    async def resolve_hand(self, extra_pause: float = 0.0):
         """Resolve the hand - determine winner(s) and award pot(s)."""
         self.cancel_turn_timer()
 
@@ -320,14 +488,14 @@ class GameLoop:
         ]
 
         results = []
+        pot = hand.get_total_pot()
 
         if len(players_in_hand) == 1:
             # Everyone else folded - winner doesn't show cards
             winner = players_in_hand[0]
-            winner.chips += hand.get_total_pot()
             results.append({
                 "nickname": winner.nickname,
-                "won": hand.get_total_pot(),
+                "won": pot,
                 "hand_shown": False,
             })
         else:
@@ -338,35 +506,32 @@ class GameLoop:
                 full_hand = ph.hole_cards + hand.community_cards
                 player_hands_for_eval.append((player.nickname, full_hand, ph.hole_cards))
 
-            # Find winners
-            hands_only = [h[1] for h in player_hands_for_eval]
-            winner_indices = compare_hands(hands_only)
+            # Find winners (each hand is evaluated once)
+            start = time.perf_counter() if metrics.enabled else 0.0
+            evaluated = [evaluate_hand(h[1]) for h in player_hands_for_eval]
+            best = max(evaluated)
+            winner_indices = [i for i, r in enumerate(evaluated) if r == best]
+            if metrics.enabled:
+                metrics.SHOWDOWN_SECONDS.observe(time.perf_counter() - start)
 
-            pot_per_winner = hand.get_total_pot() // len(winner_indices)
-            remainder = hand.get_total_pot() % len(winner_indices)
+            pot_per_winner = pot // len(winner_indices)
+            remainder = pot % len(winner_indices)
 
             for i, (nickname, full_hand, hole_cards) in enumerate(player_hands_for_eval):
-                player = self.game.get_player(nickname)
-                hand_result = evaluate_hand(full_hand)
-
+                hand_result = evaluated[i]
+                winnings = 0
                 if i in winner_indices:
-                    winnings = pot_per_winner + (1 if i < remainder else 0)
-                    player.chips += winnings
-                    results.append({
-                        "nickname": nickname,
-                        "won": winnings,
-                        "hand_shown": True,
-                        "hole_cards": [c.to_dict() for c in hole_cards],
-                        "hand_rank": hand_result.rank.name,
-                    })
-                else:
-                    results.append({
-                        "nickname": nickname,
-                        "won": 0,
-                        "hand_shown": True,
-                        "hole_cards": [c.to_dict() for c in hole_cards],
-                        "hand_rank": hand_result.rank.name,
-                    })
+                    # Odd chips go to the first winners in seat order
+                    winnings = pot_per_winner + (1 if winner_indices.index(i) < remainder else 0)
+                results.append({
+                    "nickname": nickname,
+                    "won": winnings,
+                    "hand_shown": True,
+                    "hole_cards": [c.to_dict() for c in hole_cards],
+                    "hand_rank": hand_result.rank.name,
+                })
+
+        self.record({"t": "award", "won": {r["nickname"]: r["won"] for r in results if r["won"]}})
 
         await self.broadcast(self.game.id, {
             "type": "hand_result",
@@ -379,24 +544,27 @@ class GameLoop:
         # Check for eliminations
         await self.check_eliminations()
 
-        # Clear active hand
-        self.game.active_hand = None
+        self.record({"t": "clear"})
 
-        # Small delay before next hand
-        await asyncio.sleep(3)
+        # Start the next hand after a pause, without holding up whoever ended this one
+        self.next_hand_task = asyncio.create_task(self.start_next_hand(extra_pause))
+        self.next_hand_task.add_done_callback(self._log_task_error)
 
-        # Start next hand
+    async def start_next_hand(self, extra_pause: float = 0.0):
+        """Wait for the pause between hands, then deal the next one."""
+        await asyncio.sleep(NEXT_HAND_DELAY_SECONDS + extra_pause)
         await self.start_hand()
 
+    def _log_task_error(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Game %s loop failed", self.game.id, exc_info=task.exception())
+
+    @traced_step("check_eliminations")
     async def check_eliminations(self):
         """Check for and handle player eliminations."""
         for player in self.game.players:
             if not player.is_eliminated and player.chips <= 0:
-                player.is_eliminated = True
-                player.chips = 0
-                self.game.elimination_order.append(player.nickname)
-                player.elimination_position = len(self.game.players) - len(self.game.elimination_order) + 1
-
+                self.record({"t": "out", "p": player.nickname})
                 await self.broadcast(self.game.id, {
                     "type": "player_eliminated",
                     "payload": {
@@ -408,21 +576,13 @@ class GameLoop:
     async def end_game(self):
         """End the game and calculate final standings."""
         self.cancel_turn_timer()
-        self.game.status = GameStatus.FINISHED
-
-        # Calculate final placements
-        active_players = self.game.get_active_players()
-
-        # Sort active players by chips (descending) for final placement
-        active_players.sort(key=lambda p: p.chips, reverse=True)
+        # Players still in, best stack first, have been given the top placements
+        active_players = self.record({"t": "end"})
 
         placements = []
-
-        # Active players get top placements
         for i, player in enumerate(active_players):
             position = i + 1
-            points = POINTS_BY_PLACEMENT[position - 1] if position <= len(POINTS_BY_PLACEMENT) else 0
-            player.elimination_position = position
+            points = self.config.points_for(position)
             placements.append({
                 "nickname": player.nickname,
                 "position": position,
@@ -434,7 +594,7 @@ class GameLoop:
         for player in self.game.players:
             if player.is_eliminated:
                 position = player.elimination_position
-                points = POINTS_BY_PLACEMENT[position - 1] if position <= len(POINTS_BY_PLACEMENT) else 0
+                points = self.config.points_for(position)
                 placements.append({
                     "nickname": player.nickname,
                     "position": position,
@@ -458,27 +618,7 @@ class GameLoop:
 
     async def save_game_result(self, placements: list[dict]):
         """Save game result to database."""
-        if not database or not database.is_connected:
-            return
-
-        game_id = str(uuid.uuid4())
-
-        # Insert game result
-        await database.execute(
-            game_results.insert().values(id=game_id)
-        )
-
-        # Insert player results
-        for placement in placements:
-            await database.execute(
-                game_result_players.insert().values(
-                    id=str(uuid.uuid4()),
-                    game_result_id=game_id,
-                    nickname=placement["nickname"],
-                    placement=placement["position"],
-                    points_awarded=placement["points"],
-                )
-            )
+        await save_game_result(placements)
 
     async def send_to_player(self, nickname: str, message: dict):
         """Send a message to a specific player."""
@@ -495,9 +635,9 @@ def get_game_loop(game_id: str) -> Optional[GameLoop]:
     return game_loops.get(game_id)
 
 
-def create_game_loop(game: Game, broadcast: BroadcastCallback) -> GameLoop:
-    """Create a new game loop."""
-    loop = GameLoop(game, broadcast)
+def create_game_loop(game: Game, broadcast: BroadcastCallback, seed: Optional[int] = None) -> GameLoop:
+    """Create a new game loop. Pass a seed to make the deals reproducible."""
+    loop = GameLoop(game, broadcast, seed)
     game_loops[game.id] = loop
     return loop
 
@@ -506,5 +646,17 @@ def remove_game_loop(game_id: str):
     """Remove a game loop."""
     if game_id in game_loops:
         loop = game_loops[game_id]
-        loop.cancel_turn_timer()
+        loop.cancel_tasks()
+        loop.log.close()
         del game_loops[game_id]
+    presence_board.remove_game(game_id)
+
+
+def _collect_metrics():
+    metrics.TURN_TIMERS.set(sum(
+        1 for loop in game_loops.values()
+        if loop.turn_timer_task and not loop.turn_timer_task.done()
+    ))
+
+
+metrics.registry.add_collector(_collect_metrics)
@@ -0,0 +1,380 @@
+"""
+Hand histories exported from game logs (events.py).
+
+A log is replayed through apply_event, so every amount comes from the same
+rules the live table used, and each finished hand becomes a record: the
+players and stacks, the actions street by street, the board, the cards shown
+down and who won what. Records are written as PokerStars-style text, which
+hand trackers and replayers import, or as JSON lines.
+
+Only hands that have left the table are exported, and hole cards only when
+shown down (or, when exporting for one player, that player's own). Tournament
+tables are left out, since their logs don't replay, and a log that stops
+replaying ends that game's export without failing the others. Logs are
+read one line at a time and hands are written as they finish, so an export
+of any size runs in constant memory; stream_hand_histories also hands the
+event loop back after every hand so live tables keep playing.
+
+    python -m app.game.history --player alice --since 2026-10-01 > alice.txt
+    python -m app.game.history --game <game id> --format jsonl
+"""
+
+import argparse
+import asyncio
+from datetime import datetime, timezone
+import itertools
+import json
+import logging
+import os
+import sys
+from typing import AsyncIterator, Iterable, Iterator, Literal, Optional
+import zlib
+
+from ..config import GAME_LOG_DIR
+from .events import Event, apply_event, codes, iter_log, new_game
+from .game_loop import game_loops
+from .models import Game
+from .poker import Card, evaluate_hand
+
+Format = Literal["text", "jsonl"]
+
+logger = logging.getLogger(__name__)
+
+# Stream in chunks of about this size rather than one write per hand
+CHUNK_BYTES = 64 * 1024
+
+_STREET_BY_BOARD_SIZE = {3: "flop", 4: "turn", 5: "river"}
+
+
+def iter_hands(events: Iterable[Event], viewer: Optional[str] = None) -> Iterator[dict]:
+    """
+    Replay a game's events and yield a record of each finished hand.
+    With a viewer, their own hole cards are included in the hands they played.
+    """
+    game = None
+    record = None
+    for event in events:
+        kind = event["t"]
+        if kind == "snap":
+            continue
+        if game is None:
+            if kind != "start" or event.get("tournament"):
+                return  # Not a whole log, or a tournament table's, which doesn't replay
+            game = new_game(event)
+
+        hand = game.active_hand
+        if kind == "act":
+            bet_before = hand.current_bet
+            mine_before = hand.player_hands[event["p"]].current_bet
+            street = hand.betting_round.value
+
+        result = apply_event(game, event)
+        hand = game.active_hand
+
+        if kind == "deal":
+            record = {
+                "game_id": game.id,
+                "hand_id": zlib.crc32(game.id.encode()) * 1_000_000 + hand.hand_number,
+                "hand": hand.hand_number,
+                "at": event["at"],
+                "small_blind": hand.small_blind,
+                "big_blind": hand.big_blind,
+                "max_seats": game.config.max_players,
+                "button_seat": hand.dealer_position,
+                "players": [
+                    {"nickname": ph.nickname, "seat": ph.seat, "chips": game.get_player(ph.nickname).chips}
+                    for ph in sorted(hand.player_hands.values(), key=lambda ph: ph.seat)
+                ],
+                "streets": [{"street": "preflop", "cards": [], "actions": []}],
+                "board": [],
+                "folded": {},
+                "showdown": {},
+                "won": {},
+            }
+            if viewer in hand.player_hands:
+                record["hole_cards"] = {viewer: codes(hand.player_hands[viewer].hole_cards)}
+        elif record is None:
+            continue
+        elif kind == "blinds":
+            for action, (nickname, amount) in zip(("small_blind", "big_blind"), result):
+                _add_action(record, game, nickname, action, amount)
+        elif kind == "act":
+            nickname, action = event["p"], event["a"]
+            if action == "fold":
+                record["folded"][nickname] = street
+                _add_action(record, game, nickname, "fold")
+            elif action == "check":
+                _add_action(record, game, nickname, "check")
+            else:
+                total = mine_before + result
+                if total <= bet_before:
+                    _add_action(record, game, nickname, "call", result)
+                elif bet_before == 0:
+                    _add_action(record, game, nickname, "bet", result, to=total)
+                else:
+                    _add_action(record, game, nickname, "raise", result, to=total, raise_by=total - bet_before)
+        elif kind == "street":
+            _add_street(record, result)
+        elif kind == "runout":
+            for cards in result:
+                _add_street(record, cards)
+        elif kind == "award":
+            shown = [ph for ph in hand.player_hands.values() if not ph.folded]
+            if len(shown) > 1:
+                for ph in shown:
+                    record["showdown"][ph.nickname] = {
+                        "cards": codes(ph.hole_cards),
+                        "hand": evaluate_hand(ph.hole_cards + hand.community_cards).to_dict()["rank_name"],
+                    }
+            record["won"] = dict(event["won"])
+        elif kind == "clear":
+            yield record
+            record = None
+
+
+def _add_action(record: dict, game: Game, nickname: str, action: str, amount: int = 0, **sizes: int):
+    """Add an action to the current street: amount is the chips it put in, sizes the bet sizes."""
+    entry = {"player": nickname, "action": action}
+    if amount:
+        entry["amount"] = amount
+    entry.update(sizes)
+    if action not in ("fold", "check") and game.get_player(nickname).chips == 0:
+        entry["all_in"] = True
+    record["streets"][-1]["actions"].append(entry)
+
+
+def _add_street(record: dict, cards: list[Card]):
+    record["board"].extend(codes(cards))
+    record["streets"].append({
+        "street": _STREET_BY_BOARD_SIZE[len(record["board"])],
+        "cards": codes(cards),
+        "actions": [],
+    })
+
+
+def to_text(record: dict) -> str:
+    """A hand record as PokerStars-style text, ending with the blank lines between hands."""
+    started = datetime.fromtimestamp(record["at"], timezone.utc)
+    seat_of = {p["nickname"]: p["seat"] + 1 for p in record["players"]}
+    lines = [
+        f"PokerStars Hand #{record['hand_id']}: Hold'em No Limit "
+        f"({record['small_blind']}/{record['big_blind']}) - {started:%Y/%m/%d %H:%M:%S} UTC",
+        f"Table '{record['game_id']}' {record['max_seats']}-max Seat #{record['button_seat'] + 1} is the button",
+    ]
+    for player in record["players"]:
+        lines.append(f"Seat {player['seat'] + 1}: {player['nickname']} ({player['chips']} in chips)")
+
+    blinds = {}
+    dealt = 0
+    for street in record["streets"]:
+        if street["street"] == "preflop":
+            for action in street["actions"]:
+                if action["action"].endswith("_blind"):
+                    blinds[action["player"]] = action["action"].replace("_", " ")
+                    lines.append(_action_text(action))
+            lines.append("*** HOLE CARDS ***")
+            for nickname, cards in record.get("hole_cards", {}).items():
+                lines.append(f"Dealt to {nickname} {_bracket(cards)}")
+        else:
+            # The board before this street, then the street's own cards
+            header = f"*** {street['street'].upper()} ***"
+            if dealt:
+                header += " " + _bracket(record["board"][:dealt])
+            lines.append(f"{header} {_bracket(street['cards'])}")
+            dealt += len(street["cards"])
+        lines.extend(_action_text(a) for a in street["actions"] if not a["action"].endswith("_blind"))
+
+    if record["showdown"]:
+        lines.append("*** SHOW DOWN ***")
+        for nickname, shown in record["showdown"].items():
+            lines.append(f"{nickname}: shows {_bracket(shown['cards'])} ({shown['hand']})")
+    for nickname, amount in record["won"].items():
+        lines.append(f"{nickname} collected {amount} from pot")
+
+    lines.append("*** SUMMARY ***")
+    lines.append(f"Total pot {sum(record['won'].values())} | Rake 0")
+    if record["board"]:
+        lines.append(f"Board {_bracket(record['board'])}")
+    for player in record["players"]:
+        nickname = player["nickname"]
+        role = " (button)" if player["seat"] == record["button_seat"] else ""
+        if nickname in blinds:
+            role += f" ({blinds[nickname]})"
+        won = record["won"].get(nickname, 0)
+        if nickname in record["folded"]:
+            street = record["folded"][nickname]
+            outcome = "folded before Flop" if street == "preflop" else f"folded on the {street.title()}"
+        elif nickname in record["showdown"]:
+            shown = record["showdown"][nickname]
+            result = f"won ({won})" if won else "lost"
+            outcome = f"showed {_bracket(shown['cards'])} and {result} with {shown['hand']}"
+        else:
+            outcome = f"collected ({won})"
+        lines.append(f"Seat {seat_of[nickname]}: {nickname}{role} {outcome}")
+    return "\n".join(lines) + "\n\n\n"
+
+
+def _bracket(cards: list[str]) -> str:
+    return f"[{' '.join(cards)}]"
+
+
+def _action_text(action: dict) -> str:
+    kind, amount = action["action"], action.get("amount", 0)
+    if kind == "small_blind":
+        text = f"posts small blind {amount}"
+    elif kind == "big_blind":
+        text = f"posts big blind {amount}"
+    elif kind in ("fold", "check"):
+        text = kind + "s"
+    elif kind == "call":
+        text = f"calls {amount}"
+    elif kind == "bet":
+        text = f"bets {amount}"
+    else:
+        text = f"raises {action['raise_by']} to {action['to']}"
+    if action.get("all_in"):
+        text += " and is all-in"
+    return f"{action['player']}: {text}"
+
+
+def to_jsonl(record: dict) -> str:
+    return json.dumps(record, separators=(",", ":")) + "\n"
+
+
+def game_events(game_id: str, directory: str = GAME_LOG_DIR) -> Optional[Iterable[Event]]:
+    """A game's events: from its live loop, else from its log file. None if there are none."""
+    loop = game_loops.get(game_id)
+    if loop is not None:
+        return _live_events(loop.log.events)
+    if directory and os.path.basename(game_id) == game_id:
+        path = os.path.join(directory, f"{game_id}.jsonl")
+        if os.path.exists(path):
+            return iter_log(path)
+    return None
+
+
+def _live_events(events: list[Event]) -> Iterator[Event]:
+    # Up to where the log is now: the hand in play is not exported anyway
+    return itertools.islice(events, len(events))
+
+
+def _all_game_events(directory: str, since: Optional[float]) -> Iterator[tuple[str, Iterable[Event]]]:
+    """(game id, events) of every game: live games from memory, the rest from GAME_LOG_DIR."""
+    live = list(game_loops.items())
+    for game_id, loop in live:
+        if not loop.in_tournament:
+            yield game_id, _live_events(loop.log.events)
+    if not directory or not os.path.isdir(directory):
+        return
+    live_ids = {game_id for game_id, _ in live}
+    for name in sorted(os.listdir(directory)):
+        game_id, ext = os.path.splitext(name)
+        if ext != ".jsonl" or game_id in live_ids:
+            continue
+        path = os.path.join(directory, name)
+        # Logs are appended to as hands finish, so an older file has no hands since then
+        if since is not None and os.path.getmtime(path) < since:
+            continue
+        yield game_id, iter_log(path)
+
+
+def _rendered_hands(
+    game_id: Optional[str],
+    player: Optional[str],
+    since: Optional[float],
+    until: Optional[float],
+    format: Format,
+    directory: str,
+) -> Iterator[str]:
+    """Each hand in turn, rendered, or "" for a hand the filters leave out."""
+    render = to_jsonl if format == "jsonl" else to_text
+    if game_id is not None:
+        events = game_events(game_id, directory)
+        games = [(game_id, events)] if events is not None else []
+    else:
+        games = _all_game_events(directory, since)
+    for game_id, events in games:
+        try:
+            for record in iter_hands(events, viewer=player):
+                if until is not None and record["at"] > until:
+                    break  # A game's hands are in time order
+                # With a player, a hand has their hole cards exactly when they were dealt in
+                if (since is not None and record["at"] < since) or (player is not None and "hole_cards" not in record):
+                    yield ""
+                else:
+                    yield render(record)
+        except Exception:
+            # One damaged log (or one from an older version) shouldn't end the whole export
+            logger.exception("Stopped exporting game %s: its log does not replay", game_id)
+
+
+def hand_histories(
+    game_id: Optional[str] = None,
+    player: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    format: Format = "text",
+    directory: str = GAME_LOG_DIR,
+) -> Iterator[str]:
+    """
+    Finished hands of one game (or every game), optionally only those a player
+    was dealt into and those started in [since, until]. One string per hand.
+    """
+    for text in _rendered_hands(game_id, player, _timestamp(since), _timestamp(until), format, directory):
+        if text:
+            yield text
+
+
+async def stream_hand_histories(
+    game_id: Optional[str] = None,
+    player: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    format: Format = "text",
+    directory: str = GAME_LOG_DIR,
+) -> AsyncIterator[str]:
+    """hand_histories in chunks of about CHUNK_BYTES, yielding to the event loop after every hand."""
+    chunk, size = [], 0
+    for text in _rendered_hands(game_id, player, _timestamp(since), _timestamp(until), format, directory):
+        if text:
+            chunk.append(text)
+            size += len(text)
+            if size >= CHUNK_BYTES:
+                yield "".join(chunk)
+                chunk, size = [], 0
+        await asyncio.sleep(0)
+    if chunk:
+        yield "".join(chunk)
+
+
+def _timestamp(when: Optional[datetime]) -> Optional[float]:
+    """Seconds since the epoch; a datetime without a timezone is taken as UTC."""
+    if when is None:
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return when.timestamp()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Export hand histories from the game logs in GAME_LOG_DIR.")
+    parser.add_argument("--game", help="only this game")
+    parser.add_argument("--player", help="only hands this player was dealt into, with their hole cards")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="only hands started at or after (ISO date/time, UTC)")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="only hands started at or before (ISO date/time, UTC)")
+    parser.add_argument("--format", default="text", choices=["text", "jsonl"])
+    parser.add_argument("--dir", default=GAME_LOG_DIR, help="log directory (default: GAME_LOG_DIR)")
+    args = parser.parse_args(argv)
+
+    if not args.dir:
+        parser.error("set GAME_LOG_DIR or pass --dir")
+    if args.game is not None and game_events(args.game, args.dir) is None:
+        print(f"No log for game {args.game}", file=sys.stderr)
+        return 1
+    for text in hand_histories(args.game, args.player, args.since, args.until, args.format, args.dir):
+        sys.stdout.write(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
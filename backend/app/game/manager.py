@@ -1,6 +1,7 @@
 from typing import Optional
 from .models import Game, GamePlayer, GameStatus
-from ..config import STARTING_CHIPS, MIN_PLAYERS, MAX_PLAYERS
+from .table_config import DEFAULT_TABLE, TableConfig
+from .. import metrics
 
 
 class GameManager:
@@ -9,13 +10,17 @@ class GameManager:
     def __init__(self):
         self._games: dict[str, Game] = {}
 
-    def create_game(self, creator_nickname: str) -> Game:
+    def create_game(self, creator_nickname: str, config: TableConfig = DEFAULT_TABLE) -> Game:
         """Create a new game and add the creator as the first player."""
-        game = Game(creator=creator_nickname)
-        game.add_player(creator_nickname, STARTING_CHIPS)
+        game = Game(creator=creator_nickname, config=config)
+        game.add_player(creator_nickname, config.starting_chips)
         self._games[game.id] = game
         return game
 
+    def add_game(self, game: Game):
+        """Register a game built elsewhere (e.g. a tournament table)."""
+        self._games[game.id] = game
+
     def get_game(self, game_id: str) -> Optional[Game]:
         """Get a game by ID."""
         return self._games.get(game_id)
@@ -32,13 +37,13 @@ class GameManager:
         if game.status != GameStatus.WAITING:
             return None, "Game has already started"
 
-        if len(game.players) >= MAX_PLAYERS:
-            return None, f"Game is full (max {MAX_PLAYERS} players)"
+        if len(game.players) >= game.config.max_players:
+            return None, f"Game is full (max {game.config.max_players} players)"
 
         if game.has_player(nickname):
             return None, "A player with this nickname is already in the game"
 
-        game.add_player(nickname, STARTING_CHIPS)
+        game.add_player(nickname, game.config.starting_chips)
         return game, None
 
     def start_game(self, game_id: str, nickname: str) -> tuple[Optional[Game], Optional[str]]:
@@ -56,8 +61,8 @@ class GameManager:
         if game.status != GameStatus.WAITING:
             return None, "Game has already started"
 
-        if len(game.players) < MIN_PLAYERS:
-            return None, f"Need at least {MIN_PLAYERS} players to start"
+        if len(game.players) < game.config.min_players:
+            return None, f"Need at least {game.config.min_players} players to start"
 
         game.status = GameStatus.ACTIVE
         game.current_hand_num = 1
@@ -75,5 +80,15 @@ class GameManager:
         return False
 
 
+    def collect_metrics(self):
+        """Update game gauges (called at scrape time)."""
+        counts = {status: 0 for status in GameStatus}
+        for game in self._games.values():
+            counts[game.status] += 1
+        for status, count in counts.items():
+            metrics.GAMES.labels(status.value).set(count)
+
+
 # Singleton instance
 game_manager = GameManager()
+metrics.registry.add_collector(game_manager.collect_metrics)
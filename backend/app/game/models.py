@@ -1,9 +1,12 @@
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Optional, TYPE_CHECKING
+from typing import Any, Callable, Optional, TYPE_CHECKING
 import uuid
 
+from .seating import SeatRing
+from .table_config import DEFAULT_TABLE, TableConfig
+
 if TYPE_CHECKING:
     from .poker import Card
 
@@ -22,16 +25,42 @@ class BettingRound(str, Enum):
     SHOWDOWN = "showdown"
 
 
+class Memoized:
+    """
+    Keeps an object's serialized fragments until one of its fields is assigned.
+    __setattr__ drops the cache, so it doubles as the dirty flag. Fragments are
+    shared by every caller, so don't modify them. A list changed in place is not
+    an assignment: it has to be left out of the fragment or be part of its key.
+    """
+
+    def __setattr__(self, name: str, value: Any):
+        object.__setattr__(self, name, value)
+        self.__dict__.pop("_fragments", None)
+
+    def _fragment(self, key, build: Callable[..., dict], *args) -> dict:
+        try:
+            return self.__dict__["_fragments"][key]
+        except KeyError:
+            fragment = build(*args)
+            self.__dict__.setdefault("_fragments", {})[key] = fragment
+            return fragment
+
+
 @dataclass
-class GamePlayer:
+class GamePlayer(Memoized):
     nickname: str
     chips: int = 0
+    seat: int = 0
     is_eliminated: bool = False
     elimination_position: Optional[int] = None
 
     def to_dict(self) -> dict:
+        return self._fragment(None, self._build_dict)
+
+    def _build_dict(self) -> dict:
         return {
             "nickname": self.nickname,
+            "seat": self.seat,
             "chips": self.chips,
             "is_eliminated": self.is_eliminated,
             "elimination_position": self.elimination_position,
@@ -39,9 +68,10 @@ class GamePlayer:
 
 
 @dataclass
-class PlayerHand:
+class PlayerHand(Memoized):
     """Tracks a player's state within a single hand."""
     nickname: str
+    seat: int = 0
     hole_cards: list = field(default_factory=list)  # list[Card]
     current_bet: int = 0  # Bet in current round
     total_bet: int = 0  # Total bet this hand (for side pots)
@@ -49,8 +79,13 @@ class PlayerHand:
     is_all_in: bool = False
 
     def to_dict(self, show_cards: bool = False) -> dict:
+        # Two fragments: the public one, and the owner's with the hole cards
+        return self._fragment(show_cards, self._build_dict, show_cards)
+
+    def _build_dict(self, show_cards: bool) -> dict:
         return {
             "nickname": self.nickname,
+            "seat": self.seat,
             "hole_cards": [c.to_dict() for c in self.hole_cards] if show_cards else None,
             "current_bet": self.current_bet,
             "total_bet": self.total_bet,
@@ -60,12 +95,15 @@ class PlayerHand:
 
 
 @dataclass
-class Pot:
+class Pot(Memoized):
     """Represents a pot (main or side pot)."""
     amount: int = 0
     eligible_players: list[str] = field(default_factory=list)  # nicknames
 
     def to_dict(self) -> dict:
+        return self._fragment(None, self._build_dict)
+
+    def _build_dict(self) -> dict:
         return {
             "amount": self.amount,
             "eligible_players": self.eligible_players,
@@ -73,44 +111,68 @@ class Pot:
 
 
 @dataclass
-class Hand:
+class Hand(Memoized):
     """Tracks the state of a single hand being played."""
     hand_number: int = 0
-    dealer_position: int = 0
+    dealer_position: int = 0  # Button seat
     community_cards: list = field(default_factory=list)  # list[Card]
     pots: list[Pot] = field(default_factory=list)
     current_bet: int = 0  # Current bet to call
     min_raise: int = 0  # Minimum raise amount
+    small_blind: int = 0
+    big_blind: int = 0
     betting_round: BettingRound = BettingRound.PREFLOP
-    current_player_idx: int = 0
+    seats: list[Optional[str]] = field(default_factory=list)  # Nickname dealt in at each seat
+    current_seat: Optional[int] = None  # Seat to act (None when nobody can act)
+    # Seats that can still act (not folded, not all-in) and the seat that
+    # closes the betting round once it has acted
+    action_ring: SeatRing = field(default_factory=lambda: SeatRing(0), repr=False)
+    closing_seat: Optional[int] = None
+    players_in_hand: int = 0  # Not folded
+    round_bets: int = 0  # Sum of current_bet, so the pot is O(1) to read
     player_hands: dict[str, PlayerHand] = field(default_factory=dict)  # nickname -> PlayerHand
     last_raiser: Optional[str] = None
-    players_acted_this_round: set = field(default_factory=set)
 
     def to_dict(self, viewer_nickname: Optional[str] = None) -> dict:
         """Convert to dict. Only show hole cards to the viewer."""
+        # Community cards are only ever added to, so their count keys the fragment
+        result = dict(self._fragment(len(self.community_cards), self._build_dict))
+        result["pots"] = [p.to_dict() for p in self.pots]
+        result["player_hands"] = {
+            nick: ph.to_dict(show_cards=(nick == viewer_nickname))
+            for nick, ph in self.player_hands.items()
+        }
+        return result
+
+    def _build_dict(self) -> dict:
+        """Everything but the pots and player hands, which have fragments of their own."""
         return {
             "hand_number": self.hand_number,
             "dealer_position": self.dealer_position,
             "community_cards": [c.to_dict() for c in self.community_cards],
-            "pots": [p.to_dict() for p in self.pots],
+            "pots": None,
             "current_bet": self.current_bet,
             "min_raise": self.min_raise,
+            "small_blind": self.small_blind,
+            "big_blind": self.big_blind,
             "betting_round": self.betting_round.value,
-            "current_player_idx": self.current_player_idx,
-            "player_hands": {
-                nick: ph.to_dict(show_cards=(nick == viewer_nickname))
-                for nick, ph in self.player_hands.items()
-            },
+            "current_seat": self.current_seat,
+            "player_hands": None,
         }
 
     def get_total_pot(self) -> int:
-        """Get total of all pots."""
-        return sum(p.amount for p in self.pots)
+        """Get total of all pots, including bets not yet collected this round."""
+        return sum(p.amount for p in self.pots) + self.round_bets
+
+    def add_bet(self, player_hand: PlayerHand, amount: int):
+        """Move chips a player has already taken from their stack into their bet."""
+        player_hand.current_bet += amount
+        player_hand.total_bet += amount
+        self.round_bets += amount
 
 
 @dataclass
-class Game:
+class Game(Memoized):
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     creator: str = ""
     status: GameStatus = GameStatus.WAITING
@@ -120,32 +182,57 @@ class Game:
     elimination_order: list[str] = field(default_factory=list)  # nicknames in elimination order
     active_hand: Optional[Hand] = None
     created_at: datetime = field(default_factory=datetime.utcnow)
+    config: TableConfig = DEFAULT_TABLE
+    seats: list[Optional[GamePlayer]] = field(init=False)  # Fixed size; None = empty seat
+    _by_nickname: dict[str, GamePlayer] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self):
+        self.seats = [None] * self.config.max_players
 
     def to_dict(self, viewer_nickname: Optional[str] = None) -> dict:
-        result = {
+        result = dict(self._fragment(None, self._build_dict))
+        # Players join and leave in place, so the list is rebuilt (from their fragments)
+        result["players"] = [p.to_dict() for p in self.players]
+        result["player_count"] = len(self.players)
+        if self.active_hand:
+            result["active_hand"] = self.active_hand.to_dict(viewer_nickname)
+        return result
+
+    def _build_dict(self) -> dict:
+        return {
             "id": self.id,
             "creator": self.creator,
             "status": self.status.value,
-            "players": [p.to_dict() for p in self.players],
-            "player_count": len(self.players),
+            "players": None,
+            "player_count": None,
             "current_hand_num": self.current_hand_num,
             "dealer_position": self.dealer_position,
+            "seat_count": len(self.seats),
             "created_at": self.created_at.isoformat(),
+            "config": self.config.to_dict(),
         }
-        if self.active_hand:
-            result["active_hand"] = self.active_hand.to_dict(viewer_nickname)
-        return result
 
-    def add_player(self, nickname: str, starting_chips: int) -> GamePlayer:
-        player = GamePlayer(nickname=nickname, chips=starting_chips)
+    def add_player(self, nickname: str, starting_chips: int, seat: Optional[int] = None) -> GamePlayer:
+        """Seat a player in the given seat, or the first empty one."""
+        if seat is None:
+            seat = self.seats.index(None) if None in self.seats else None
+        if seat is None or self.seats[seat] is not None:
+            raise ValueError(f"No empty seat (table has {len(self.seats)})")
+        player = GamePlayer(nickname=nickname, chips=starting_chips, seat=seat)
+        self.seats[seat] = player
         self.players.append(player)
+        self._by_nickname[nickname] = player
+        return player
+
+    def remove_player(self, nickname: str) -> GamePlayer:
+        """Take a player out of the game and empty their seat (between hands only)."""
+        player = self._by_nickname.pop(nickname)
+        self.seats[player.seat] = None
+        self.players.remove(player)
         return player
 
     def get_player(self, nickname: str) -> Optional[GamePlayer]:
-        for player in self.players:
-            if player.nickname == nickname:
-                return player
-        return None
+        return self._by_nickname.get(nickname)
 
     def has_player(self, nickname: str) -> bool:
         return self.get_player(nickname) is not None
@@ -155,8 +242,6 @@ class Game:
         return [p for p in self.players if not p.is_eliminated]
 
     def get_player_position(self, nickname: str) -> int:
-        """Get position index of a player."""
-        for i, p in enumerate(self.players):
-            if p.nickname == nickname:
-                return i
-        return -1
+        """Get the seat of a player."""
+        player = self.get_player(nickname)
+        return player.seat if player else -1
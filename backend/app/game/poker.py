@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 from enum import IntEnum
+from functools import cached_property
 from itertools import combinations
+from pathlib import Path
 import random
 from typing import Optional
 
@@ -57,44 +59,110 @@ class Card:
         return f"{self.rank}{self.suit}"
 
     def to_dict(self) -> dict:
+        """Built once per card and shared by every caller, so don't modify it."""
+        return self._dict
+
+    @cached_property
+    def _dict(self) -> dict:
         return {"rank": self.rank.value, "suit": self.suit.value}
 
     @classmethod
     def from_dict(cls, data: dict) -> "Card":
         return cls(rank=Rank(data["rank"]), suit=Suit(data["suit"]))
 
+    @property
+    def code(self) -> str:
+        """Two-character form used by game logs and hand histories: "Ah", "Td", "2c"."""
+        return _RANK_CHARS[self.rank - 2] + _SUIT_CHARS[self.suit]
+
+    @classmethod
+    def from_code(cls, code: str) -> "Card":
+        return cls(rank=Rank(_RANK_CHARS.index(code[0]) + 2), suit=Suit(_SUIT_CHARS.index(code[1])))
+
+
+_RANK_CHARS = "23456789TJQKA"
+_SUIT_CHARS = "cdhs"
+
+
+# Every card in a standard deck, built once and shared by all decks
+FULL_DECK: tuple[Card, ...] = tuple(
+    Card(rank=rank, suit=suit)
+    for suit in Suit
+    for rank in Rank
+)
+
+# Cryptographically secure source used when no seed is given
+_system_random = random.SystemRandom()
+
+
+def new_rng(seed: Optional[int] = None) -> random.Random:
+    """
+    Create a random number generator for dealing.
+    Without a seed this is the OS CSPRNG; with a seed it is a reproducible PRNG
+    (for tests and replaying hands).
+    """
+    if seed is None:
+        return _system_random
+    return random.Random(seed)
+
 
 class Deck:
-    def __init__(self):
+    """
+    A deck that shuffles lazily.
+
+    Shuffling only marks the deck as shuffled. Each deal then runs one step of a
+    Fisher-Yates shuffle per card drawn, so a hand that uses 20 cards never pays
+    for shuffling the other 32. Dealt cards stay at the front of `cards` and
+    `_next` points at the top of the remaining deck, so dealing never copies.
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.rng = rng if rng is not None else _system_random
         self.cards: list[Card] = []
+        self._next = 0
+        self._shuffled = False
         self.reset()
 
     def reset(self):
         """Reset deck to full 52 cards."""
-        self.cards = [
-            Card(rank=rank, suit=suit)
-            for suit in Suit
-            for rank in Rank
-        ]
+        self.cards = list(FULL_DECK)
+        self._next = 0
+        self._shuffled = False
 
     def shuffle(self):
-        """Shuffle the deck."""
-        random.shuffle(self.cards)
+        """Shuffle the remaining cards (lazily, as they are dealt)."""
+        self._shuffled = True
 
     def deal(self, count: int = 1) -> list[Card]:
         """Deal cards from the top of the deck."""
-        if count > len(self.cards):
-            raise ValueError(f"Cannot deal {count} cards, only {len(self.cards)} remaining")
-        dealt = self.cards[:count]
-        self.cards = self.cards[count:]
-        return dealt
+        cards = self.cards
+        start = self._next
+        end = start + count
+        if end > len(cards):
+            raise ValueError(f"Cannot deal {count} cards, only {len(cards) - start} remaining")
+
+        if self._shuffled:
+            # Partial Fisher-Yates: swap a random remaining card into each dealt slot
+            randrange = self.rng.randrange
+            size = len(cards)
+            for i in range(start, end):
+                j = randrange(i, size)
+                cards[i], cards[j] = cards[j], cards[i]
+
+        self._next = end
+        return cards[start:end]
 
     def deal_one(self) -> Card:
         """Deal a single card."""
         return self.deal(1)[0]
 
+    @property
+    def remaining(self) -> list[Card]:
+        """Cards not yet dealt (in dealing order only if the deck is unshuffled)."""
+        return self.cards[self._next:]
+
     def __len__(self):
-        return len(self.cards)
+        return len(self.cards) - self._next
 
 
 @dataclass
@@ -215,6 +283,83 @@ def evaluate_hand(cards: list[Card]) -> HandResult:
     return best
 
 
+_WHEEL = (1 << Rank.ACE) | (1 << Rank.TWO) | (1 << Rank.THREE) | (1 << Rank.FOUR) | (1 << Rank.FIVE)
+
+
+def _straight_high(rank_mask: int) -> int:
+    """Highest straight in a bitmask of ranks (bit r set for rank r), or 0."""
+    for high in range(Rank.ACE, Rank.FIVE, -1):
+        run = 0x1F << (high - 4)
+        if rank_mask & run == run:
+            return high
+    return Rank.FIVE if rank_mask & _WHEEL == _WHEEL else 0
+
+
+def _pack(category: int, ranks) -> int:
+    value = category
+    for i, r in enumerate(ranks):
+        value = (value << 4) | r
+    # Left-align so values with fewer tiebreakers compare like shorter tuples
+    return value << (4 * (5 - len(ranks)))
+
+
+def hand_value(cards: list[Card]) -> int:
+    """
+    Strength of the best 5-card hand in 5 to 7 cards, as a single int.
+    Orders hands exactly like evaluate_hand (verified by tools/verify_evaluator)
+    but looks at each card once instead of trying all 21 five-card subsets,
+    so it is the evaluator to use for equity simulations.
+    """
+    counts = [0] * 15
+    suit_masks = [0, 0, 0, 0]
+    rank_mask = 0
+    for card in cards:
+        r = card.rank
+        counts[r] += 1
+        suit_masks[card.suit] |= 1 << r
+        rank_mask |= 1 << r
+
+    # With at most 7 cards a flush rules out quads and full houses
+    for suit_mask in suit_masks:
+        if suit_mask.bit_count() >= 5:
+            high = _straight_high(suit_mask)
+            if high:
+                return _pack(HandRank.STRAIGHT_FLUSH, (high,))
+            flush = [r for r in range(Rank.ACE, 1, -1) if suit_mask >> r & 1][:5]
+            return _pack(HandRank.FLUSH, flush)
+
+    quads, trips, pairs, singles = [], [], [], []
+    for r in range(Rank.ACE, 1, -1):
+        n = counts[r]
+        if n == 1:
+            singles.append(r)
+        elif n == 2:
+            pairs.append(r)
+        elif n == 3:
+            trips.append(r)
+        elif n == 4:
+            quads.append(r)
+
+    if quads:
+        kicker = max(trips + pairs + singles, default=0)
+        return _pack(HandRank.FOUR_OF_A_KIND, (quads[0], kicker))
+    if trips and (len(trips) > 1 or pairs):
+        pair = max(trips[1:] + pairs)
+        return _pack(HandRank.FULL_HOUSE, (trips[0], pair))
+
+    high = _straight_high(rank_mask)
+    if high:
+        return _pack(HandRank.STRAIGHT, (high,))
+    if trips:
+        return _pack(HandRank.THREE_OF_A_KIND, [trips[0]] + singles[:2])
+    if len(pairs) >= 2:
+        kicker = max(pairs[2:] + singles[:1])
+        return _pack(HandRank.TWO_PAIR, (pairs[0], pairs[1], kicker))
+    if pairs:
+        return _pack(HandRank.PAIR, [pairs[0]] + singles[:3])
+    return _pack(HandRank.HIGH_CARD, singles[:5])
+
+
 def compare_hands(hands: list[list[Card]]) -> list[int]:
     """
     Compare multiple hands and return indices of winners (can be multiple for ties).
@@ -222,3 +367,75 @@ def compare_hands(hands: list[list[Card]]) -> list[int]:
     results = [evaluate_hand(hand) for hand in hands]
     best_result = max(results)
     return [i for i, r in enumerate(results) if r == best_result]
+
+
+# Preflop equity table (built by tools/gen_preflop_tables.py)
+PREFLOP_TABLE_PATH = Path(__file__).parent / "data" / "preflop_equity.bin"
+PREFLOP_TABLE_MAGIC = b"PFEQ"
+PREFLOP_TABLE_VERSION = 1
+# magic, version, max opponents, hands, trials per hand
+PREFLOP_HEADER_FORMAT = "<4sBBHI"
+STARTING_HANDS = 169
+
+
+def starting_hand_index(hole_cards: list[Card]) -> int:
+    """
+    Index (0-168) of the canonical starting hand in a 13x13 grid of ranks:
+    pairs on the diagonal, suited hands at [high][low], offsuit at [low][high].
+    """
+    a, b = hole_cards
+    high, low = (a.rank - 2, b.rank - 2) if a.rank >= b.rank else (b.rank - 2, a.rank - 2)
+    if a.suit == b.suit:
+        return high * 13 + low
+    return low * 13 + high
+
+
+def starting_hand_name(index: int) -> str:
+    """Conventional name of a starting hand index, e.g. 'AKs', 'T9o', '22'."""
+    row, col = divmod(index, 13)
+    if row == col:
+        return _RANK_CHARS[row] * 2
+    if row > col:
+        return _RANK_CHARS[row] + _RANK_CHARS[col] + "s"
+    return _RANK_CHARS[col] + _RANK_CHARS[row] + "o"
+
+
+class PreflopTable:
+    """Read-only, memory-mapped view of the preflop equity table."""
+
+    def __init__(self, path: Path = PREFLOP_TABLE_PATH):
+        import mmap
+        import struct
+
+        self._unpack_from = struct.unpack_from
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.max_opponents, hands, self.trials = struct.unpack_from(
+            PREFLOP_HEADER_FORMAT, self._map
+        )
+        if magic != PREFLOP_TABLE_MAGIC or version != PREFLOP_TABLE_VERSION or hands != STARTING_HANDS:
+            raise ValueError(f"{path} is not a version {PREFLOP_TABLE_VERSION} preflop equity table")
+        self._offset = struct.calcsize(PREFLOP_HEADER_FORMAT)
+
+    def equity(self, index: int, opponents: int) -> float:
+        """Share of the pot won on average (ties split) against random hands."""
+        if not 1 <= opponents <= self.max_opponents:
+            raise ValueError(f"Preflop equity is tabulated for 1-{self.max_opponents} opponents")
+        slot = index * self.max_opponents + opponents - 1
+        return self._unpack_from("<H", self._map, self._offset + 2 * slot)[0] / 65535
+
+
+_preflop_table: Optional[PreflopTable] = None
+
+
+def preflop_table() -> PreflopTable:
+    """The shared preflop table, mapped on first use so startup never pays for it."""
+    global _preflop_table
+    if _preflop_table is None:
+        _preflop_table = PreflopTable()
+    return _preflop_table
+
+
+def preflop_equity(hole_cards: list[Card], opponents: int = 1) -> float:
+    """All-in preflop equity of two hole cards against 1-3 random hands."""
+    return preflop_table().equity(starting_hand_index(hole_cards), opponents)
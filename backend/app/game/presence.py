@@ -0,0 +1,42 @@
+"""
+Player presence: whether a player's socket is there to act on their turn.
+
+The connection layer reports changes and game loops read them, e.g. to fold
+a player whose socket is gone without waiting out the whole turn timer.
+Players never reported (bots, simulated players) count as connected.
+"""
+
+from enum import Enum
+
+
+class Presence(str, Enum):
+    CONNECTED = "connected"
+    AWAY = "away"  # Socket open, but not answering heartbeats
+    GONE = "gone"  # No socket
+
+
+class PresenceBoard:
+    """Presence of every player who is not simply connected, by game."""
+
+    def __init__(self):
+        self._games: dict[str, dict[str, Presence]] = {}
+
+    def get(self, game_id: str, nickname: str) -> Presence:
+        return self._games.get(game_id, {}).get(nickname, Presence.CONNECTED)
+
+    def set(self, game_id: str, nickname: str, presence: Presence):
+        if presence == Presence.CONNECTED:
+            players = self._games.get(game_id)
+            if players is not None:
+                players.pop(nickname, None)
+                if not players:
+                    del self._games[game_id]
+        else:
+            self._games.setdefault(game_id, {})[nickname] = presence
+
+    def remove_game(self, game_id: str):
+        self._games.pop(game_id, None)
+
+
+# Singleton instance
+presence_board = PresenceBoard()
@@ -0,0 +1,74 @@
+"""
+Seat arithmetic for fixed-size tables.
+
+Seats are numbered 0..max_players-1 and never move: an eliminated player's
+seat stays where it was (empty), so the button, the blinds and the order of
+action always follow the physical table.
+"""
+
+from typing import Iterable, Optional, Sequence
+
+
+def next_occupied(seats: Sequence[Optional[object]], seat: int) -> Optional[int]:
+    """The first occupied seat after `seat`, going round the table (None if all are empty)."""
+    num_seats = len(seats)
+    for step in range(1, num_seats + 1):
+        candidate = (seat + step) % num_seats
+        if seats[candidate] is not None:
+            return candidate
+    return None
+
+
+class SeatRing:
+    """
+    The seats that can still act in a hand, as a circular doubly linked list
+    over seat numbers. Moving to the next or previous player and dropping a
+    player who folds or goes all-in are O(1), however many seats the table has.
+    """
+
+    __slots__ = ("_next", "_prev", "size")
+
+    def __init__(self, num_seats: int, members: Iterable[int] = ()):
+        self._next = [-1] * num_seats
+        self._prev = [-1] * num_seats
+        ordered = sorted(members)
+        for i, seat in enumerate(ordered):
+            self._next[seat] = ordered[(i + 1) % len(ordered)]
+            self._prev[seat] = ordered[i - 1]
+        self.size = len(ordered)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, seat: int) -> bool:
+        return self._next[seat] != -1
+
+    def __iter__(self):
+        """Members in seat order."""
+        return (seat for seat in range(len(self._next)) if self._next[seat] != -1)
+
+    def next(self, seat: int) -> int:
+        return self._next[seat]
+
+    def prev(self, seat: int) -> int:
+        return self._prev[seat]
+
+    def remove(self, seat: int):
+        after, before = self._next[seat], self._prev[seat]
+        self._next[before] = after
+        self._prev[after] = before
+        self._next[seat] = self._prev[seat] = -1
+        self.size -= 1
+
+    def first_after(self, seat: int) -> Optional[int]:
+        """The first member after `seat` (which need not be a member itself)."""
+        if not self.size:
+            return None
+        if seat in self:
+            return self._next[seat]
+        num_seats = len(self._next)
+        for step in range(1, num_seats + 1):
+            candidate = (seat + step) % num_seats
+            if self._next[candidate] != -1:
+                return candidate
+        return None
@@ -0,0 +1,101 @@
+"""Per-game table settings: stakes, blind schedule, timers and seat limits."""
+
+from dataclasses import dataclass, replace
+from typing import Optional
+
+from ..config import (
+    STARTING_CHIPS, SMALL_BLIND, BIG_BLIND, HAND_LIMIT, TURN_TIMER_SECONDS,
+    MIN_PLAYERS, MAX_PLAYERS, MAX_SEATS, POINTS_BY_PLACEMENT,
+)
+
+
+@dataclass(frozen=True)
+class BlindLevel:
+    small_blind: int
+    big_blind: int
+
+    def to_dict(self) -> dict:
+        return {"small_blind": self.small_blind, "big_blind": self.big_blind}
+
+
+@dataclass(frozen=True)
+class TableConfig:
+    """
+    Immutable settings for one game. The blinds move up one level every
+    level_hands hands or level_seconds seconds of play, whichever comes first;
+    with neither set the first level is used all game.
+    """
+    starting_chips: int = STARTING_CHIPS
+    blind_levels: tuple[BlindLevel, ...] = (BlindLevel(SMALL_BLIND, BIG_BLIND),)
+    level_hands: Optional[int] = None
+    level_seconds: Optional[float] = None
+    hand_limit: int = HAND_LIMIT
+    turn_timer_seconds: float = TURN_TIMER_SECONDS
+    min_players: int = MIN_PLAYERS
+    max_players: int = MAX_PLAYERS
+    points_by_placement: tuple[int, ...] = tuple(POINTS_BY_PLACEMENT)
+
+    def __post_init__(self):
+        if not self.blind_levels:
+            raise ValueError("A table needs at least one blind level")
+        if not 2 <= self.min_players <= self.max_players <= MAX_SEATS:
+            raise ValueError(f"Need 2 <= min_players <= max_players <= {MAX_SEATS}")
+
+    def level_index(self, hand_number: int, elapsed_seconds: float = 0.0) -> int:
+        """Blind level for a hand (1-based hand number) after some time of play."""
+        level = 0
+        if self.level_hands:
+            level = max(level, (hand_number - 1) // self.level_hands)
+        if self.level_seconds:
+            level = max(level, int(elapsed_seconds // self.level_seconds))
+        return min(level, len(self.blind_levels) - 1)
+
+    def blinds_for(self, hand_number: int, elapsed_seconds: float = 0.0) -> BlindLevel:
+        return self.blind_levels[self.level_index(hand_number, elapsed_seconds)]
+
+    def points_for(self, position: int) -> int:
+        """Leaderboard points for a final placement (1 = winner)."""
+        if position <= len(self.points_by_placement):
+            return self.points_by_placement[position - 1]
+        return 0
+
+    def with_changes(self, **changes) -> "TableConfig":
+        """A copy with some settings changed (e.g. for simulator sweeps)."""
+        return replace(self, **changes)
+
+    def to_dict(self) -> dict:
+        return {
+            "starting_chips": self.starting_chips,
+            "blind_levels": [level.to_dict() for level in self.blind_levels],
+            "level_hands": self.level_hands,
+            "level_seconds": self.level_seconds,
+            "hand_limit": self.hand_limit,
+            "turn_timer_seconds": self.turn_timer_seconds,
+            "min_players": self.min_players,
+            "max_players": self.max_players,
+        }
+
+
+def _escalating(*blinds: tuple[int, int]) -> tuple[BlindLevel, ...]:
+    return tuple(BlindLevel(sb, bb) for sb, bb in blinds)
+
+
+DEFAULT_TABLE = TableConfig()
+
+# Named settings offered when creating a game
+TABLE_PRESETS: dict[str, TableConfig] = {
+    "standard": DEFAULT_TABLE,
+    "turbo": TableConfig(
+        blind_levels=_escalating((10, 20), (15, 30), (25, 50), (50, 100), (75, 150), (100, 200), (150, 300)),
+        level_hands=6,
+        level_seconds=180,
+        hand_limit=40,
+        turn_timer_seconds=12,
+    ),
+    "full_ring": TableConfig(
+        blind_levels=_escalating((10, 20), (15, 30), (25, 50), (50, 100), (100, 200)),
+        level_hands=10,
+        max_players=MAX_SEATS,
+        points_by_placement=(20, 12, 8, 5, 3, 2, 1),
+    ),
+}
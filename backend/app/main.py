@@ -1,27 +1,54 @@
+import asyncio
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response
 from pathlib import Path
 import json
 
-from .db import connect_db, disconnect_db, create_tables, database
-from .api import router, connection_manager, handle_game_message
+from .config import SLOW_CALLBACK_MS
+from .db import connect_db, disconnect_db, migrate_schema, database
+from .api import router, admin_router, connection_manager, handle_game_message
+from .api.ratelimit import Verdict
+from .profiling import current_game_id, slow_callback_detector
+from .startup import startup_profiler
+from .static_assets import AssetCache
+from .bots import loaded_bot_manager
+from .tournament import loaded_tournament_manager
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    await connect_db()
+    startup_profiler.mark("imports")
     if database:
-        await create_tables()
+        with startup_profiler.phase("connect_db"):
+            await connect_db()
+        with startup_profiler.phase("migrate_schema"):
+            await migrate_schema()
+    if SLOW_CALLBACK_MS > 0:
+        slow_callback_detector.install(SLOW_CALLBACK_MS / 1000)
+    if static_dir.exists():
+        with startup_profiler.phase("load_static_assets"):
+            static_assets.load()
+    heartbeat = asyncio.create_task(connection_manager.run_heartbeat())
+    startup_profiler.finish()
     yield
     # Shutdown
+    heartbeat.cancel()
+    # Bots and tournaments only load once used; if they never were there is nothing to stop
+    for manager in (loaded_bot_manager(), loaded_tournament_manager()):
+        if manager is not None:
+            manager.shutdown()
+    slow_callback_detector.uninstall()
     await disconnect_db()
 
 
+static_dir = Path(__file__).parent.parent.parent / "frontend" / "build"
+static_assets = AssetCache(static_dir)
+
 app = FastAPI(lifespan=lifespan)
 app.include_router(router)
+app.include_router(admin_router)
 
 @app.get("/api/health")
 async def health_check():
@@ -37,6 +64,10 @@ async def lobby_websocket(websocket: WebSocket):
         while True:
             # Lobby connections just receive updates, no messages expected
             await websocket.receive_text()
+            connection_manager.touch(websocket)
+            if connection_manager.check_lobby_message(websocket) is Verdict.DISCONNECT:
+                await websocket.close(code=4008, reason="Too many messages")
+                raise WebSocketDisconnect(4008)
     except WebSocketDisconnect:
         connection_manager.disconnect_from_lobby(websocket)
 
@@ -49,6 +80,9 @@ async def game_websocket(websocket: WebSocket, game_id: str, nickname: str):
         await websocket.close(code=4000, reason=error)
         return
 
+    # Tag everything this connection runs (including tasks it starts) with the game
+    current_game_id.set(game_id)
+
     # Send current game state on connect
     from .game import game_manager
     game = game_manager.get_game(game_id)
@@ -65,11 +99,16 @@ async def game_websocket(websocket: WebSocket, game_id: str, nickname: str):
 
     try:
         while True:
-            data = await websocket.receive_text()
-            message = json.loads(data)
-            await handle_game_message(game_id, nickname, message)
+            text = await websocket.receive_text()
+            connection_manager.touch(websocket)
+            verdict = connection_manager.check_game_message(game_id, nickname)
+            if verdict is Verdict.ALLOW:
+                await handle_game_message(game_id, nickname, text)
+            elif verdict is Verdict.DISCONNECT:
+                await websocket.close(code=4008, reason="Too many messages")
+                raise WebSocketDisconnect(4008)
     except WebSocketDisconnect:
-        connection_manager.disconnect_from_game(game_id, nickname)
+        connection_manager.disconnect_from_game(game_id, nickname, websocket)
         # Notify others that player disconnected
         await connection_manager.broadcast_to_game(game_id, {
             "type": "player_disconnected",
@@ -77,25 +116,35 @@ async def game_websocket(websocket: WebSocket, game_id: str, nickname: str):
         })
 
 
-# Serve static files from frontend build
-static_dir = Path(__file__).parent.parent.parent / "frontend" / "build"
-if static_dir.exists():
-    # Mount static files for assets (js, css, etc.)
-    app.mount("/_app", StaticFiles(directory=static_dir / "_app"), name="app_assets")
-
-    # Serve index.html for all non-API routes (SPA fallback)
-    @app.get("/{path:path}")
-    async def serve_spa(path: str):
-        # Try to serve the exact file first
-        file_path = static_dir / path
-        if file_path.is_file():
-            return FileResponse(file_path)
-        # Fallback to index.html for client-side routing
-        return FileResponse(static_dir / "index.html")
+@app.websocket("/ws/game/{game_id}/spectate")
+async def spectate_websocket(websocket: WebSocket, game_id: str):
+    """Read-only WebSocket for watching a game."""
+    error = await connection_manager.connect_spectator(websocket, game_id)
+    if error:
+        await websocket.close(code=4000, reason=error)
+        return
 
-    @app.get("/")
-    async def serve_index():
-        return FileResponse(static_dir / "index.html")
+    try:
+        while True:
+            # Spectators only receive; anything they send just shows they are alive
+            await websocket.receive_text()
+            connection_manager.touch(websocket)
+            if connection_manager.check_spectator_message(websocket) is Verdict.DISCONNECT:
+                await websocket.close(code=4008, reason="Too many messages")
+                raise WebSocketDisconnect(4008)
+    except WebSocketDisconnect:
+        connection_manager.disconnect_spectator(game_id, websocket)
+
+
+# Serve the frontend build from memory (loaded at startup)
+if static_dir.exists():
+    # Files by path (js, css, etc.), index.html for all other non-API routes (SPA fallback)
+    @app.api_route("/{path:path}", methods=["GET", "HEAD"])
+    async def serve_spa(request: Request, path: str):
+        asset = static_assets.lookup(path)
+        if asset is None:
+            return Response(status_code=404)
+        return static_assets.response(request, asset)
 else:
     @app.get("/")
     async def root():
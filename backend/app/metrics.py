@@ -0,0 +1,189 @@
+"""
+Minimal Prometheus-style metrics.
+
+Hot paths guard their instrumentation with `if metrics.enabled:` so a
+disabled registry costs one global lookup per event. Values that are cheap to
+read from existing state (games by status, open sockets, timer tasks) are not
+tracked per event at all; they are computed by collectors at scrape time.
+"""
+
+from bisect import bisect_left
+from typing import Callable, Optional
+
+from .config import METRICS_ENABLED
+
+enabled: bool = METRICS_ENABLED
+
+# Latency buckets in seconds
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._children: dict[tuple, "_Metric"] = {}
+
+    def labels(self, *values) -> "_Metric":
+        """Get the child for these label values (created once, then reused)."""
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self._new_child()
+        return child
+
+    def _new_child(self) -> "_Metric":
+        raise NotImplementedError
+
+    def _samples(self) -> list[str]:
+        if self.labelnames:
+            lines = []
+            for values, child in sorted(self._children.items()):
+                lines.extend(child._child_samples(self.name, self.labelnames, values))
+            return lines
+        return self._child_samples(self.name, (), ())
+
+    def _child_samples(self, name: str, labelnames: tuple, values: tuple) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple = ()):
+        super().__init__(name, help, labelnames)
+        self.value = 0.0
+
+    def _new_child(self) -> "Counter":
+        return Counter(self.name, self.help)
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def set_total(self, value: float):
+        """Mirror a running total kept elsewhere (from a collector, at scrape time)."""
+        self.value = value
+
+    def _child_samples(self, name, labelnames, values):
+        return [f"{name}{_format_labels(labelnames, values)} {self.value}"]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: tuple = ()):
+        super().__init__(name, help, labelnames)
+        self.value = 0.0
+
+    def _new_child(self) -> "Gauge":
+        return Gauge(self.name, self.help)
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.value -= amount
+
+    def _child_samples(self, name, labelnames, values):
+        return [f"{name}{_format_labels(labelnames, values)} {self.value}"]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def _new_child(self) -> "Histogram":
+        return Histogram(self.name, self.help, buckets=self.buckets)
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def _child_samples(self, name, labelnames, values):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            bucket_labels = _format_labels(labelnames, values, 'le="' + le + '"')
+            lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+        labels = _format_labels(labelnames, values)
+        lines.append(f"{name}_sum{labels} {self.sum}")
+        lines.append(f"{name}_count{labels} {self.count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+        self._collectors: list[Callable[[], None]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], None]):
+        """Register a function that updates gauges from live state before each scrape."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            collector()
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+def counter(name: str, help: str, labelnames: tuple = ()) -> Counter:
+    return registry.register(Counter(name, help, labelnames))
+
+
+def gauge(name: str, help: str, labelnames: tuple = ()) -> Gauge:
+    return registry.register(Gauge(name, help, labelnames))
+
+
+def histogram(name: str, help: str, labelnames: tuple = (), buckets: Optional[tuple] = None) -> Histogram:
+    return registry.register(Histogram(name, help, labelnames, buckets or DEFAULT_BUCKETS))
+
+
+# Metrics shared across modules
+GAMES = gauge("poker_games", "Games in memory by status", ("status",))
+CONNECTIONS = gauge("poker_websocket_connections", "Open WebSocket connections", ("channel",))
+TURN_TIMERS = gauge("poker_turn_timer_tasks", "Turn timer tasks currently running")
+BROADCAST_SECONDS = histogram(
+    "poker_broadcast_seconds", "Time to send one message to every recipient", ("channel",)
+)
+MESSAGES_SENT = counter("poker_messages_sent_total", "WebSocket messages sent", ("channel",))
+ENCODE_SECONDS = histogram("poker_message_encode_seconds", "Time to JSON-encode an outgoing message")
+HANDLE_ACTION_SECONDS = histogram(
+    "poker_handle_action_seconds", "GameLoop.handle_action latency, including broadcasts", ("action",)
+)
+SHOWDOWN_SECONDS = histogram("poker_showdown_eval_seconds", "Hand evaluation time at showdown")
+TURN_TIMEOUTS = counter("poker_turn_timeouts_total", "Players auto-folded by the turn timer")
+DB_QUERY_SECONDS = histogram("poker_db_query_seconds", "Database query latency", ("query",))
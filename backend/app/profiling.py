@@ -0,0 +1,224 @@
+"""
+Live diagnosis tools for a running server.
+
+SamplingProfiler interrupts the process with an interval timer signal and
+records the Python stack of the main thread (where the event loop runs) as a
+collapsed stack, the input format of flamegraph.pl and speedscope. Overhead is
+one stack walk per sample; nothing runs between samples.
+
+The slow callback detector times every task step on the event loop and logs
+the ones over a threshold, tagged with the game whose task was running (current_game_id is
+set per WebSocket connection and inherited by the tasks a GameLoop starts).
+"""
+
+import asyncio
+import collections.abc
+from collections import Counter as _Counter, deque
+from contextvars import ContextVar
+from dataclasses import dataclass
+import logging
+import signal
+import time
+from typing import Optional
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+# Game whose code is running in the current task (None outside game sockets)
+current_game_id: ContextVar[Optional[str]] = ContextVar("current_game_id", default=None)
+
+MAX_PROFILE_SECONDS = 60
+MAX_STACK_DEPTH = 128
+
+# Timer used for each sampling mode: "cpu" only ticks while the process is on
+# CPU, "wall" also samples while it waits (e.g. blocked in a slow syscall)
+_TIMERS = {
+    "cpu": (signal.ITIMER_PROF, signal.SIGPROF) if hasattr(signal, "SIGPROF") else None,
+    "wall": (signal.ITIMER_REAL, signal.SIGALRM) if hasattr(signal, "SIGALRM") else None,
+}
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class SamplingProfiler:
+    """Signal-based stack sampler. Only one can run at a time per process."""
+
+    _active: Optional["SamplingProfiler"] = None
+
+    def __init__(self, interval: float = 0.01, mode: str = "cpu"):
+        if _TIMERS.get(mode) is None:
+            raise ValueError(f"Unsupported sampling mode on this platform: {mode}")
+        self.interval = interval
+        self.mode = mode
+        self.samples: _Counter[str] = _Counter()
+        self.sample_count = 0
+        self._previous_handler = None
+
+    @classmethod
+    def running(cls) -> bool:
+        return cls._active is not None
+
+    def start(self):
+        """Install the signal handler and start the timer (main thread only)."""
+        if SamplingProfiler._active is not None:
+            raise RuntimeError("A profile is already running")
+        which, signum = _TIMERS[self.mode]
+        self._previous_handler = signal.signal(signum, self._sample)
+        SamplingProfiler._active = self
+        signal.setitimer(which, self.interval, self.interval)
+
+    def stop(self):
+        which, signum = _TIMERS[self.mode]
+        signal.setitimer(which, 0, 0)
+        signal.signal(signum, self._previous_handler or signal.SIG_DFL)
+        SamplingProfiler._active = None
+
+    def _sample(self, signum, frame):
+        stack = []
+        while frame is not None and len(stack) < MAX_STACK_DEPTH:
+            stack.append(_frame_label(frame))
+            frame = frame.f_back
+        stack.reverse()
+        self.samples[";".join(stack)] += 1
+        self.sample_count += 1
+
+    def collapsed(self) -> str:
+        """Samples as collapsed stacks: 'root;caller;leaf count' per line."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+async def profile_for(seconds: float, interval: float = 0.01, mode: str = "cpu") -> SamplingProfiler:
+    """Sample the process for a fixed time while the event loop keeps running."""
+    profiler = SamplingProfiler(interval, mode)
+    profiler.start()
+    try:
+        await asyncio.sleep(min(seconds, MAX_PROFILE_SECONDS))
+    finally:
+        profiler.stop()
+    return profiler
+
+
+@dataclass
+class SlowCallback:
+    duration: float  # seconds
+    game_id: Optional[str]
+    callback: str
+    at: float  # time.time() when it finished
+
+    def to_dict(self) -> dict:
+        return {
+            "duration_ms": round(self.duration * 1000, 3),
+            "game_id": self.game_id,
+            "callback": self.callback,
+            "at": self.at,
+        }
+
+
+SLOW_CALLBACKS = metrics.counter(
+    "poker_slow_callbacks_total", "Event loop steps slower than the detector threshold"
+)
+
+
+class _TimedCoroutine(collections.abc.Coroutine):
+    """Coroutine proxy that times each step the task runs it for."""
+
+    __slots__ = ("_coro", "_detector")
+
+    def __init__(self, coro, detector: "SlowCallbackDetector"):
+        self._coro = coro
+        self._detector = detector
+
+    def send(self, value):
+        start = time.perf_counter()
+        try:
+            return self._coro.send(value)
+        finally:
+            self._detector._check(self._coro, time.perf_counter() - start)
+
+    def throw(self, *args):
+        start = time.perf_counter()
+        try:
+            return self._coro.throw(*args)
+        finally:
+            self._detector._check(self._coro, time.perf_counter() - start)
+
+    def close(self):
+        return self._coro.close()
+
+    def __await__(self):
+        return self._coro.__await__()
+
+    def __getattr__(self, name):
+        # cr_code, cr_frame, __qualname__... so task reprs and stacks still work
+        return getattr(self._coro, name)
+
+
+def _await_chain(coro) -> str:
+    """Name the coroutines from the task's entry point down to where it is suspended."""
+    names = []
+    while coro is not None and hasattr(coro, "cr_code") and len(names) < MAX_STACK_DEPTH:
+        names.append(getattr(coro, "__qualname__", coro.cr_code.co_name))
+        coro = coro.cr_await
+    return " -> ".join(names)
+
+
+class SlowCallbackDetector:
+    """
+    Times every task step through a task factory, which works on both the
+    default loop and uvloop. Unlike loop.set_debug(True) it adds no other
+    debug-mode overhead. Only tasks created after install() are timed.
+    """
+
+    def __init__(self, history: int = 100):
+        self.threshold: Optional[float] = None
+        self.recent: deque[SlowCallback] = deque(maxlen=history)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._previous_factory = None
+
+    @property
+    def installed(self) -> bool:
+        return self._loop is not None
+
+    def install(self, threshold: float):
+        """Start logging task steps that take longer than threshold seconds (call from the loop)."""
+        self.threshold = threshold
+        if self._loop is not None:
+            return
+        loop = self._loop = asyncio.get_running_loop()
+        previous = self._previous_factory = loop.get_task_factory()
+
+        def factory(loop, coro, **kwargs):
+            if asyncio.iscoroutine(coro):
+                coro = _TimedCoroutine(coro, self)
+            if previous is not None:
+                return previous(loop, coro, **kwargs)
+            return asyncio.Task(coro, loop=loop, **kwargs)
+
+        loop.set_task_factory(factory)
+
+    def uninstall(self):
+        if self._loop is not None:
+            if not self._loop.is_closed():
+                self._loop.set_task_factory(self._previous_factory)
+            self._loop = None
+            self._previous_factory = None
+
+    def _check(self, coro, duration: float):
+        if self._loop is None or duration < self.threshold:
+            return
+        # Runs inside the task, so the context variable is the task's own
+        game_id = current_game_id.get()
+        callback = _await_chain(coro)
+        self.recent.append(SlowCallback(duration, game_id, callback, time.time()))
+        SLOW_CALLBACKS.inc()
+        logger.warning(
+            "Slow event loop step: %.1f ms (game %s) in %s", duration * 1000, game_id or "-", callback
+        )
+
+
+slow_callback_detector = SlowCallbackDetector()
@@ -0,0 +1,3 @@
+from .clock import VirtualTimeEventLoop, run_virtual
+from .policies import POLICIES, Decision, TurnView
+from .simulator import InvariantViolation, SimulationReport, TableSimulator, check_invariants, run_simulation, simulate, turn_view
@@ -0,0 +1,51 @@
+"""
+Run the headless simulator from the command line.
+
+    python -m app.sim --tables 200 --players 4 --policy random,passive --seed 1
+    python -m app.sim --table turbo --hand-limit 100
+"""
+
+import argparse
+import json
+import sys
+
+from ..game.table_config import TABLE_PRESETS
+from .policies import POLICIES
+from .simulator import run_simulation
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Simulate poker tables without sockets or sleeps.")
+    parser.add_argument("--tables", type=int, default=100, help="tables to run concurrently")
+    parser.add_argument("--players", type=int, default=4, help="bots per table")
+    parser.add_argument(
+        "--policy", default="random",
+        help=f"bot policy, or comma-separated list per seat ({', '.join(POLICIES)})",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first table (table i uses seed + i)")
+    parser.add_argument("--no-check", action="store_true", help="skip invariant checks after each action")
+    parser.add_argument("--table", default="standard", choices=TABLE_PRESETS, help="table settings preset")
+    parser.add_argument("--hand-limit", type=int, help="override the preset's hand limit")
+    parser.add_argument("--turn-timer", type=float, help="override the preset's turn timer (seconds)")
+    args = parser.parse_args(argv)
+
+    config = TABLE_PRESETS[args.table]
+    if args.hand_limit is not None:
+        config = config.with_changes(hand_limit=args.hand_limit)
+    if args.turn_timer is not None:
+        config = config.with_changes(turn_timer_seconds=args.turn_timer)
+
+    report = run_simulation(
+        tables=args.tables,
+        players=args.players,
+        policy=args.policy,
+        seed=args.seed,
+        check=not args.no_check,
+        config=config,
+    )
+    print(json.dumps(report.to_dict(), indent=2))
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
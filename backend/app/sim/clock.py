@@ -0,0 +1,82 @@
+"""Virtual-time event loop for running game loops without real waiting."""
+
+import asyncio
+import selectors
+
+
+class _VirtualTimeSelector(selectors.BaseSelector):
+    """
+    Wraps a real selector. Whenever the event loop would block waiting for its
+    next timer, the wait is skipped and the loop's clock jumps forward instead.
+    """
+
+    def __init__(self, selector: selectors.BaseSelector):
+        self._selector = selector
+        self.loop: "VirtualTimeEventLoop | None" = None
+
+    def register(self, fileobj, events, data=None):
+        return self._selector.register(fileobj, events, data)
+
+    def unregister(self, fileobj):
+        return self._selector.unregister(fileobj)
+
+    def modify(self, fileobj, events, data=None):
+        return self._selector.modify(fileobj, events, data)
+
+    def select(self, timeout=None):
+        if self.loop is not None and self.loop.executor_jobs:
+            # Work in an executor takes real time: wait for it (its result
+            # wakes the loop) instead of skipping ahead past it
+            return self._selector.select(timeout)
+        if timeout and timeout > 0 and self.loop is not None:
+            self.loop.advance(timeout)
+        # Never block on real I/O: the simulator has no sockets
+        return self._selector.select(0)
+
+    def get_map(self):
+        return self._selector.get_map()
+
+    def close(self):
+        self._selector.close()
+
+
+class VirtualTimeEventLoop(asyncio.SelectorEventLoop):
+    """
+    Event loop whose clock only moves when there is nothing left to run.
+
+    asyncio.sleep(), call_later() and the game loop's turn timers all run
+    against this clock, so a 30 second turn timer or the 3 second pause between
+    hands costs no wall time.
+    """
+
+    def __init__(self):
+        selector = _VirtualTimeSelector(selectors.DefaultSelector())
+        self._virtual_time = 0.0
+        self.executor_jobs = 0  # run_in_executor calls still running
+        super().__init__(selector)
+        selector.loop = self
+
+    def time(self) -> float:
+        return self._virtual_time
+
+    def advance(self, seconds: float):
+        """Move the virtual clock forward."""
+        self._virtual_time += seconds
+
+    def run_in_executor(self, executor, func, *args):
+        future = super().run_in_executor(executor, func, *args)
+        self.executor_jobs += 1
+        future.add_done_callback(self._executor_job_done)
+        return future
+
+    def _executor_job_done(self, future):
+        self.executor_jobs -= 1
+
+
+def run_virtual(coro):
+    """Run a coroutine to completion on a fresh virtual-time loop."""
+    loop = VirtualTimeEventLoop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
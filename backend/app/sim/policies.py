@@ -0,0 +1,115 @@
+"""Bot policies for the headless simulator."""
+
+from dataclasses import dataclass
+import random
+from typing import Callable, Optional
+
+from ..game.poker import Card
+
+
+@dataclass
+class TurnView:
+    """What a bot can see when it is asked to act."""
+    nickname: str
+    valid_actions: dict  # as returned by actions.get_valid_actions
+    hole_cards: list[Card]
+    community_cards: list[Card]
+    pot: int
+    current_bet: int  # Bet to match this round
+    my_bet: int  # What this player has already put in this round
+    chips: int
+    opponents: int = 1  # Other players still in the hand
+
+    @property
+    def to_call(self) -> int:
+        return self.current_bet - self.my_bet
+
+    @property
+    def min_raise_to(self) -> Optional[int]:
+        """Smallest legal raise as a total bet for this round, if raising is allowed."""
+        raise_range = self.valid_actions.get("raise")
+        return self.my_bet + raise_range["min"] if raise_range else None
+
+    @property
+    def max_raise_to(self) -> Optional[int]:
+        """Largest legal raise as a total bet for this round, if raising is allowed."""
+        raise_range = self.valid_actions.get("raise")
+        return self.my_bet + raise_range["max"] if raise_range else None
+
+
+@dataclass
+class Decision:
+    """An action for GameLoop.handle_action. Raise amounts are the round total."""
+    action: str
+    amount: Optional[int] = None
+    delay: float = 0.0  # Virtual seconds to "think" before acting
+
+    @property
+    def params(self) -> dict:
+        return {"amount": self.amount} if self.amount is not None else {}
+
+
+# A policy returns a Decision, or None to never act (the turn timer fires instead)
+Policy = Callable[[TurnView, random.Random], Optional[Decision]]
+
+
+def passive_policy(view: TurnView, rng: random.Random) -> Decision:
+    """Check when possible, otherwise call."""
+    if "check" in view.valid_actions:
+        return Decision("check")
+    return Decision("call")
+
+
+def check_fold_policy(view: TurnView, rng: random.Random) -> Decision:
+    """Check when possible, otherwise fold."""
+    if "check" in view.valid_actions:
+        return Decision("check")
+    return Decision("fold")
+
+
+def aggressive_policy(view: TurnView, rng: random.Random) -> Decision:
+    """Min-raise whenever allowed, otherwise call."""
+    if view.min_raise_to is not None:
+        return Decision("raise", view.min_raise_to)
+    if "check" in view.valid_actions:
+        return Decision("check")
+    return Decision("call")
+
+
+def random_policy(view: TurnView, rng: random.Random) -> Decision:
+    """Pick uniformly among the valid actions, with a random legal raise size."""
+    choices = [a for a in view.valid_actions if a != "raise"]
+    if view.min_raise_to is not None:
+        choices.append("raise")
+    action = rng.choice(choices)
+    delay = rng.uniform(0.5, 5.0)
+    if action == "raise":
+        return Decision("raise", rng.randint(view.min_raise_to, view.max_raise_to), delay)
+    return Decision(action, delay=delay)
+
+
+def sleepy_policy(view: TurnView, rng: random.Random) -> Optional[Decision]:
+    """Like random_policy, but sometimes never answers so the turn timer fires."""
+    if rng.random() < 0.05:
+        return None
+    return random_policy(view, rng)
+
+
+def fuzz_policy(view: TurnView, rng: random.Random) -> Decision:
+    """Mostly legal play, mixed with out-of-range and unknown actions."""
+    roll = rng.random()
+    if roll < 0.05:
+        return Decision("raise", rng.randint(-10, view.chips * 2 + 10))
+    if roll < 0.08:
+        return Decision(rng.choice(["check", "call", "all_in", "dance"]))
+    return random_policy(view, rng)
+
+
+POLICIES: dict[str, Policy] = {
+    "passive": passive_policy,
+    "check_fold": check_fold_policy,
+    "aggressive": aggressive_policy,
+    "random": random_policy,
+    "sleepy": sleepy_policy,
+    "fuzz": fuzz_policy,
+}
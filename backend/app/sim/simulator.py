@@ -0,0 +1,297 @@
+"""
+Headless table simulator.
+
+Runs real GameLoop instances with bot players on a virtual-time event loop:
+no sockets, no real sleeps. Used for capacity planning (hands/sec, actions/sec,
+action latency) and as a fuzz harness that checks chip conservation after
+every action.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+import random
+import time
+from typing import Optional
+
+from ..game.models import Game, GameStatus
+from ..game.table_config import DEFAULT_TABLE, TableConfig
+from ..game.game_loop import GameLoop
+from .clock import run_virtual
+from .policies import POLICIES, Decision, Policy, TurnView
+
+
+# A table that has not finished after this much virtual time is considered stuck
+TABLE_TIMEOUT_SECONDS = 7 * 24 * 3600
+
+
+class InvariantViolation(AssertionError):
+    """Raised when the game state breaks a rule that must always hold."""
+    pass
+
+
+def check_invariants(game: Game, total_chips: int, hand_settled: bool = False) -> None:
+    """
+    Check chip conservation and basic sanity of a game's state.
+    hand_settled means the active hand's pot has already been paid out.
+    """
+    chips = 0
+    for player in game.players:
+        if player.chips < 0:
+            raise InvariantViolation(f"{player.nickname} has negative chips ({player.chips})")
+        chips += player.chips
+
+    hand = game.active_hand
+    if hand and not hand_settled:
+        committed = 0
+        outstanding = 0
+        for ph in hand.player_hands.values():
+            if ph.current_bet < 0 or ph.current_bet > ph.total_bet:
+                raise InvariantViolation(
+                    f"{ph.nickname} has bet {ph.current_bet} this round but {ph.total_bet} this hand"
+                )
+            committed += ph.total_bet
+            outstanding += ph.current_bet
+        if outstanding != hand.round_bets:
+            raise InvariantViolation(f"Open bets total {outstanding} but the hand tracks {hand.round_bets}")
+        if hand.current_seat is not None:
+            ph = hand.player_hands[hand.seats[hand.current_seat]]
+            if ph.folded or ph.is_all_in or ph.seat != hand.current_seat:
+                raise InvariantViolation(f"Action is on seat {hand.current_seat}, which cannot act")
+        collected = sum(p.amount for p in hand.pots)
+        if collected + outstanding != committed:
+            raise InvariantViolation(
+                f"Pot holds {collected} + {outstanding} in open bets, but players committed {committed}"
+            )
+        chips += committed
+
+    if chips != total_chips:
+        raise InvariantViolation(f"Chips not conserved: {chips} in play, expected {total_chips}")
+
+
+def turn_view(game: Game, nickname: str) -> TurnView:
+    """What a player can see when it is their turn."""
+    from ..game.actions import get_valid_actions
+
+    hand = game.active_hand
+    player_hand = hand.player_hands[nickname]
+    return TurnView(
+        nickname=nickname,
+        valid_actions=get_valid_actions(game, nickname),
+        hole_cards=player_hand.hole_cards,
+        community_cards=hand.community_cards,
+        pot=hand.get_total_pot(),
+        current_bet=hand.current_bet,
+        my_bet=player_hand.current_bet,
+        chips=game.get_player(nickname).chips,
+        opponents=hand.players_in_hand - 1,
+    )
+
+
+@dataclass
+class TableResult:
+    table_id: int
+    seed: int
+    hands: int = 0
+    actions: int = 0
+    timeouts: int = 0
+    finished: bool = False
+    error: Optional[str] = None
+
+
+@dataclass
+class SimulationReport:
+    tables: list[TableResult]
+    wall_seconds: float
+    virtual_seconds: float
+    latencies: list[float] = field(default_factory=list)  # seconds per action
+
+    @property
+    def hands(self) -> int:
+        return sum(t.hands for t in self.tables)
+
+    @property
+    def actions(self) -> int:
+        return sum(t.actions for t in self.tables)
+
+    @property
+    def errors(self) -> list[str]:
+        return [f"table {t.table_id} (seed {t.seed}): {t.error}" for t in self.tables if t.error]
+
+    def percentile(self, pct: float) -> float:
+        """Action latency percentile in seconds."""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        idx = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+        return ordered[idx]
+
+    def to_dict(self) -> dict:
+        wall = self.wall_seconds or 1e-9
+        return {
+            "tables": len(self.tables),
+            "hands": self.hands,
+            "actions": self.actions,
+            "timeouts": sum(t.timeouts for t in self.tables),
+            "wall_seconds": round(self.wall_seconds, 4),
+            "virtual_seconds": round(self.virtual_seconds, 1),
+            "hands_per_sec": round(self.hands / wall, 1),
+            "actions_per_sec": round(self.actions / wall, 1),
+            "latency_ms": {
+                f"p{p}": round(self.percentile(p) * 1000, 4) for p in (50, 90, 99)
+            } | {"max": round(max(self.latencies, default=0.0) * 1000, 4)},
+            "errors": self.errors,
+        }
+
+
+class TableSimulator:
+    """Drives one GameLoop with bot players."""
+
+    def __init__(
+        self,
+        table_id: int,
+        policies: list[Policy],
+        seed: int,
+        check: bool = True,
+        latencies: Optional[list[float]] = None,
+        config: TableConfig = DEFAULT_TABLE,
+    ):
+        self.game = Game(creator="bot0", config=config)
+        self.policies: dict[str, Policy] = {}
+        for i, policy in enumerate(policies):
+            nickname = f"bot{i}"
+            self.game.add_player(nickname, config.starting_chips)
+            self.policies[nickname] = policy
+
+        self.result = TableResult(table_id=table_id, seed=seed)
+        self.rng = random.Random(seed)
+        self.loop = GameLoop(self.game, self.broadcast, seed=seed)
+        self.check = check
+        self.total_chips = config.starting_chips * len(policies)
+        self.latencies = latencies if latencies is not None else []
+        self.done = asyncio.Event()
+        self._tasks: set[asyncio.Task] = set()
+        self._action_started: Optional[float] = None
+
+    async def run(self) -> TableResult:
+        try:
+            await asyncio.wait_for(self._play(), TABLE_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            self.fail("Table did not finish (stuck waiting for an action)")
+        finally:
+            self.loop.cancel_tasks()
+            for task in self._tasks:
+                task.cancel()
+        self.result.finished = self.game.status == GameStatus.FINISHED and not self.result.error
+        return self.result
+
+    async def _play(self):
+        self._start_task(self.loop.start_game())
+        await self.done.wait()
+
+    def fail(self, error: str):
+        if not self.result.error:
+            self.result.error = error
+        self.done.set()
+
+    async def broadcast(self, game_id: str, message: dict, viewer_nickname: Optional[str] = None):
+        """No-op transport: observe the events the game loop sends."""
+        msg_type = message["type"]
+
+        if self._action_started is not None and msg_type in ("turn", "hand_result", "game_ended"):
+            self.latencies.append(time.perf_counter() - self._action_started)
+            self._action_started = None
+
+        if msg_type == "player_action":
+            self.result.actions += 1
+            if self.check:
+                self._check(hand_settled=False)
+        elif msg_type == "hand_result":
+            self.result.hands += 1
+            if self.check:
+                self._check(hand_settled=True)
+        elif msg_type == "turn":
+            self._schedule_turn(message["payload"]["current_player"])
+        elif msg_type == "game_ended":
+            self.done.set()
+
+    def _check(self, hand_settled: bool):
+        # Broadcasts also run inside GameLoop's own tasks (the next hand, the
+        # turn timer), whose errors never reach _task_done, so record it here
+        try:
+            check_invariants(self.game, self.total_chips, hand_settled=hand_settled)
+        except InvariantViolation as exc:
+            self.fail(f"{type(exc).__name__}: {exc}")
+            raise
+
+    def _schedule_turn(self, nickname: str):
+        view = turn_view(self.game, nickname)
+        decision = self.policies[nickname](view, self.rng)
+        if decision is None:
+            # Let the turn timer expire
+            self.result.timeouts += 1
+            return
+        asyncio.get_running_loop().call_later(
+            decision.delay, lambda: self._start_task(self._act(nickname, decision))
+        )
+
+    async def _act(self, nickname: str, decision: Decision):
+        self._action_started = time.perf_counter()
+        await self.loop.handle_action(nickname, decision.action, decision.params)
+
+    def _start_task(self, coro):
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+
+    def _task_done(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            self.fail(f"{type(exc).__name__}: {exc}")
+
+
+async def simulate(
+    tables: int = 10,
+    players: int = 4,
+    policy: str = "random",
+    seed: int = 0,
+    check: bool = True,
+    config: TableConfig = DEFAULT_TABLE,
+) -> SimulationReport:
+    """
+    Run several tables concurrently on the current (virtual-time) loop.
+    policy may be a comma-separated list, assigned to seats in turn.
+    config sets the table rules (blinds, timers, hand limit) for every table.
+    """
+    names = policy.split(",")
+    seat_policies = [POLICIES[names[i % len(names)]] for i in range(players)]
+    latencies: list[float] = []
+    sims = [
+        TableSimulator(
+            table_id=i,
+            policies=seat_policies,
+            seed=seed + i,
+            check=check,
+            latencies=latencies,
+            config=config,
+        )
+        for i in range(tables)
+    ]
+
+    loop = asyncio.get_running_loop()
+    virtual_start = loop.time()
+    wall_start = time.perf_counter()
+    results = await asyncio.gather(*(sim.run() for sim in sims))
+    return SimulationReport(
+        tables=list(results),
+        wall_seconds=time.perf_counter() - wall_start,
+        virtual_seconds=loop.time() - virtual_start,
+        latencies=latencies,
+    )
+
+
+def run_simulation(**kwargs) -> SimulationReport:
+    """Run simulate() on a fresh virtual-time event loop."""
+    return run_virtual(simulate(**kwargs))
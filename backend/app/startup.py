@@ -0,0 +1,146 @@
+"""
+Startup timing.
+
+StartupProfiler times the phases of a boot (imports, then each init step of
+the lifespan hook) and logs them once the server is ready. With
+STARTUP_PROFILE=1 it also times every module import: a meta path finder,
+installed before the rest of the app is imported, wraps each module's loader
+so exec_module is timed, and the report lists the modules with the most
+self time (their own top-level code, without the imports it triggers) --
+like `python -X importtime`, but from inside the server and in its logs.
+
+Only the standard library is imported here, so the import timing starts
+before anything heavy loads.
+"""
+
+from contextlib import contextmanager
+from importlib.abc import MetaPathFinder
+import logging
+import sys
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _TimedLoader:
+    """Delegates to a module's real loader and times exec_module."""
+
+    def __init__(self, loader, profiler: "StartupProfiler"):
+        self._loader = loader
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        create = getattr(self._loader, "create_module", None)
+        return create(spec) if create else None
+
+    def exec_module(self, module):
+        self._profiler._enter(module.__name__)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit()
+
+
+class _TimingFinder(MetaPathFinder):
+    """Finds modules with the finders after it and wraps their loaders."""
+
+    def __init__(self, profiler: "StartupProfiler"):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader, self._profiler)
+            return spec
+        return None
+
+
+class StartupProfiler:
+    """Boot phases, and optionally imports, with their durations."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: list[tuple[str, float]] = []
+        self.imports: dict[str, list[float]] = {}  # module -> [self seconds, total seconds]
+        self.finished: Optional[float] = None
+        self._finder: Optional[_TimingFinder] = None
+        self._stack: list[list] = []  # [module, start, seconds in nested imports]
+
+    @property
+    def importing(self) -> bool:
+        return self._finder is not None
+
+    def install(self):
+        """Start timing imports."""
+        if self._finder is None:
+            self._finder = _TimingFinder(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self):
+        if self._finder is not None:
+            sys.meta_path.remove(self._finder)
+            self._finder = None
+
+    def _enter(self, name: str):
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def _exit(self):
+        name, start, nested = self._stack.pop()
+        total = time.perf_counter() - start
+        self.imports[name] = [total - nested, total]
+        if self._stack:
+            self._stack[-1][2] += total
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time one init step."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def mark(self, name: str):
+        """Record everything since the last phase ended (or since startup) as one phase."""
+        elapsed = sum(seconds for _, seconds in self.phases)
+        self.phases.append((name, time.perf_counter() - self.started - elapsed))
+
+    def slowest_imports(self, count: int = 15) -> list[tuple[str, float, float]]:
+        """(module, self seconds, total seconds), most self time first."""
+        ranked = sorted(self.imports.items(), key=lambda item: item[1][0], reverse=True)
+        return [(name, times[0], times[1]) for name, times in ranked[:count]]
+
+    def finish(self):
+        """Stop timing imports and log the report."""
+        self.finished = time.perf_counter() - self.started
+        self.uninstall()
+        phases = ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.phases)
+        logger.info("Started in %.0fms: %s", self.finished * 1000, phases)
+        if self.imports:
+            logger.info("Slowest imports (self / total ms):\n%s", "\n".join(
+                f"  {self_s * 1000:8.1f} {total_s * 1000:8.1f}  {name}"
+                for name, self_s, total_s in self.slowest_imports()
+            ))
+
+    def to_dict(self) -> dict:
+        return {
+            "total_ms": round(self.finished * 1000, 1) if self.finished is not None else None,
+            "phases": [{"name": name, "ms": round(seconds * 1000, 1)} for name, seconds in self.phases],
+            "imports": [
+                {"module": name, "self_ms": round(self_s * 1000, 2), "total_ms": round(total_s * 1000, 2)}
+                for name, self_s, total_s in self.slowest_imports(50)
+            ],
+        }
+
+
+# Singleton instance
+startup_profiler = StartupProfiler()
@@ -0,0 +1,172 @@
+"""
+In-memory cache of the frontend build.
+
+The build directory is small and never changes while the server runs, so it
+is read once at startup into a table of path -> Asset: the file's bytes, its
+gzip (and, if the brotli package is installed, brotli) variants compressed
+once up front, and an ETag per variant. Requests are then answered from
+memory: the encoding is negotiated from Accept-Encoding, a matching
+If-None-Match gets a 304, and SvelteKit's content-hashed `_app/immutable`
+files are cached by browsers for a year. Other files (index.html, the service
+worker) are revalidated on every load, which is cheap with the ETag.
+
+Variants the build already wrote (`app.js.gz`, `app.js.br`, with the
+adapter's precompress option) are used instead of compressing again.
+"""
+
+from dataclasses import dataclass, field
+import gzip
+import hashlib
+import logging
+import mimetypes
+from pathlib import Path
+from typing import Optional
+
+from fastapi import Request, Response
+
+try:
+    import brotli
+except ImportError:  # Optional: gzip only
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+MIN_COMPRESS_BYTES = 256  # Smaller files are sent as they are
+_COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "application/manifest+json",
+                       "application/xml", "image/svg+xml", "application/wasm")
+
+# Preferred first when the client accepts several equally
+_ENCODERS = {"gzip": lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+if brotli is not None:
+    _ENCODERS = {"br": lambda data: brotli.compress(data, quality=11), **_ENCODERS}
+_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+@dataclass
+class Asset:
+    """One file of the build, ready to send."""
+    body: bytes
+    media_type: str
+    etag: str
+    cache_control: str
+    encoded: dict[str, bytes] = field(default_factory=dict)  # Content-Encoding -> body
+
+    def etag_for(self, encoding: Optional[str]) -> str:
+        # Each representation needs its own strong ETag
+        return self.etag if encoding is None else f'{self.etag[:-1]}-{encoding}"'
+
+
+def _is_compressible(media_type: str) -> bool:
+    return media_type.startswith(_COMPRESSIBLE_TYPES)
+
+
+def parse_accept_encoding(header: str) -> dict[str, float]:
+    """Accept-Encoding as {coding: q}, e.g. "gzip, br;q=0.5" -> {"gzip": 1.0, "br": 0.5}."""
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+def choose_encoding(asset: Asset, header: str) -> Optional[str]:
+    """The best variant the client accepts, or None for the plain bytes."""
+    if not asset.encoded or not header:
+        return None
+    accepted = parse_accept_encoding(header)
+    best, best_q = None, 0.0
+    for encoding in asset.encoded:
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # Weak comparison, as If-None-Match calls for
+    return etag in {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+class AssetCache:
+    """The frontend build, indexed by URL path (without the leading slash)."""
+
+    def __init__(self, root: Path, fallback: str = "index.html"):
+        self.root = root
+        self.fallback = fallback
+        self.assets: dict[str, Asset] = {}
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(len(a.body) + sum(map(len, a.encoded.values())) for a in self.assets.values())
+
+    def load(self):
+        """Read and compress every file of the build."""
+        assets = {}
+        files = {p.relative_to(self.root).as_posix(): p for p in self.root.rglob("*") if p.is_file()}
+        for path, file_path in files.items():
+            if any(path.endswith(s) and path[:-len(s)] in files for s in _SUFFIXES.values()):
+                continue  # A precompressed sibling; used below
+            assets[path] = self._load_asset(path, file_path, files)
+        self.assets = assets
+        logger.info("Cached %d frontend files (%d KiB with compressed variants)",
+                    len(assets), self.total_bytes // 1024)
+
+    def _load_asset(self, path: str, file_path: Path, files: dict[str, Path]) -> Asset:
+        body = file_path.read_bytes()
+        media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        immutable = path.startswith("_app/immutable/")
+        asset = Asset(
+            body=body,
+            media_type=media_type,
+            etag=f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"',
+            cache_control=IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL,
+        )
+        if len(body) < MIN_COMPRESS_BYTES or not _is_compressible(media_type):
+            return asset
+        for encoding, encode in _ENCODERS.items():
+            prebuilt = files.get(path + _SUFFIXES[encoding])
+            data = prebuilt.read_bytes() if prebuilt else encode(body)
+            if len(data) < len(body):
+                asset.encoded[encoding] = data
+        return asset
+
+    def get(self, path: str) -> Optional[Asset]:
+        return self.assets.get(path.lstrip("/"))
+
+    def lookup(self, path: str) -> Optional[Asset]:
+        """The file at `path`, or the SPA page for client-side routes (None for missing build files)."""
+        asset = self.get(path)
+        if asset is None and not path.lstrip("/").startswith("_app/"):
+            asset = self.assets.get(self.fallback)
+        return asset
+
+    def response(self, request: Request, asset: Asset) -> Response:
+        encoding = choose_encoding(asset, request.headers.get("accept-encoding", ""))
+        etag = asset.etag_for(encoding)
+        headers = {"ETag": etag, "Cache-Control": asset.cache_control}
+        if asset.encoded:
+            headers["Vary"] = "Accept-Encoding"
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+
+        body = asset.body
+        if encoding is not None:
+            body = asset.encoded[encoding]
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type=asset.media_type, headers=headers)
@@ -0,0 +1,25 @@
+import sys
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from .manager import TournamentManager
+
+
+def __getattr__(name: str):
+    # Tournaments load on first use, not with the app
+    if name == "Standings":
+        from .standings import Standings
+        return Standings
+    if name in ("Tournament", "TournamentStatus", "TournamentTableLoop"):
+        from . import tournament
+        return getattr(tournament, name)
+    if name in ("TournamentManager", "tournament_manager"):
+        from . import manager
+        return getattr(manager, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def loaded_tournament_manager() -> Optional["TournamentManager"]:
+    """The tournament manager if tournaments have been loaded, else None: none exist yet."""
+    manager = sys.modules.get(f"{__name__}.manager")
+    return manager.tournament_manager if manager is not None else None
@@ -0,0 +1,77 @@
+from typing import Optional
+
+from ..config import TOURNAMENT_MAX_ENTRANTS, TOURNAMENT_MIN_ENTRANTS
+from ..game.table_config import DEFAULT_TABLE, TableConfig
+from .tournament import Tournament, TournamentStatus
+
+
+class TournamentManager:
+    """Manages all tournaments in memory."""
+
+    def __init__(self):
+        self._tournaments: dict[str, Tournament] = {}
+
+    def create_tournament(
+        self, creator_nickname: str, config: TableConfig = DEFAULT_TABLE, seed: Optional[int] = None
+    ) -> Tournament:
+        """Create a tournament and register the creator."""
+        tournament = Tournament(creator_nickname, config, seed)
+        tournament.register(creator_nickname)
+        self._tournaments[tournament.id] = tournament
+        return tournament
+
+    def get_tournament(self, tournament_id: str) -> Optional[Tournament]:
+        return self._tournaments.get(tournament_id)
+
+    def register(self, tournament_id: str, nickname: str) -> tuple[Optional[Tournament], Optional[str]]:
+        """
+        Register a player.
+        Returns (tournament, error_message). If successful, error_message is None.
+        """
+        tournament = self.get_tournament(tournament_id)
+        if not tournament:
+            return None, "Tournament not found"
+
+        if tournament.status != TournamentStatus.REGISTERING:
+            return None, "Registration is closed"
+
+        if len(tournament.entrants) >= TOURNAMENT_MAX_ENTRANTS:
+            return None, f"Tournament is full (max {TOURNAMENT_MAX_ENTRANTS} players)"
+
+        if nickname in tournament.entrants:
+            return None, "A player with this nickname is already registered"
+
+        tournament.register(nickname)
+        return tournament, None
+
+    def check_start(self, tournament_id: str, nickname: str) -> tuple[Optional[Tournament], Optional[str]]:
+        """
+        Check a tournament can be started by this player (only the creator can).
+        Returns (tournament, error_message). If successful, error_message is None.
+        """
+        tournament = self.get_tournament(tournament_id)
+        if not tournament:
+            return None, "Tournament not found"
+
+        if tournament.creator != nickname:
+            return None, "Only the creator can start the tournament"
+
+        if tournament.status != TournamentStatus.REGISTERING:
+            return None, "Tournament has already started"
+
+        if len(tournament.entrants) < TOURNAMENT_MIN_ENTRANTS:
+            return None, f"Need at least {TOURNAMENT_MIN_ENTRANTS} players to start"
+
+        return tournament, None
+
+    def list_tournaments(self, status: Optional[TournamentStatus] = None) -> list[Tournament]:
+        return [t for t in self._tournaments.values() if status is None or t.status == status]
+
+    def shutdown(self):
+        for tournament in self._tournaments.values():
+            if tournament.status == TournamentStatus.RUNNING:
+                tournament.cancel()
+
+
+# Singleton instance
+tournament_manager = TournamentManager()
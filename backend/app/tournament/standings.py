@@ -0,0 +1,89 @@
+"""
+Tournament standings: every remaining player's stack, ordered by chips.
+
+A Fenwick (binary indexed) tree over chip counts holds how many players have
+each stack, so updating a stack, a player's rank and the k-th biggest stack
+are all O(log total_chips), and nothing is re-sorted when chips move.
+"""
+
+import heapq
+from typing import Optional
+
+
+class Standings:
+    """Chip counts of the players still in, ranked (1 = chip leader, ties share a rank)."""
+
+    def __init__(self, total_chips: int):
+        self.total_chips = total_chips
+        self._tree = [0] * (total_chips + 2)  # 1-based: index chips + 1
+        self._chips: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._chips)
+
+    def __contains__(self, nickname: str) -> bool:
+        return nickname in self._chips
+
+    def _add(self, chips: int, delta: int):
+        i = chips + 1
+        tree = self._tree
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def _count_at_most(self, chips: int) -> int:
+        """Players with `chips` or fewer."""
+        i = min(chips, self.total_chips) + 1
+        count = 0
+        tree = self._tree
+        while i > 0:
+            count += tree[i]
+            i -= i & -i
+        return count
+
+    def set(self, nickname: str, chips: int):
+        """Add a player or update their stack."""
+        if not 0 <= chips <= self.total_chips:
+            raise ValueError(f"{nickname} cannot hold {chips} chips (total {self.total_chips})")
+        old = self._chips.get(nickname)
+        if old == chips:
+            return
+        if old is not None:
+            self._add(old, -1)
+        self._add(chips, 1)
+        self._chips[nickname] = chips
+
+    def remove(self, nickname: str):
+        chips = self._chips.pop(nickname)
+        self._add(chips, -1)
+
+    def chips(self, nickname: str) -> Optional[int]:
+        return self._chips.get(nickname)
+
+    def rank(self, nickname: str) -> int:
+        """1 + the number of players with more chips."""
+        return len(self._chips) - self._count_at_most(self._chips[nickname]) + 1
+
+    def chips_at_rank(self, rank: int) -> int:
+        """The stack of the rank-th biggest player (1 = chip leader)."""
+        if not 1 <= rank <= len(self._chips):
+            raise IndexError(f"Rank {rank} out of range (1-{len(self._chips)})")
+        # Descend the tree for the smallest stack with at least `target` players at or below it
+        target = len(self._chips) - rank + 1
+        tree = self._tree
+        pos = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            nxt = pos + step
+            if nxt < len(tree) and tree[nxt] < target:
+                pos = nxt
+                target -= tree[nxt]
+            step >>= 1
+        return pos  # Index pos + 1 holds the stack, i.e. pos chips
+
+    def average(self) -> float:
+        return self.total_chips / len(self._chips) if self._chips else 0.0
+
+    def leaders(self, count: int = 10) -> list[tuple[str, int]]:
+        """The `count` biggest stacks, biggest first."""
+        return heapq.nlargest(count, self._chips.items(), key=lambda item: item[1])
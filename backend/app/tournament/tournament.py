@@ -0,0 +1,349 @@
+"""
+Multi-table tournaments.
+
+A Tournament runs one GameLoop per table as a single freezeout: the same
+blind clock for every table, one standings index for the whole field, and
+finishing places counted across tables. Tables are ordinary Games (so
+players connect to their table like to any game); TournamentTableLoop hooks
+the points between hands, where the tournament may move players or break
+the table up.
+
+Balancing happens when a table is between hands, the only time its players
+can move:
+- if the field fits on one table fewer and this is a smallest table, it is
+  broken and its players go to the smallest other tables;
+- otherwise, while it has 2+ players more than the smallest table, its next
+  big blind moves there.
+Tables are bucketed by player count, so finding the smallest table does not
+depend on how many tables there are.
+"""
+
+import asyncio
+from datetime import datetime
+from enum import Enum
+import logging
+import math
+import random
+from typing import Optional
+import uuid
+
+from ..config import TOURNAMENT_HAND_LIMIT
+from ..db import save_game_result
+from ..game import game_loop as game_loop_module
+from ..game.game_loop import BroadcastCallback, GameLoop, traced_step
+from ..game.manager import game_manager
+from ..game.models import Game, GameStatus
+from ..game.seating import next_occupied
+from ..game.table_config import DEFAULT_TABLE, TableConfig
+from .. import metrics
+from .standings import Standings
+
+logger = logging.getLogger(__name__)
+
+PLAYER_MOVES = metrics.counter(
+    "poker_tournament_player_moves_total", "Players moved between tournament tables"
+)
+TABLES_BROKEN = metrics.counter(
+    "poker_tournament_tables_broken_total", "Tournament tables broken up as the field shrinks"
+)
+
+
+class TournamentStatus(str, Enum):
+    REGISTERING = "registering"
+    RUNNING = "running"
+    FINISHED = "finished"
+
+
+class TableSizes:
+    """Tables bucketed by player count: the smallest table is found without scanning tables."""
+
+    def __init__(self, max_size: int):
+        self._buckets: list[dict[str, None]] = [{} for _ in range(max_size + 1)]
+        self._size: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._size)
+
+    def __getitem__(self, table_id: str) -> int:
+        return self._size[table_id]
+
+    def set(self, table_id: str, size: int):
+        old = self._size.get(table_id)
+        if old is not None:
+            del self._buckets[old][table_id]
+        self._buckets[size][table_id] = None
+        self._size[table_id] = size
+
+    def remove(self, table_id: str):
+        del self._buckets[self._size.pop(table_id)][table_id]
+
+    def smallest(self, exclude: Optional[str] = None) -> Optional[tuple[int, str]]:
+        """(size, table_id) of a smallest table, ignoring `exclude`."""
+        for size, bucket in enumerate(self._buckets):
+            for table_id in bucket:
+                if table_id != exclude:
+                    return size, table_id
+        return None
+
+
+class TournamentTableLoop(GameLoop):
+    """A GameLoop that asks its tournament before every hand and reports busts to it."""
+
+    in_tournament = True
+
+    def __init__(self, tournament: "Tournament", game: Game, broadcast: BroadcastCallback, seed: Optional[int] = None):
+        super().__init__(game, broadcast, seed)
+        self.tournament = tournament
+
+    async def start_hand(self):
+        # One blind clock for the whole field
+        self.started_at = self.tournament.started_at
+        if await self.tournament.before_hand(self):
+            await super().start_hand()
+
+    async def start_next_hand(self, extra_pause: float = 0.0):
+        if self.game.status == GameStatus.FINISHED:
+            return
+        await super().start_next_hand(extra_pause)
+
+    @traced_step("check_eliminations")
+    async def check_eliminations(self):
+        await self.tournament.after_hand(self)
+
+    async def end_game(self):
+        # Only reached if the tournament is over or this table was closed
+        self.cancel_turn_timer()
+
+
+class Tournament:
+    """One multi-table freezeout, from registration to final placements."""
+
+    def __init__(self, creator: str, config: TableConfig = DEFAULT_TABLE, seed: Optional[int] = None):
+        self.id = str(uuid.uuid4())
+        self.creator = creator
+        self.config = config
+        self.table_config = config.with_changes(hand_limit=TOURNAMENT_HAND_LIMIT)
+        self.seed = seed
+        self.status = TournamentStatus.REGISTERING
+        self.entrants: list[str] = []
+        self.created_at = datetime.utcnow()
+        self.started_at = 0.0  # Loop time when play began (the blind clock)
+
+        self.tables: dict[str, TournamentTableLoop] = {}
+        self.sizes = TableSizes(config.max_players)
+        self.table_of: dict[str, str] = {}  # nickname -> table game id
+        self.standings: Optional[Standings] = None
+        self.placements: list[dict] = []  # Finished players, best first once the tournament ends
+        self.finished = asyncio.Event()
+        self._changed = asyncio.Event()  # Set whenever players bust or move
+        self._next_table = 1
+
+    @property
+    def seats_per_table(self) -> int:
+        return self.config.max_players
+
+    def register(self, nickname: str):
+        self.entrants.append(nickname)
+
+    async def start(self, broadcast: BroadcastCallback):
+        """Seat the field at as few tables as possible, evenly, and deal the first hands."""
+        self.status = TournamentStatus.RUNNING
+        self.broadcast = broadcast
+        self.started_at = asyncio.get_running_loop().time()
+        self.standings = Standings(len(self.entrants) * self.config.starting_chips)
+
+        rng = random.Random(self.seed) if self.seed is not None else random.SystemRandom()
+        players = list(self.entrants)
+        rng.shuffle(players)
+        table_count = math.ceil(len(players) / self.seats_per_table)
+        loops = [self._open_table() for _ in range(table_count)]
+        for i, nickname in enumerate(players):
+            self._seat(nickname, self.config.starting_chips, loops[i % table_count])
+
+        for loop in loops:
+            await loop.start_game()
+
+    def _open_table(self) -> TournamentTableLoop:
+        game = Game(creator=self.creator, config=self.table_config)
+        game.status = GameStatus.ACTIVE
+        seed = self.seed * 1000 + self._next_table if self.seed is not None else None
+        self._next_table += 1
+        loop = TournamentTableLoop(self, game, self.broadcast, seed)
+        game_manager.add_game(game)
+        game_loop_module.game_loops[game.id] = loop
+        self.tables[game.id] = loop
+        self.sizes.set(game.id, 0)
+        return loop
+
+    def _seat(self, nickname: str, chips: int, loop: TournamentTableLoop) -> int:
+        seat = loop.game.add_player(nickname, chips).seat
+        self.sizes.set(loop.game.id, self.sizes[loop.game.id] + 1)
+        self.table_of[nickname] = loop.game.id
+        self.standings.set(nickname, chips)
+        return seat
+
+    def _notify(self):
+        """Wake tables waiting for players."""
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def before_hand(self, loop: TournamentTableLoop) -> bool:
+        """Balance the field around this table. Returns False if it should stop dealing."""
+        while True:
+            if self.status != TournamentStatus.RUNNING or loop.game.id not in self.tables:
+                return False
+
+            moves = self._balance(loop)
+            for nickname, destination, seat in moves:
+                await loop.send_to_player(nickname, {
+                    "type": "table_changed",
+                    "payload": {"tournament_id": self.id, "game_id": destination, "seat": seat},
+                })
+            if loop.game.id not in self.tables:
+                return False
+
+            if self.sizes[loop.game.id] >= 2:
+                return True
+            # Too few players to deal; wait for players to be moved here or for a table to break
+            await self._changed.wait()
+
+    def _balance(self, loop: TournamentTableLoop) -> list[tuple[str, str, int]]:
+        """Decide and apply this table's moves. Returns (nickname, new game id, seat) for each."""
+        table_id = loop.game.id
+        size = self.sizes[table_id]
+        remaining = len(self.standings)
+        moves = []
+
+        smallest = self.sizes.smallest()
+        can_break = len(self.tables) > 1 and remaining <= (len(self.tables) - 1) * self.seats_per_table
+        if can_break and size == smallest[0]:
+            for player in list(loop.game.get_active_players()):
+                _, destination = self.sizes.smallest(exclude=table_id)
+                moves.append(self._move(player.nickname, loop, self.tables[destination]))
+            self._close_table(loop)
+            TABLES_BROKEN.inc()
+        else:
+            while True:
+                other = self.sizes.smallest(exclude=table_id)
+                if other is None or self.sizes[table_id] - other[0] <= 1:
+                    break
+                moves.append(self._move(self._next_big_blind(loop.game), loop, self.tables[other[1]]))
+
+        if moves:
+            self._notify()
+        return moves
+
+    def _next_big_blind(self, game: Game) -> str:
+        """The player due to post the big blind next hand (moving them costs nobody a blind)."""
+        seats = [p if p is not None and not p.is_eliminated else None for p in game.seats]
+        button = next_occupied(seats, game.dealer_position)
+        big_blind = next_occupied(seats, next_occupied(seats, button))
+        return seats[big_blind].nickname
+
+    def _move(self, nickname: str, source: TournamentTableLoop, destination: TournamentTableLoop) -> tuple[str, str, int]:
+        player = source.game.remove_player(nickname)
+        self.sizes.set(source.game.id, self.sizes[source.game.id] - 1)
+        seat = self._seat(nickname, player.chips, destination)
+        PLAYER_MOVES.inc()
+        return nickname, destination.game.id, seat
+
+    def _close_table(self, loop: TournamentTableLoop):
+        game_id = loop.game.id
+        loop.game.status = GameStatus.FINISHED
+        # Stop its turn timer and next hand, unless this is running inside one of them
+        current = asyncio.current_task()
+        for task in (loop.turn_timer_task, loop.next_hand_task):
+            if task and task is not current and not task.done():
+                task.cancel()
+        del self.tables[game_id]
+        self.sizes.remove(game_id)
+        game_loop_module.game_loops.pop(game_id, None)
+        loop.log.close()
+
+    async def after_hand(self, loop: TournamentTableLoop):
+        """Update the standings from a finished hand and place anyone who busted."""
+        game = loop.game
+        hand = game.active_hand
+        busted = [p for p in game.players if p.chips <= 0]
+        # Players who started the hand with more chips finish higher
+        busted.sort(key=lambda p: hand.player_hands[p.nickname].total_bet if hand and p.nickname in hand.player_hands else 0)
+
+        for player in game.players:
+            if player.chips > 0:
+                self.standings.set(player.nickname, player.chips)
+
+        for player in busted:
+            position = len(self.standings)
+            player.is_eliminated = True
+            player.elimination_position = position
+            self.standings.remove(player.nickname)
+            game.remove_player(player.nickname)
+            self.sizes.set(game.id, self.sizes[game.id] - 1)
+            del self.table_of[player.nickname]
+            self.placements.append(self._placement(player.nickname, position, 0))
+
+            await loop.broadcast(game.id, {
+                "type": "player_eliminated",
+                "payload": {"nickname": player.nickname, "position": position, "tournament_id": self.id},
+            }, None)
+
+        if busted:
+            self._notify()
+        if len(self.standings) <= 1 and self.status == TournamentStatus.RUNNING:
+            await self.finish()
+
+    def _placement(self, nickname: str, position: int, chips: int) -> dict:
+        return {
+            "nickname": nickname,
+            "position": position,
+            "chips": chips,
+            "points": self.config.points_for(position),
+        }
+
+    async def finish(self):
+        """Place the winner, record the result and close the remaining tables."""
+        self.status = TournamentStatus.FINISHED
+        for nickname, chips in self.standings.leaders(1):
+            self.placements.append(self._placement(nickname, 1, chips))
+        self.placements.sort(key=lambda p: p["position"])
+
+        await save_game_result(self.placements)
+
+        for loop in list(self.tables.values()):
+            await loop.broadcast(loop.game.id, {
+                "type": "tournament_ended",
+                "payload": {"tournament_id": self.id, "placements": self.placements},
+            }, None)
+            self._close_table(loop)
+        self._notify()
+        self.finished.set()
+
+    def cancel(self):
+        """Stop every table (e.g. at shutdown)."""
+        for loop in list(self.tables.values()):
+            self._close_table(loop)
+        self.status = TournamentStatus.FINISHED
+        self._notify()
+
+    def to_dict(self, leaders: int = 10) -> dict:
+        result = {
+            "id": self.id,
+            "creator": self.creator,
+            "status": self.status.value,
+            "entrants": list(self.entrants),
+            "entrant_count": len(self.entrants),
+            "created_at": self.created_at.isoformat(),
+            "config": self.config.to_dict(),
+        }
+        if self.standings is not None:
+            result["players_remaining"] = len(self.standings)
+            result["average_stack"] = round(self.standings.average())
+            result["tables"] = [
+                {"game_id": game_id, "players": self.sizes[game_id]} for game_id in self.tables
+            ]
+            result["leaders"] = [
+                {"nickname": nickname, "chips": chips, "rank": self.standings.rank(nickname)}
+                for nickname, chips in self.standings.leaders(leaders)
+            ]
+            result["placements"] = self.placements
+        return result
@@ -0,0 +1,134 @@
+"""
+Per-hand span tracing.
+
+A GameLoop decides once per hand whether to trace it (TRACE_SAMPLE_RATE), so a
+sampled hand is recorded completely and an unsampled one costs a flag check
+per lifecycle step. Spans go into a fixed-size ring buffer and can be exported
+as JSON lines or as a Chrome trace (chrome://tracing, Perfetto), one track per
+game, where nesting shows engine time vs. message encoding vs. socket sends.
+"""
+
+from collections import deque
+from contextvars import ContextVar
+import json
+import random
+import time
+from typing import Iterator, Optional
+
+from .config import TRACE_BUFFER_SIZE, TRACE_SAMPLE_RATE
+
+
+class Span:
+    """One timed step. Use as a context manager; recorded on exit."""
+
+    __slots__ = ("tracer", "name", "game_id", "hand_number", "attrs", "start_ns", "duration_ns", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, game_id: str, hand_number: int, attrs: dict):
+        self.tracer = tracer
+        self.name = name
+        self.game_id = game_id
+        self.hand_number = hand_number
+        self.attrs = attrs
+        self.start_ns = 0
+        self.duration_ns = 0
+
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration_ns = time.perf_counter_ns() - self.start_ns
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.tracer.spans.append(self)
+
+    def to_dict(self, epoch_offset_ns: int) -> dict:
+        return {
+            "name": self.name,
+            "game_id": self.game_id,
+            "hand_number": self.hand_number,
+            "start_us": (self.start_ns + epoch_offset_ns) // 1000,
+            "duration_us": self.duration_ns / 1000,
+            **self.attrs,
+        }
+
+
+class _NoSpan:
+    """Shared stand-in when a step is not traced: no allocation, no timing."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc, tb):
+        return None
+
+
+NO_SPAN = _NoSpan()
+
+# Innermost open span in this task, so lower layers (e.g. broadcasts) can add children
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    def __init__(self, sample_rate: float = 0.0, capacity: int = 10000):
+        self.sample_rate = sample_rate
+        self.spans: deque[Span] = deque(maxlen=capacity)
+        # perf_counter_ns() + offset = Unix time in ns
+        self._epoch_offset_ns = time.time_ns() - time.perf_counter_ns()
+
+    def sample(self) -> bool:
+        """Decide whether to trace a hand (uses the global RNG, never a game's)."""
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def span(self, name: str, game_id: str, hand_number: int, **attrs) -> Span:
+        return Span(self, name, game_id, hand_number, attrs)
+
+    def child(self, name: str, **attrs):
+        """Span under the current one, or NO_SPAN outside a traced hand."""
+        parent = _current_span.get()
+        if parent is None:
+            return NO_SPAN
+        return Span(self, name, parent.game_id, parent.hand_number, attrs)
+
+    @staticmethod
+    def detach():
+        """Forget the current span in this task (e.g. when a new, unsampled hand starts)."""
+        _current_span.set(None)
+
+    def clear(self):
+        self.spans.clear()
+
+    def export_jsonl(self) -> Iterator[str]:
+        """One JSON object per span, oldest first."""
+        for span in list(self.spans):
+            yield json.dumps(span.to_dict(self._epoch_offset_ns)) + "\n"
+
+    def export_chrome(self) -> dict:
+        """Chrome trace event format: one thread (track) per game."""
+        tids: dict[str, int] = {}
+        events = []
+        for span in list(self.spans):
+            tid = tids.get(span.game_id)
+            if tid is None:
+                tid = tids[span.game_id] = len(tids) + 1
+                events.append({
+                    "name": "thread_name", "ph": "M", "pid": 1, "tid": tid,
+                    "args": {"name": f"game {span.game_id}"},
+                })
+            events.append({
+                "name": span.name,
+                "ph": "X",
+                "pid": 1,
+                "tid": tid,
+                "ts": (span.start_ns + self._epoch_offset_ns) / 1000,
+                "dur": span.duration_ns / 1000,
+                "args": {"hand_number": span.hand_number, **span.attrs},
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+tracer = Tracer(TRACE_SAMPLE_RATE, TRACE_BUFFER_SIZE)
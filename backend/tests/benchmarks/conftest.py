@@ -0,0 +1,15 @@
+"""Fixtures for the engine benchmarks."""
+
+import pytest
+
+from .helpers import random_hands
+
+
+@pytest.fixture
+def five_card_hands():
+    return random_hands(200, 5)
+
+
+@pytest.fixture
+def seven_card_hands():
+    return random_hands(50, 7)
@@ -0,0 +1,41 @@
+"""Helpers that build benchmark inputs."""
+
+import asyncio
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.config import STARTING_CHIPS
+from app.game.game_loop import GameLoop
+from app.game.models import Game
+from app.game.poker import Deck, new_rng
+
+
+async def _no_broadcast(game_id, message, viewer_nickname=None):
+    pass
+
+
+def dealt_game(players: int, seed: int = 1) -> Game:
+    """A started game with the first hand dealt and blinds posted."""
+    game = Game(creator="p0")
+    for i in range(players):
+        game.add_player(f"p{i}", STARTING_CHIPS)
+    loop = GameLoop(game, _no_broadcast, seed=seed)
+
+    async def start():
+        await loop.start_game()
+        loop.cancel_turn_timer()
+
+    asyncio.run(start())
+    return game
+
+
+def random_hands(count: int, size: int, seed: int = 1) -> list[list]:
+    """Reproducible random hands of `size` cards each."""
+    rng = new_rng(seed)
+    hands = []
+    for _ in range(count):
+        deck = Deck(rng)
+        deck.shuffle()
+        hands.append(deck.deal(size))
+    return hands
@@ -0,0 +1,72 @@
+"""Benchmarks for betting actions and state serialization."""
+
+import json
+
+import pytest
+
+from app.game import actions
+from app.game.models import BettingRound, Game
+from .helpers import dealt_game
+
+
+def play_preflop(game: Game) -> int:
+    """Everyone calls (the big blind checks) until the flop. Returns the action count."""
+    count = 0
+    while game.active_hand.betting_round == BettingRound.PREFLOP:
+        nickname = actions.get_current_player_nickname(game)
+        valid = actions.get_valid_actions(game, nickname)
+        if "check" in valid:
+            actions.check(game, nickname)
+        else:
+            actions.call(game, nickname)
+        count += 1
+    return count
+
+
+@pytest.mark.parametrize("players", [2, 4])
+def test_betting_round(benchmark, players):
+    """A full preflop betting round through actions.*."""
+    count = benchmark.pedantic(
+        play_preflop,
+        setup=lambda: ((dealt_game(players),), {}),
+        rounds=200,
+    )
+    assert count == players
+
+
+@pytest.mark.parametrize("players", [2, 4])
+def test_game_to_dict_per_viewer(benchmark, players):
+    """Serialize the game once for every player at the table."""
+    game = dealt_game(players)
+    viewers = [p.nickname for p in game.players]
+
+    def run():
+        for viewer in viewers:
+            game.to_dict(viewer)
+    benchmark(run)
+
+
+def test_json_dumps_broadcasts(benchmark):
+    """Encode the typical messages sent while a hand is played."""
+    game = dealt_game(4)
+    hand = game.active_hand
+    nickname = actions.get_current_player_nickname(game)
+    messages = [
+        {"type": "game_joined", "payload": {"game": game.to_dict()}},
+        {"type": "turn", "payload": {
+            "current_player": nickname,
+            "valid_actions": actions.get_valid_actions(game, nickname),
+            "time_remaining": 30,
+            "current_bet": hand.current_bet,
+            "pot": hand.get_total_pot(),
+        }},
+        {"type": "player_action", "payload": {
+            "nickname": nickname, "action": "call", "amount": 20, "pot": 50, "player_chips": 980,
+        }},
+        {"type": "lobby_update", "payload": {"games": [dealt_game(2).to_dict() for _ in range(10)]}},
+    ]
+
+    def run():
+        for message in messages:
+            json.dumps(message)
+    benchmark(run)
@@ -0,0 +1,76 @@
+"""Benchmarks for hand evaluation and dealing."""
+
+import pytest
+
+from app.game.poker import (
+    Deck, compare_hands, evaluate_five_cards, evaluate_hand, hand_value, new_rng, preflop_equity,
+)
+from .helpers import random_hands
+
+
+def test_evaluate_five_cards(benchmark, five_card_hands):
+    """200 five-card evaluations."""
+    def run():
+        for cards in five_card_hands:
+            evaluate_five_cards(cards)
+    benchmark(run)
+
+
+def test_evaluate_hand_seven_cards(benchmark, seven_card_hands):
+    """50 best-of-seven evaluations."""
+    def run():
+        for cards in seven_card_hands:
+            evaluate_hand(cards)
+    benchmark(run)
+
+
+def test_hand_value_seven_cards(benchmark, seven_card_hands):
+    """50 best-of-seven evaluations with the fast evaluator."""
+    def run():
+        for cards in seven_card_hands:
+            hand_value(cards)
+    benchmark(run)
+
+
+def test_preflop_equity_lookup(benchmark, seven_card_hands):
+    """50 preflop table lookups."""
+    holes = [cards[:2] for cards in seven_card_hands]
+
+    def run():
+        for cards in holes:
+            preflop_equity(cards, 3)
+    benchmark(run)
+
+
+@pytest.mark.parametrize("players", range(2, 10))
+def test_compare_hands(benchmark, players):
+    """A showdown between 2-9 players sharing one board."""
+    deck = Deck(new_rng(players))
+    deck.shuffle()
+    board = deck.deal(5)
+    hands = [deck.deal(2) + board for _ in range(players)]
+    winners = benchmark(compare_hands, hands)
+    assert winners
+
+
+def test_deck_shuffle_and_deal(benchmark):
+    """Shuffle and deal a 4-player hand: hole cards, burns and the board."""
+    rng = new_rng(1)
+
+    def run():
+        deck = Deck(rng)
+        deck.shuffle()
+        for _ in range(4):
+            deck.deal(2)
+        deck.deal_one()
+        deck.deal(3)
+        deck.deal_one()
+        deck.deal(1)
+        deck.deal_one()
+        deck.deal(1)
+    benchmark(run)
+
+
+def test_random_hands_helper_is_reproducible():
+    """The benchmark inputs must be the same on every run."""
+    assert random_hands(3, 7, seed=5) == random_hands(3, 7, seed=5)
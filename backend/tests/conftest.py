@@ -0,0 +1,35 @@
+"""Shared pytest configuration."""
+
+import os
+
+import pytest
+
+# Comparing against a stored baseline only reports by default: timings vary too much between runs
+# and machines to fail on. Set this (e.g. "median:25%" on a pinned CI runner) to fail on regressions.
+BENCHMARK_REGRESSION_THRESHOLD = os.environ.get("BENCHMARK_REGRESSION_THRESHOLD", "")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """Apply BENCHMARK_REGRESSION_THRESHOLD, if set, when comparing against a stored baseline."""
+    if not hasattr(config.option, "benchmark_compare") or not BENCHMARK_REGRESSION_THRESHOLD:
+        return
+    if config.option.benchmark_compare and not config.option.benchmark_compare_fail:
+        from pytest_benchmark.utils import parse_compare_fail
+        config.option.benchmark_compare_fail = [parse_compare_fail(BENCHMARK_REGRESSION_THRESHOLD)]
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--exhaustive", action="store_true", default=False,
+        help="run slow exhaustive checks (e.g. all 2,598,960 five-card hands)",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--exhaustive"):
+        return
+    skip = pytest.mark.skip(reason="needs --exhaustive")
+    for item in items:
+        if "exhaustive" in item.keywords:
+            item.add_marker(skip)
@@ -0,0 +1,132 @@
+"""Tests for server-side bot players."""
+
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.bots import BotManager, STRATEGIES
+from app.bots import manager as bot_module
+from app.bots.strategies import equity_policy, table_policy
+from app.game import game_loop as game_loop_module
+from app.game.game_loop import create_game_loop, remove_game_loop
+from app.game.manager import game_manager
+from app.game.models import GameStatus
+from app.game.table_config import DEFAULT_TABLE
+from app.sim.policies import TurnView
+from test_poker import make_hand
+
+
+def make_view(hole: str, board: str = "", to_call: int = 0, pot: int = 30, opponents: int = 1) -> TurnView:
+    valid = {"fold": True, "all_in": 1000, "raise": {"min": to_call + 20, "max": 1000}}
+    valid["call" if to_call else "check"] = to_call or True
+    return TurnView(
+        nickname="bot-1",
+        valid_actions=valid,
+        hole_cards=make_hand(hole),
+        community_cards=make_hand(board) if board else [],
+        pot=pot,
+        current_bet=20 + to_call,
+        my_bet=20,
+        chips=1000,
+        opponents=opponents,
+    )
+
+
+def test_strategies_value_bet_and_fold():
+    """Test that strong hands raise and hopeless hands fold to a big bet."""
+    rng = random.Random(1)
+    for policy in (equity_policy, table_policy):
+        assert policy(make_view("As Ad"), rng).action == "raise"
+        assert policy(make_view("7c 2d", "Ks Qh 9d", to_call=500, pot=100), rng).action == "fold"
+        assert policy(make_view("7c 2d", "Ks Qh 9d"), rng).action == "check"
+
+
+def test_decisions_draw_fresh_randomness_in_a_process_pool(monkeypatch):
+    """Test that a bot's decisions in worker processes don't all repeat the same draws."""
+    monkeypatch.setattr(bot_module, "BOT_EXECUTOR", "process")
+    monkeypatch.setattr(bot_module, "BOT_EXECUTOR_WORKERS", 1)
+    monkeypatch.setattr(bot_module, "BOT_DECISION_BUDGET_SECONDS", 30)  # Room to spawn the worker
+    manager = BotManager()
+    bot = bot_module.Bot("g", "bot-1", "random")
+    bot.rng.seed(1)
+
+    async def run():
+        try:
+            return [await manager.decide(bot, make_view("7c 2d", "Ks Qh 9d")) for _ in range(8)]
+        finally:
+            manager.shutdown()
+
+    decisions = asyncio.run(run())
+    assert len({(d.action, tuple(sorted(d.params.items()))) for d in decisions}) > 1
+
+
+def test_slow_strategy_falls_back_to_check(monkeypatch):
+    """Test that a decision over the time budget checks (or folds) instead of stalling."""
+    def slow(view, rng):
+        time.sleep(0.5)
+        return equity_policy(view, rng)
+
+    monkeypatch.setitem(STRATEGIES, "slow", slow)
+    monkeypatch.setattr(bot_module, "BOT_DECISION_BUDGET_SECONDS", 0.05)
+    manager = BotManager()
+    bot = bot_module.Bot("g", "bot-1", "slow")
+
+    async def run():
+        try:
+            return await manager.decide(bot, make_view("As Ad"))
+        finally:
+            manager.shutdown()
+
+    assert asyncio.run(run()).action == "check"
+
+
+def test_bots_play_a_game_through_the_game_loop(monkeypatch):
+    """Test that bots seated via join_game play every hand to the end of the game."""
+    monkeypatch.setattr(bot_module, "BOT_THINK_SECONDS", 0)
+    monkeypatch.setattr(game_loop_module, "NEXT_HAND_DELAY_SECONDS", 0)
+    monkeypatch.setattr(game_loop_module, "save_game_result", _no_save)
+
+    manager = BotManager()
+    monkeypatch.setattr(bot_module, "bot_manager", manager)
+    game = game_manager.create_game("host", DEFAULT_TABLE.with_changes(hand_limit=5))
+    for strategy in ("equity", "table", "passive"):
+        bot, error = manager.add_bot(game.id, strategy)
+        assert error is None
+    assert [p.nickname for p in game.players] == ["host", "bot-1", "bot-2", "bot-3"]
+
+    async def run():
+        done = asyncio.Event()
+        loop = None
+
+        async def broadcast(game_id, message, viewer_nickname=None):
+            await manager.dispatch(game_id, message, viewer_nickname)
+            if message["type"] == "turn" and message["payload"]["current_player"] == "host":
+                asyncio.get_running_loop().call_soon(
+                    lambda: asyncio.ensure_future(loop.handle_action("host", "fold", {}))
+                )
+            elif message["type"] == "game_ended":
+                done.set()
+
+        game_manager.start_game(game.id, "host")
+        loop = create_game_loop(game, broadcast)
+        await loop.start_game()
+        await asyncio.wait_for(done.wait(), 30)
+        remove_game_loop(game.id)
+        manager.shutdown()
+
+    try:
+        asyncio.run(run())
+    finally:
+        game_manager.remove_game(game.id)
+
+    assert game.status == GameStatus.FINISHED
+    assert game.current_hand_num == 5
+    assert sum(p.chips for p in game.players) == game.config.starting_chips * 4
+    assert manager.get_bots(game.id) == []
+
+
+async def _no_save(placements):
+    return None
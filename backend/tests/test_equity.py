@@ -0,0 +1,81 @@
+"""Tests for suit canonicalization and the equity cache."""
+
+import sys
+from itertools import permutations
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from app import metrics
+from app.game.equity import canonical_cards, canonicalize, clear_cache, cache_info, equity, runout_equity
+from app.game.poker import Card, Suit, preflop_equity
+from test_poker import make_hand
+
+
+def relabel(cards: list[Card], perm: tuple) -> list[Card]:
+    return [Card(c.rank, Suit(perm[c.suit])) for c in cards]
+
+
+def test_canonical_key_is_the_same_for_all_suit_permutations():
+    """Test that all 24 relabellings of a situation share one key."""
+    hole = make_hand("Ah Kh")
+    board = make_hand("Qh 7d 2c 2h")
+    keys = {canonicalize(relabel(hole, p), relabel(board, p)) for p in permutations(range(4))}
+    assert len(keys) == 1
+
+
+def test_canonical_key_separates_different_situations():
+    """Test that suit structure that matters is kept."""
+    board = make_hand("Qh 7d 2c")
+    assert canonicalize(make_hand("Ah Kh"), board) != canonicalize(make_hand("As Ks"), board)
+    assert canonicalize(make_hand("Ah Kh"), board) != canonicalize(make_hand("Ah Kd"), board)
+    # Hole cards and board are different sets even with the same cards overall
+    assert canonicalize(make_hand("Ah Kh"), make_hand("Qh 7d 2c")) != \
+        canonicalize(make_hand("Ah Qh"), make_hand("Kh 7d 2c"))
+
+
+def test_canonical_cards_round_trip():
+    """Test that the representative situation has the same key."""
+    hole, board = make_hand("9s 9c"), make_hand("Ks 9d 4s 2s")
+    key = canonicalize(hole, board)
+    rep_hole, rep_board = canonical_cards(key)
+    assert len(rep_hole) == 2 and len(rep_board) == 4
+    assert canonicalize(rep_hole, rep_board) == key
+
+
+def test_equity_is_cached_across_suit_permutations():
+    """Test that an isomorphic query hits the cache and returns the same value."""
+    clear_cache()
+    first = equity(make_hand("Ah Kh"), make_hand("Qh 7h 2c"))
+    assert cache_info().misses == 1
+    second = equity(make_hand("As Ks"), make_hand("Qs 7s 2d"))
+    assert second == first
+    assert cache_info().hits == 1
+    assert 0.6 < first < 0.9  # Overcards plus the nut flush draw
+
+    text = metrics.registry.render()
+    assert "# TYPE poker_equity_cache_hits_total counter" in text
+    assert "poker_equity_cache_hits_total 1" in text and "poker_equity_cache_misses_total 1" in text
+
+
+def test_equity_sanity():
+    """Test river and preflop cases against known values."""
+    # The nuts on the river never lose
+    assert equity(make_hand("Ah Kh"), make_hand("Qh Jh 10h 2c 3d"), opponents=2) == 1.0
+    # Preflop comes from the table
+    assert equity(make_hand("Ac Ad"), [], opponents=3) == preflop_equity(make_hand("Ac Ad"), 3)
+
+
+def test_runout_equity_between_known_hands():
+    """Test exact turn and river equity, and that sampled preflop numbers are reproducible."""
+    aces, kings = make_hand("As Ah"), make_hand("Ks Kh")
+    turn = make_hand("2c 7d 9s Jc")
+    # Kings need one of the two kings left among 44 cards
+    assert runout_equity([aces, kings], [turn, turn + make_hand("Kd")], trials=100) == [
+        [42 / 44, 2 / 44], [0.0, 1.0]
+    ]
+
+    preflop = runout_equity([aces, kings], [[]], trials=500)
+    assert preflop == runout_equity([aces, kings], [[]], trials=500)
+    assert 0.7 < preflop[0][0] < 0.9 and sum(preflop[0]) == pytest.approx(1.0)
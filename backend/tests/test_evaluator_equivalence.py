@@ -0,0 +1,52 @@
+"""Tests for the evaluator equivalence harness (tools/verify_evaluator.py)."""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from app.game.poker import HandRank, evaluate_hand
+from tools.verify_evaluator import verify
+
+
+def ignores_kickers(cards):
+    """A broken evaluator: only the hand class and its top rank."""
+    result = evaluate_hand(cards)
+    return (result.rank, result.values[0])
+
+
+def straight_beats_flush(cards):
+    """A broken evaluator: straights and flushes swapped."""
+    result = evaluate_hand(cards)
+    swap = {HandRank.STRAIGHT: HandRank.FLUSH, HandRank.FLUSH: HandRank.STRAIGHT}
+    return (swap.get(result.rank, result.rank), result.values)
+
+
+def test_reference_matches_itself_on_samples():
+    """Test that the harness accepts the reference evaluator."""
+    report = verify("reference", "five-sampled", samples=20_000, workers=1)
+    assert report.ok, report.errors
+    assert report.hands == 20_000
+    assert report.candidate_evals_per_sec > 0
+
+
+def test_detects_evaluator_that_ignores_kickers():
+    """Test that ties the reference would break are reported."""
+    report = verify(f"{__name__}:ignores_kickers", "five-sampled", samples=20_000, workers=1)
+    assert not report.ok
+    assert any("Order mismatch" in e for e in report.errors)
+
+
+def test_detects_misordered_hand_classes():
+    """Test that a wrong class order is reported."""
+    report = verify(f"{__name__}:straight_beats_flush", "seven", samples=3_000, workers=1)
+    assert not report.ok
+
+
+@pytest.mark.exhaustive
+def test_reference_all_five_card_hands():
+    """Test every five-card hand: class counts and 7,462 distinct values."""
+    report = verify("reference", "five", progress=True)
+    assert report.ok, report.errors
+    assert report.hands == 2_598_960
@@ -0,0 +1,131 @@
+"""Tests for the event log and replaying games from it."""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import json
+import time
+
+import pytest
+
+from app.game.actions import ActionError
+from app.game.events import GameLog, apply_event, load_log, replay
+from app.game.game_loop import GameLoop
+from app.game.models import Game
+from app.game.poker import new_rng
+from app.game.table_config import TABLE_PRESETS
+from app.sim import POLICIES, TableSimulator, run_virtual
+
+
+class RecordingLog(GameLog):
+    """A GameLog that also keeps the live state after every event."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.states = []
+
+    def record(self, game, event):
+        result = super().record(game, event)
+        self.states.append(state(game))
+        return result
+
+
+def state(game):
+    """Everything a replay must reproduce, hole cards and board included."""
+    hand = game.active_hand
+    return (
+        game.to_dict(),
+        {p.nickname: (p.chips, p.is_eliminated, p.elimination_position) for p in game.players},
+        hand and {n: ph.hole_cards for n, ph in hand.player_hands.items()},
+    )
+
+
+def simulate(log_dir="", snapshot_every=3, seed=5):
+    """Play a 25-hand game with a mix of bots (folds, all-ins and timeouts)."""
+    config = TABLE_PRESETS["turbo"].with_changes(hand_limit=25)
+    policies = [POLICIES[name] for name in ("passive", "check_fold", "random", "fuzz")]
+    sim = TableSimulator(table_id=0, policies=policies, seed=seed, config=config)
+    sim.loop.log = RecordingLog(sim.game.id, directory=log_dir, snapshot_every=snapshot_every)
+    result = run_virtual(sim.run())
+    sim.loop.log.close(wait=True)
+    assert result.finished and not result.error
+    return sim.game, sim.loop.log
+
+
+def test_replay_rebuilds_the_finished_game():
+    """Test that replaying a whole log gives the game the live loop ended with."""
+    game, log = simulate()
+    assert {"runout", "out"} <= {e["t"] for e in log.events}
+    assert [e["t"] for e in log.events][:3] == ["start", "deal", "blinds"]
+    assert log.events[-1]["t"] == "end"
+    assert state(replay(log.events)) == state(game)
+    assert state(log.replay()) == state(game)
+
+
+def test_replay_matches_every_intermediate_state():
+    """Test that replaying up to any event, with or without snapshots, matches the live state then."""
+    game, log = simulate(seed=2)
+    assert len(log.snapshots) >= 3
+    for upto in range(1, len(log.events) + 1):
+        assert state(log.replay(upto)) == log.states[upto - 1], log.events[upto - 1]
+    # Without snapshots, from the first event
+    for upto in range(1, len(log.events) + 1, 17):
+        assert state(replay(log.events, upto=upto)) == log.states[upto - 1]
+
+
+def test_log_file_round_trip(tmp_path):
+    """Test that a log written to GAME_LOG_DIR reads back into the same events and replay."""
+    game, log = simulate(log_dir=str(tmp_path))
+    events, snapshots = load_log(str(tmp_path / f"{game.id}.jsonl"))
+    assert events == json.loads(json.dumps(log.events))
+    assert [index for index, _ in snapshots] == [index for index, _ in log.snapshots]
+    assert state(replay(events, snapshots)) == state(game)
+
+
+def test_load_log_ignores_a_torn_last_line(tmp_path):
+    """Test that a line cut short by a crash is dropped, not a parse error."""
+    game, log = simulate(log_dir=str(tmp_path))
+    path = tmp_path / f"{game.id}.jsonl"
+    text = path.read_text()
+    path.write_text(text[:-3])
+    events, _ = load_log(str(path))
+    assert events == json.loads(json.dumps(log.events[:-1]))
+
+
+def test_log_holds_only_dealt_cards():
+    """Test that a hand's events name only the cards dealt in it, and live decks use the CSPRNG."""
+    _, log = simulate(seed=2)
+    cards = []
+    for event in log.events:
+        if event["t"] == "deal":
+            cards = [c for hole in event["hole"].values() for c in hole]
+        elif event["t"] in ("street", "runout"):
+            cards += event["cards"] if event["t"] == "street" else [c for s in event["streets"] for c in s]
+        elif event["t"] == "clear":
+            assert len(set(cards)) == len(cards) <= 2 * 6 + 5
+        assert "seed" not in event
+
+    game = Game(creator="host")
+    assert GameLoop(game, broadcast=None).deck.rng is new_rng()
+
+
+def test_invalid_action_event_leaves_game_unchanged():
+    """Test that an event the rules reject raises and changes nothing."""
+    game, log = simulate()
+    upto = next(i for i, e in enumerate(log.events) if e["t"] == "blinds") + 1
+    replayed = log.replay(upto)
+    before = state(replayed)
+    nobody_to_act = next(n for n in replayed.active_hand.player_hands if n != log.events[upto]["p"])
+    with pytest.raises(ActionError):
+        apply_event(replayed, {"t": "act", "p": nobody_to_act, "a": "check"})
+    assert state(replayed) == before
+
+
+def test_replay_from_snapshot_is_fast():
+    """Test that rebuilding a late state starts from a snapshot, not the first event."""
+    _, log = simulate()
+    start = time.perf_counter()
+    for _ in range(20):
+        log.replay()
+    assert (time.perf_counter() - start) / 20 < 0.05
@@ -0,0 +1,151 @@
+"""Tests for heartbeats, the idle connection reaper and player presence."""
+
+import asyncio
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.api.websocket import ConnectionManager
+from app.game import game_manager
+from app.game.game_loop import create_game_loop, remove_game_loop
+from app.game.presence import Presence, presence_board
+from app.sim import run_virtual
+
+
+class FakeSocket:
+    """A client socket; `answers` ones reply to pings the way the web client does."""
+
+    def __init__(self, manager: ConnectionManager, answers: bool = True):
+        self.manager = manager
+        self.answers = answers
+        self.pings = 0
+        self.closed_with = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        if '"ping"' in text:
+            self.pings += 1
+            if self.answers:
+                self.manager.touch(self)
+
+    async def close(self, code: int = 1000, reason: str = ""):
+        self.closed_with = code
+
+
+def test_reaper_closes_silent_sockets():
+    """Test that answering sockets stay and silent ones are closed after the timeout."""
+    manager = ConnectionManager()
+    live, dead = FakeSocket(manager), FakeSocket(manager, answers=False)
+
+    async def run():
+        await manager.connect_to_lobby(live)
+        await manager.connect_to_lobby(dead)
+        heartbeat = asyncio.create_task(manager.run_heartbeat(interval=10, timeout=30))
+        await asyncio.sleep(35)
+        assert dead.closed_with is None
+        await asyncio.sleep(10)
+        heartbeat.cancel()
+
+    run_virtual(run())
+    assert dead.closed_with == 4002 and live.closed_with is None
+    assert list(manager._lobby_connections) == [live]
+    assert live.pings == 4
+
+
+def test_reaper_closes_silent_spectators():
+    """Test that spectators are pinged too, and one that stops answering is dropped from its channel."""
+    manager = ConnectionManager()
+    game = game_manager.create_game("host")
+    live, dead = FakeSocket(manager), FakeSocket(manager, answers=False)
+
+    async def run():
+        await manager.connect_spectator(live, game.id)
+        await manager.connect_spectator(dead, game.id)
+        heartbeat = asyncio.create_task(manager.run_heartbeat(interval=10, timeout=30))
+        await asyncio.sleep(45)
+        heartbeat.cancel()
+        spectators = list(manager._spectator_channels[game.id].spectators)
+        manager.disconnect_spectator(game.id, live)
+        return spectators
+
+    assert run_virtual(run()) == [live]
+    assert dead.closed_with == 4002 and live.closed_with is None
+    assert live.pings == 4 and not manager._peers
+    game_manager.remove_game(game.id)
+
+
+def test_presence_follows_heartbeats():
+    """Test connected -> away after two silent intervals -> connected on any message -> gone."""
+    manager = ConnectionManager()
+    game = game_manager.create_game("host")
+    socket = FakeSocket(manager, answers=False)
+
+    async def run():
+        await manager.connect_to_game(socket, game.id, "host")
+        heartbeat = asyncio.create_task(manager.run_heartbeat(interval=10, timeout=60))
+        await asyncio.sleep(35)
+        states = [presence_board.get(game.id, "host")]
+        manager.touch(socket)
+        states.append(presence_board.get(game.id, "host"))
+        manager.disconnect_from_game(game.id, "host", socket)
+        states.append(presence_board.get(game.id, "host"))
+        heartbeat.cancel()
+        return states
+
+    assert run_virtual(run()) == [Presence.AWAY, Presence.CONNECTED, Presence.GONE]
+    presence_board.remove_game(game.id)
+    game_manager.remove_game(game.id)
+
+
+def test_stale_socket_does_not_disconnect_a_reconnected_player():
+    """Test that the old socket closing after a reconnect leaves the player connected."""
+    manager = ConnectionManager()
+    game = game_manager.create_game("host")
+    old, new = FakeSocket(manager), FakeSocket(manager)
+
+    async def run():
+        await manager.connect_to_game(old, game.id, "host")
+        await manager.connect_to_game(new, game.id, "host")
+        manager.disconnect_from_game(game.id, "host", old)
+
+    run_virtual(run())
+    assert manager._game_connections[game.id]["host"] is new
+    assert presence_board.get(game.id, "host") == Presence.CONNECTED
+    game_manager.remove_game(game.id)
+
+
+def test_player_who_leaves_is_folded_quickly():
+    """Test that a disconnect on your turn cuts the turn timer to a short grace."""
+    manager = ConnectionManager()
+    game = game_manager.create_game("host")
+    game_manager.join_game(game.id, "guest")
+    game_manager.start_game(game.id, "host")
+    folds = []
+
+    async def broadcast(game_id, message, viewer_nickname=None):
+        if message["type"] == "player_action":
+            folds.append((message["payload"]["nickname"], asyncio.get_running_loop().time()))
+
+    async def run():
+        sockets = {nickname: FakeSocket(manager) for nickname in ("host", "guest")}
+        for nickname, socket in sockets.items():
+            await manager.connect_to_game(socket, game.id, nickname)
+        loop = create_game_loop(game, broadcast, seed=1)
+        await loop.start_game()
+        start = asyncio.get_running_loop().time()
+        current = game.active_hand.seats[game.active_hand.current_seat]
+
+        await asyncio.sleep(5)
+        manager.disconnect_from_game(game.id, current, sockets[current])
+        await asyncio.sleep(game.config.turn_timer_seconds)
+        loop.cancel_tasks()
+        return current, start
+
+    current, start = run_virtual(run())
+    nickname, folded_at = folds[0]
+    assert nickname == current
+    assert folded_at - start < 5 + 3.5 < game.config.turn_timer_seconds
+    remove_game_loop(game.id)
+    game_manager.remove_game(game.id)
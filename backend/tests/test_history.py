@@ -0,0 +1,153 @@
+"""Tests for exporting hand histories from game logs."""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from datetime import datetime, timedelta, timezone
+import json
+import re
+
+from app.game import events, history
+from app.game.events import GameLog
+from app.game.game_loop import game_loops
+from app.game.history import hand_histories, iter_hands, main, stream_hand_histories
+from app.game.table_config import TABLE_PRESETS
+from app.sim import POLICIES, TableSimulator, run_virtual
+from test_tournament import play
+
+
+def simulate(log_dir="", seed=3):
+    """Play a 25-hand game with a mix of bots, returning the simulator."""
+    config = TABLE_PRESETS["turbo"].with_changes(hand_limit=25)
+    policies = [POLICIES[name] for name in ("passive", "check_fold", "random", "fuzz")]
+    sim = TableSimulator(table_id=0, policies=policies, seed=seed, config=config)
+    if log_dir:
+        sim.loop.log = GameLog(sim.game.id, directory=log_dir)
+    result = run_virtual(sim.run())
+    sim.loop.log.close(wait=True)
+    assert result.finished and not result.error
+    return sim
+
+
+def test_text_export_has_every_hand_with_matching_pots(tmp_path):
+    """Test that each finished hand is exported once, its winnings adding up to the pot."""
+    sim = simulate(str(tmp_path))
+    hands = list(hand_histories(directory=str(tmp_path)))
+    assert len(hands) == sim.game.current_hand_num == 25
+
+    awards = [e["won"] for e in sim.loop.log.events if e["t"] == "award"]
+    for text, won in zip(hands, awards):
+        assert text.startswith("PokerStars Hand #") and text.endswith("\n\n\n")
+        assert "*** HOLE CARDS ***" in text and "Dealt to" not in text
+        collected = {m[0]: int(m[1]) for m in re.findall(r"^(\S+) collected (\d+) from pot$", text, re.M)}
+        assert collected == won
+        assert f"Total pot {sum(won.values())} | Rake 0" in text
+
+
+def test_jsonl_export_records_actions_by_street(tmp_path):
+    """Test that JSON lines records carry the streets, board and actions of each hand."""
+    sim = simulate(str(tmp_path))
+    records = [json.loads(line) for line in hand_histories(format="jsonl", directory=str(tmp_path))]
+    assert [r["hand"] for r in records] == list(range(1, 26))
+    for record in records:
+        assert record["game_id"] == sim.game.id
+        streets = [s["street"] for s in record["streets"]]
+        assert streets == ["preflop", "flop", "turn", "river"][:len(streets)]
+        assert sum(len(s["cards"]) for s in record["streets"]) == len(record["board"])
+        blinds = [a["action"] for a in record["streets"][0]["actions"][:2]]
+        assert blinds == ["small_blind", "big_blind"]
+        if len(record["showdown"]) < 2:
+            assert record["showdown"] == {}
+    kinds = {a["action"] for r in records for s in r["streets"] for a in s["actions"]}
+    assert {"fold", "check", "call", "bet", "raise"} <= kinds
+
+
+def test_player_export_shows_only_their_hole_cards(tmp_path):
+    """Test that exporting for a player keeps the hands they were dealt, with their own cards."""
+    sim = simulate(str(tmp_path))
+    log = sim.loop.log
+    records = [json.loads(line) for line in hand_histories(player="bot1", format="jsonl", directory=str(tmp_path))]
+    assert records and all(list(r["hole_cards"]) == ["bot1"] for r in records)
+
+    deals = [i for i, e in enumerate(log.events) if e["t"] == "deal"]
+    dealt = {}
+    for index in deals:
+        hand = log.replay(index + 1).active_hand
+        if "bot1" in hand.player_hands:
+            dealt[hand.hand_number] = [c.code for c in hand.player_hands["bot1"].hole_cards]
+    assert {r["hand"]: r["hole_cards"]["bot1"] for r in records} == dealt
+
+    text = "".join(hand_histories(player="bot1", directory=str(tmp_path)))
+    assert set(re.findall(r"^Dealt to (\S+)", text, re.M)) == {"bot1"}
+
+
+def test_date_range_filters_hands(tmp_path):
+    """Test that since and until keep only hands started in the range."""
+    simulate(str(tmp_path))
+    now = datetime.now(timezone.utc)
+    directory = str(tmp_path)
+    assert list(hand_histories(since=now + timedelta(hours=1), directory=directory)) == []
+    assert list(hand_histories(until=now - timedelta(hours=1), directory=directory)) == []
+    naive_range = dict(since=(now - timedelta(hours=1)).replace(tzinfo=None), until=now + timedelta(hours=1))
+    assert len(list(hand_histories(directory=directory, **naive_range))) == 25
+
+
+def test_only_finished_hands_are_exported():
+    """Test that a hand still in play, or a log without a start event, exports nothing for it."""
+    events = simulate().loop.log.events
+    last_clear = max(i for i, e in enumerate(events) if e["t"] == "clear")
+    assert len(list(iter_hands(events[:last_clear]))) == 24
+    assert list(iter_hands(events[1:])) == []
+
+
+def test_stream_live_game_in_chunks(monkeypatch):
+    """Test that a live game streams from memory, in chunks that add up to the full export."""
+    sim = simulate()
+    monkeypatch.setattr(history, "CHUNK_BYTES", 4096)
+    game_loops[sim.game.id] = sim.loop
+    try:
+        async def collect():
+            return [chunk async for chunk in stream_hand_histories(sim.game.id, directory="")]
+
+        chunks = run_virtual(collect())
+        expected = "".join(hand_histories(sim.game.id, directory=""))
+    finally:
+        del game_loops[sim.game.id]
+    assert len(chunks) > 1
+    assert "".join(chunks) == expected
+    assert expected.count("PokerStars Hand #") == 25
+
+
+def test_cli_exports_from_log_dir(tmp_path, capsys):
+    """Test that the command line export writes a game's hands, and fails for an unknown game."""
+    sim = simulate(str(tmp_path))
+    assert main(["--game", sim.game.id, "--dir", str(tmp_path), "--format", "jsonl"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 25 and json.loads(lines[0])["hand"] == 1
+
+    assert main(["--game", "no-such-game", "--dir", str(tmp_path)]) == 1
+
+
+def test_export_leaves_out_tournament_tables(tmp_path, monkeypatch, caplog):
+    """Test that tournament tables, whose logs don't replay, are skipped, and a bad log doesn't stop the export."""
+    monkeypatch.setattr(events, "GAME_LOG_DIR", str(tmp_path))
+    play(30, seed=1)
+    events._log_writer().submit(lambda: None).result()  # Tables closed their logs; wait for the writes
+    table_logs = sorted(tmp_path.glob("*.jsonl"))
+    assert len(table_logs) >= 5
+    assert all(json.loads(path.open().readline()).get("tournament") for path in table_logs)
+
+    sim = simulate(str(tmp_path))
+    assert len(list(hand_histories(directory=str(tmp_path)))) == 25
+    assert not [r for r in caplog.records if r.levelname == "ERROR"]
+
+    # A tournament log without the mark (e.g. from before it existed) fails to replay partway
+    for path in table_logs:
+        lines = path.read_text().splitlines(keepends=True)
+        start = json.loads(lines[0])
+        del start["tournament"]
+        path.write_text(json.dumps(start) + "\n" + "".join(lines[1:]))
+    hands = list(hand_histories(format="jsonl", directory=str(tmp_path)))
+    assert [json.loads(h)["game_id"] for h in hands].count(sim.game.id) == 25
+    assert any("does not replay" in r.getMessage() for r in caplog.records)
@@ -0,0 +1,71 @@
+"""Tests for inbound message validation and dispatch."""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from app.api import websocket as websocket_module
+from app.api.messages import Action, MessageError, SetPreAction, StartGame, parse_message
+from app.config import MAX_MESSAGE_SIZE
+
+
+def test_action_fields_top_level_or_params():
+    """Test that the amount is read from the top level (as the web client sends it) or params."""
+    handler, message = parse_message('{"type": "action", "action": "raise", "amount": 60}')
+    assert handler is websocket_module.handle_action
+    assert message == Action(action="raise", amount=60)
+
+    _, message = parse_message('{"type": "action", "action": "raise", "params": {"amount": 80.0}}')
+    assert message == Action(action="raise", amount=80)
+    _, message = parse_message('{"type": "action", "action": "fold", "params": {}}')
+    assert message == Action(action="fold")
+
+    handler, message = parse_message('{"type": "start_game"}')
+    assert handler is websocket_module.handle_start_game and message == StartGame()
+
+    handler, message = parse_message('{"type": "pre_action", "pre_action": "check_fold"}')
+    assert handler is websocket_module.handle_pre_action and message == SetPreAction("check_fold")
+    assert parse_message('{"type": "pre_action"}')[1] == SetPreAction(None)
+
+
+@pytest.mark.parametrize("text, error, reason", [
+    ("x" * (MAX_MESSAGE_SIZE + 1), "Message too large", "too_large"),
+    ("{not json", "Malformed message", "malformed"),
+    ("[1, 2]", "Malformed message", "malformed"),
+    ('{"type": "shutdown"}', "Unknown message type: shutdown", "unknown_type"),
+    ('{"action": "fold"}', "Unknown message type: None", "unknown_type"),
+    ('{"type": "action"}', "No action specified", "invalid_field"),
+    ('{"type": "action", "action": "steal"}', "Unknown action: steal", "invalid_field"),
+    ('{"type": "action", "action": 3}', "action must be a string", "invalid_field"),
+    ('{"type": "action", "action": "raise", "amount": "60"}', "amount must be a whole number", "invalid_field"),
+    ('{"type": "action", "action": "raise", "amount": true}', "amount must be a whole number", "invalid_field"),
+    ('{"type": "action", "action": "raise", "amount": 1.5}', "amount must be a whole number", "invalid_field"),
+    ('{"type": "action", "action": "raise", "amount": -5}', "amount out of range", "invalid_field"),
+    ('{"type": "action", "action": "raise", "amount": 1e300}', "amount out of range", "invalid_field"),
+])
+def test_malformed_messages_are_refused(text, error, reason):
+    """Test that bad input raises MessageError with a client-safe message."""
+    with pytest.raises(MessageError) as info:
+        parse_message(text)
+    assert str(info.value) == error
+    assert info.value.reason == reason
+
+
+def test_refused_message_never_reaches_game_loop(monkeypatch):
+    """Test that dispatch answers bad input with an error and does not call the handler."""
+    sent = []
+
+    async def send_to_player(game_id, nickname, message):
+        sent.append(message)
+
+    monkeypatch.setattr(websocket_module.connection_manager, "send_to_player", send_to_player)
+    asyncio.run(websocket_module.handle_game_message("g1", "ann", json.dumps({"type": "action", "action": "steal"})))
+    assert sent == [{"type": "error", "payload": {"message": "Unknown action: steal"}}]
+
+    sent.clear()
+    asyncio.run(websocket_module.handle_game_message("missing", "ann", '{"type": "action", "action": "fold"}'))
+    assert sent == [{"type": "error", "payload": {"message": "Game not active"}}]
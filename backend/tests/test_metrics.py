@@ -0,0 +1,46 @@
+"""Tests for the metrics registry and exposition format."""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.api.admin import require_admin
+from app.api.routes import router
+from app.metrics import Counter, Histogram, Registry
+
+
+def test_histogram_buckets_are_cumulative():
+    """Test that histogram buckets count observations at or below each bound."""
+    registry = Registry()
+    hist = registry.register(Histogram("test_seconds", "Test latency", buckets=(0.1, 1.0)))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        hist.observe(value)
+
+    text = registry.render()
+    assert 'test_seconds_bucket{le="0.1"} 2' in text
+    assert 'test_seconds_bucket{le="1.0"} 3' in text
+    assert 'test_seconds_bucket{le="+Inf"} 4' in text
+    assert "test_seconds_count 4" in text
+    assert "# TYPE test_seconds histogram" in text
+
+
+def test_labelled_children_and_collectors():
+    """Test that labelled children are reused and collectors run at scrape time."""
+    registry = Registry()
+    counter = registry.register(Counter("test_total", "Test counter", ("kind",)))
+    assert counter.labels("a") is counter.labels("a")
+    counter.labels("a").inc()
+    counter.labels("b").inc(2)
+
+    scrapes = []
+    registry.add_collector(lambda: scrapes.append(1))
+    text = registry.render()
+    assert 'test_total{kind="a"} 1.0' in text
+    assert 'test_total{kind="b"} 2.0' in text
+    assert scrapes == [1]
+
+
+def test_metrics_endpoint_requires_admin_token():
+    """Test that /api/metrics is guarded by the admin token like the admin API."""
+    route = next(r for r in router.routes if r.path == "/api/metrics")
+    assert require_admin in [d.call for d in route.dependant.dependencies]
@@ -5,8 +5,9 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.game.poker import (
-    Card, Rank, Suit, Deck, HandRank,
-    evaluate_hand, evaluate_five_cards, compare_hands
+    Card, Rank, Suit, Deck, HandRank, FULL_DECK, STARTING_HANDS,
+    evaluate_hand, evaluate_five_cards, compare_hands, new_rng, hand_value,
+    preflop_equity, starting_hand_index, starting_hand_name
 )
 
 
@@ -48,6 +49,41 @@ def test_deck():
     assert len(deck) == 46
 
 
+def test_deck_seeded_deals_are_reproducible():
+    """Test that the same seed deals the same cards."""
+    deck1 = Deck(new_rng(42))
+    deck2 = Deck(new_rng(42))
+    deck1.shuffle()
+    deck2.shuffle()
+
+    assert deck1.deal(9) == deck2.deal(9)
+    assert deck1.deal_one() == deck2.deal_one()
+
+
+def test_deck_deals_every_card_once():
+    """Test that a lazily shuffled deck deals all 52 distinct cards."""
+    deck = Deck(new_rng(7))
+    deck.shuffle()
+
+    dealt = deck.deal(20) + deck.deal(32)
+    assert len(deck) == 0
+    assert set(dealt) == set(FULL_DECK)
+    assert dealt != list(FULL_DECK)
+
+    try:
+        deck.deal_one()
+        assert False, "Expected ValueError"
+    except ValueError:
+        pass
+
+
+def test_deck_unshuffled_deals_in_order():
+    """Test that an unshuffled deck deals from the top in order."""
+    deck = Deck()
+    assert deck.deal(3) == list(FULL_DECK[:3])
+    assert deck.remaining == list(FULL_DECK[3:])
+
+
 def test_high_card():
     """Test high card hands."""
     hand = make_hand("Ah Kd Qc Jh 9s")
@@ -195,9 +231,52 @@ def test_compare_hands_tie():
     assert winners == [0, 1]  # Tie
 
 
+def test_hand_value_orders_like_evaluate_hand():
+    """Test that the fast evaluator agrees with evaluate_hand on random 7-card hands."""
+    rng = new_rng(11)
+    hands = [rng.sample(FULL_DECK, 7) for _ in range(300)]
+    by_reference = sorted(range(len(hands)), key=lambda i: evaluate_hand(hands[i]))
+    values = [hand_value(h) for h in hands]
+    for a, b in zip(by_reference, by_reference[1:]):
+        ref_a, ref_b = evaluate_hand(hands[a]), evaluate_hand(hands[b])
+        assert (values[a] < values[b]) == (ref_a < ref_b)
+        assert (values[a] == values[b]) == (ref_a == ref_b)
+
+
+def test_hand_value_edge_cases():
+    """Test wheel, straight flush over flush, and full house from two trips."""
+    assert hand_value(make_hand("Ah 2d 3c 4h 5s Kd Qc")) < hand_value(make_hand("2h 3d 4c 5h 6s Kd Qc"))
+    assert hand_value(make_hand("9h 10h Jh Qh Kh 2h 3c")) > hand_value(make_hand("Ah Kh Qh Jh 9h 2d 3c"))
+    two_trips = hand_value(make_hand("Kh Kd Kc 7h 7s 7d 2c"))
+    assert two_trips == hand_value(make_hand("Kh Kd Kc 7h 7s 3d 2c"))
+
+
+def test_starting_hand_index():
+    """Test that the 1,326 hole card combos map onto 169 named starting hands."""
+    indices = {starting_hand_index([a, b]) for i, a in enumerate(FULL_DECK) for b in FULL_DECK[i + 1:]}
+    assert indices == set(range(STARTING_HANDS))
+    assert starting_hand_name(starting_hand_index(make_hand("Ah Kh"))) == "AKs"
+    assert starting_hand_name(starting_hand_index(make_hand("Kd Ah"))) == "AKo"
+    assert starting_hand_name(starting_hand_index(make_hand("2c 2d"))) == "22"
+    assert starting_hand_name(starting_hand_index(make_hand("7c 2d"))) == "72o"
+
+
+def test_preflop_equity_table():
+    """Test lookups in the shipped preflop equity table against well-known values."""
+    aces = make_hand("As Ad")
+    assert abs(preflop_equity(aces, 1) - 0.852) < 0.01
+    assert preflop_equity(aces, 1) > preflop_equity(aces, 2) > preflop_equity(aces, 3)
+    assert abs(preflop_equity(make_hand("7c 2d"), 1) - 0.346) < 0.01
+    assert preflop_equity(make_hand("Ah Kh"), 1) > preflop_equity(make_hand("Ah Kd"), 1)
+    assert preflop_equity(make_hand("Ah Kh")) == preflop_equity(make_hand("As Ks"))
+
+
 if __name__ == "__main__":
     # Run all tests
     test_deck()
+    test_deck_seeded_deals_are_reproducible()
+    test_deck_deals_every_card_once()
+    test_deck_unshuffled_deals_in_order()
     test_high_card()
     test_pair()
     test_two_pair()
@@ -214,4 +293,8 @@ if __name__ == "__main__":
     test_seven_card_evaluation()
     test_compare_hands_winner()
     test_compare_hands_tie()
+    test_hand_value_orders_like_evaluate_hand()
+    test_hand_value_edge_cases()
+    test_starting_hand_index()
+    test_preflop_equity_table()
     print("All poker tests passed!")
@@ -0,0 +1,106 @@
+"""Tests for pre-actions registered before a player's turn."""
+
+import asyncio
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.game import game_manager
+from app.game.actions import PreAction, resolve_pre_action
+from app.game.game_loop import create_game_loop, remove_game_loop
+from app.game.models import BettingRound
+from app.sim import run_virtual
+
+
+def test_resolve_pre_action():
+    """Test what each pre-action plays facing no bet and facing a bet."""
+    unbet = {"fold": True, "check": True, "raise": {}}
+    bet = {"fold": True, "call": 20, "raise": {}}
+    assert [resolve_pre_action(p, unbet) for p in PreAction] == ["fold", "check", "check", "check"]
+    assert [resolve_pre_action(p, bet) for p in PreAction] == ["fold", "fold", None, "call"]
+
+
+def three_handed(run):
+    """Start a three-player game and run `run(game, loop, messages)` in virtual time."""
+    game = game_manager.create_game("host")
+    game_manager.join_game(game.id, "ann")
+    game_manager.join_game(game.id, "bob")
+    game_manager.start_game(game.id, "host")
+    messages = []
+
+    async def broadcast(game_id, message, viewer_nickname=None):
+        messages.append((message["type"], message["payload"], viewer_nickname))
+
+    async def main():
+        loop = create_game_loop(game, broadcast, seed=3)
+        await loop.start_game()
+        try:
+            return await run(game, loop, messages)
+        finally:
+            loop.cancel_tasks()
+
+    try:
+        return run_virtual(main())
+    finally:
+        remove_game_loop(game.id)
+        game_manager.remove_game(game.id)
+
+
+def seats_in_turn_order(game):
+    hand = game.active_hand
+    first = hand.current_seat
+    seats = [hand.seats[(first + i) % len(hand.seats)] for i in range(len(hand.seats))]
+    return [nickname for nickname in seats if nickname]
+
+
+def test_pre_actions_play_without_prompting():
+    """Test that registered pre-actions act at once, with no turn message or timer for them."""
+    async def run(game, loop, messages):
+        first, second, third = seats_in_turn_order(game)
+        assert loop.set_pre_action(second, PreAction.CALL_ANY) is None
+        assert loop.set_pre_action(third, PreAction.CHECK) is None
+        assert loop.set_pre_action(first, PreAction.FOLD) == "It is already your turn"
+        messages.clear()
+
+        await loop.handle_action(first, "call", {})
+        played = [(p["nickname"], p["action"]) for t, p, _ in messages if t == "player_action"]
+        turns = [p["current_player"] for t, p, _ in messages if t == "turn"]
+        return first, second, third, played, turns, game.active_hand.betting_round
+
+    first, second, third, played, turns, betting_round = three_handed(run)
+    assert played == [(first, "call"), (second, "call"), (third, "check")]
+    assert betting_round == BettingRound.FLOP
+    assert turns == [second]  # First to act on the flop; nobody was prompted preflop
+
+
+def test_check_is_cancelled_by_a_bet():
+    """Test that a raise before the turn cancels a check, and the player is prompted instead."""
+    async def run(game, loop, messages):
+        first, second, third = seats_in_turn_order(game)
+        loop.set_pre_action(third, PreAction.CHECK)
+        await loop.handle_action(first, "raise", {"amount": game.active_hand.current_bet * 3})
+        messages.clear()
+        await loop.handle_action(second, "fold", {})
+        return third, list(messages), loop.pre_actions
+
+    third, messages, pending = three_handed(run)
+    assert ("pre_action_cleared", {"pre_action": "check", "reason": "The bet changed"}, third) in messages
+    assert [p["current_player"] for t, p, _ in messages if t == "turn"] == [third]
+    assert pending == {}
+
+
+def test_pre_actions_expire_with_the_betting_round():
+    """Test that a pre-action left over when the street ends is not played on the next one."""
+    async def run(game, loop, messages):
+        first, second, third = seats_in_turn_order(game)
+        await loop.handle_action(first, "call", {})
+        await loop.handle_action(second, "call", {})
+        loop.set_pre_action(second, PreAction.CHECK_FOLD)
+        messages.clear()
+        await loop.handle_action(third, "check", {})
+        return second, list(messages), game.active_hand
+
+    second, messages, hand = three_handed(run)
+    assert hand.betting_round == BettingRound.FLOP
+    assert not hand.player_hands[second].folded
+    assert [p["current_player"] for t, p, _ in messages if t == "turn"] == [second]
@@ -0,0 +1,56 @@
+"""Tests for the sampling profiler and slow callback detector."""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.profiling import SamplingProfiler, SlowCallbackDetector, current_game_id
+
+
+def busy_work(seconds: float):
+    end = time.process_time() + seconds
+    while time.process_time() < end:
+        pass
+
+
+def test_profiler_collects_collapsed_stacks():
+    """Test that CPU samples land in the function that burned the time."""
+    profiler = SamplingProfiler(interval=0.005, mode="cpu")
+    profiler.start()
+    try:
+        busy_work(0.3)
+    finally:
+        profiler.stop()
+
+    assert not SamplingProfiler.running()
+    assert profiler.sample_count > 0
+    lines = profiler.collapsed().splitlines()
+    stack, count = lines[0].rsplit(" ", 1)
+    assert "test_profiling:busy_work" in stack.split(";")
+    assert int(count) > 0
+
+
+def test_slow_callback_reports_game_id():
+    """Test that a blocking step is recorded with the game of the task that ran it."""
+    detector = SlowCallbackDetector()
+
+    async def blocking_game_task():
+        current_game_id.set("abc123")
+        await asyncio.sleep(0)
+        time.sleep(0.05)
+
+    async def main():
+        detector.install(0.02)
+        try:
+            await asyncio.create_task(blocking_game_task())
+        finally:
+            detector.uninstall()
+
+    asyncio.run(main())
+
+    slow = [s for s in detector.recent if s.game_id == "abc123"]
+    assert slow
+    assert "blocking_game_task" in slow[0].callback
+    assert slow[0].duration >= 0.05
@@ -0,0 +1,99 @@
+"""Tests for inbound message rate limiting."""
+
+import asyncio
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import metrics
+from app.api.ratelimit import TokenBucket, Verdict
+from app.api.websocket import MESSAGES_THROTTLED, ConnectionManager
+from app.config import GAME_MESSAGE_BURST, LOBBY_MESSAGE_BURST, RATE_LIMIT_MAX_STRIKES
+from app.game import game_manager
+from app.sim import run_virtual
+
+
+class FakeSocket:
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        pass
+
+
+def test_token_bucket_burst_and_refill():
+    """Test the burst, the refill rate, the cap and strikes resetting on an allowed message."""
+    bucket = TokenBucket(rate=2, burst=3, max_strikes=3, now=0)
+    assert [bucket.take(now=0) for _ in range(4)] == [Verdict.ALLOW] * 3 + [Verdict.DROP]
+    assert bucket.take(now=0.25) == Verdict.DROP
+    assert bucket.take(now=0.5) == Verdict.ALLOW  # 1 token after half a second
+    assert bucket.strikes == 0
+
+    # A long pause refills only up to the burst
+    assert [bucket.take(now=100) for _ in range(4)] == [Verdict.ALLOW] * 3 + [Verdict.DROP]
+    assert bucket.take(now=100) == Verdict.DROP
+    assert bucket.take(now=100) == Verdict.DISCONNECT
+
+
+def test_flooding_player_is_throttled_then_disconnected():
+    """Test per-player buckets in the connection manager, and that other players are unaffected."""
+    manager = ConnectionManager()
+    game = game_manager.create_game("host")
+    game_manager.join_game(game.id, "guest")
+    asyncio.run(manager.connect_to_game(FakeSocket(), game.id, "host"))
+    asyncio.run(manager.connect_to_game(FakeSocket(), game.id, "guest"))
+    throttled = MESSAGES_THROTTLED.labels("game")
+    before = throttled.value
+
+    verdicts = [manager.check_game_message(game.id, "host") for _ in range(GAME_MESSAGE_BURST + RATE_LIMIT_MAX_STRIKES)]
+    assert verdicts[:GAME_MESSAGE_BURST] == [Verdict.ALLOW] * GAME_MESSAGE_BURST
+    assert set(verdicts[GAME_MESSAGE_BURST:-1]) == {Verdict.DROP}
+    assert verdicts[-1] == Verdict.DISCONNECT
+    if metrics.enabled:
+        assert throttled.value - before == RATE_LIMIT_MAX_STRIKES
+
+    assert manager.check_game_message(game.id, "guest") == Verdict.ALLOW
+
+    # Buckets outlive a reconnect, and go with the game's last connection
+    manager.disconnect_from_game(game.id, "host")
+    asyncio.run(manager.connect_to_game(FakeSocket(), game.id, "host"))
+    assert manager._game_buckets[game.id]["host"].strikes > 0
+    manager.disconnect_from_game(game.id, "host")
+    manager.disconnect_from_game(game.id, "guest")
+    assert game.id not in manager._game_buckets
+    game_manager.remove_game(game.id)
+
+
+def test_lobby_sockets_have_their_own_buckets():
+    """Test lobby rate limiting per socket and cleanup on disconnect."""
+    manager = ConnectionManager()
+    noisy, quiet = FakeSocket(), FakeSocket()
+    asyncio.run(manager.connect_to_lobby(noisy))
+    asyncio.run(manager.connect_to_lobby(quiet))
+
+    verdicts = {manager.check_lobby_message(noisy) for _ in range(20)}
+    assert verdicts == {Verdict.ALLOW, Verdict.DROP}
+    assert manager.check_lobby_message(quiet) == Verdict.ALLOW
+
+    manager.disconnect_from_lobby(noisy)
+    assert noisy not in manager._lobby_connections
+
+
+def test_flooding_spectator_is_disconnected():
+    """Test that a spectator socket has a bucket and is cut off after too many messages."""
+    manager = ConnectionManager()
+    game = game_manager.create_game("host")
+    spectator = FakeSocket()
+
+    async def run():
+        await manager.connect_spectator(spectator, game.id)
+        messages = LOBBY_MESSAGE_BURST + RATE_LIMIT_MAX_STRIKES
+        verdicts = [manager.check_spectator_message(spectator) for _ in range(messages)]
+        manager.disconnect_spectator(game.id, spectator)
+        return verdicts
+
+    verdicts = run_virtual(run())
+    assert verdicts[:LOBBY_MESSAGE_BURST] == [Verdict.ALLOW] * LOBBY_MESSAGE_BURST
+    assert verdicts[-1] == Verdict.DISCONNECT
+    assert not manager._spectator_buckets
+    game_manager.remove_game(game.id)
@@ -0,0 +1,89 @@
+"""Tests for dealing out the board once no more betting is possible."""
+
+import asyncio
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import RUNOUT_STREET_SECONDS
+from app.game import game_manager
+from app.game.game_loop import NEXT_HAND_DELAY_SECONDS, create_game_loop, remove_game_loop
+from app.sim import run_virtual
+
+
+def play(nicknames, run):
+    """Start a game and run `run(game, loop, messages)` in virtual time."""
+    game = game_manager.create_game(nicknames[0])
+    for nickname in nicknames[1:]:
+        game_manager.join_game(game.id, nickname)
+    game_manager.start_game(game.id, nicknames[0])
+    messages = []
+
+    async def broadcast(game_id, message, viewer_nickname=None):
+        messages.append((message["type"], message["payload"]))
+
+    async def main():
+        loop = create_game_loop(game, broadcast, seed=11)
+        await loop.start_game()
+        try:
+            return await run(game, loop, messages)
+        finally:
+            loop.cancel_tasks()
+
+    try:
+        return run_virtual(main())
+    finally:
+        remove_game_loop(game.id)
+        game_manager.remove_game(game.id)
+
+
+def current(game):
+    hand = game.active_hand
+    return hand.seats[hand.current_seat]
+
+
+def test_all_in_is_run_out_in_one_message():
+    """Test that a called all-in preflop deals the board at once, with equity, then resolves."""
+    async def run(game, loop, messages):
+        await loop.handle_action(current(game), "all_in", {})
+        messages.clear()
+        await loop.handle_action(current(game), "call", {})
+        return list(messages)
+
+    messages = play(["host", "guest"], run)
+    types = [t for t, _ in messages]
+    assert "community_cards" not in types and "turn" not in types
+    assert types.index("run_out") < types.index("hand_result")
+
+    run_out = dict(messages)["run_out"]
+    assert [s["betting_round"] for s in run_out["streets"]] == ["flop", "turn", "river"]
+    assert len(run_out["all_community_cards"]) == 5
+    assert set(run_out["hole_cards"]) == set(run_out["equity"]) == {"host", "guest"}
+    assert abs(sum(run_out["equity"].values()) - 1) < 1e-3
+    assert sorted(run_out["streets"][-1]["equity"].values()) in ([0.0, 1.0], [0.5, 0.5])
+
+
+def test_last_player_with_chips_is_not_prompted_on_later_streets():
+    """Test that calling a short all-in with the others folded deals out the board without prompts."""
+    async def run(game, loop, messages):
+        first = current(game)
+        game.get_player(first).chips = 100
+        await loop.handle_action(first, "all_in", {})
+        caller = current(game)
+        await loop.handle_action(caller, "call", {})
+        messages.clear()
+        await loop.handle_action(current(game), "fold", {})
+        run_out_messages = list(messages)
+
+        # The pause before the next hand leaves time to show the three streets
+        await asyncio.sleep(NEXT_HAND_DELAY_SECONDS + 0.5)
+        hands = [game.current_hand_num]
+        await asyncio.sleep(3 * RUNOUT_STREET_SECONDS)
+        hands.append(game.current_hand_num)
+        return run_out_messages, hands
+
+    messages, hands = play(["host", "ann", "bob"], run)
+    types = [t for t, _ in messages]
+    assert "turn" not in types and "community_cards" not in types
+    assert types.index("run_out") < types.index("hand_result")
+    assert hands == [1, 2]
@@ -0,0 +1,161 @@
+"""Tests for fixed seating: button, blinds and action order at 6-10 seat tables."""
+
+import asyncio
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from app.game import actions
+from app.game.game_loop import GameLoop
+from app.game.models import BettingRound, Game
+from app.game.seating import SeatRing, next_occupied
+from app.game.table_config import TABLE_PRESETS
+from app.sim import run_simulation
+
+FULL_RING = TABLE_PRESETS["full_ring"]
+
+
+async def _no_broadcast(game_id, message, viewer_nickname=None):
+    pass
+
+
+def seated_game(players: int) -> tuple[Game, GameLoop]:
+    game = Game(creator="p0", config=FULL_RING)
+    for i in range(players):
+        game.add_player(f"p{i}", FULL_RING.starting_chips)
+    return game, GameLoop(game, _no_broadcast, seed=1)
+
+
+def run(loop: GameLoop, step):
+    """Run one GameLoop step and stop the turn timer it leaves behind."""
+    async def go():
+        await step()
+        loop.cancel_tasks()
+    asyncio.run(go())
+
+
+def blind_seats(game: Game) -> tuple[int, int]:
+    bets = {ph.seat: ph.current_bet for ph in game.active_hand.player_hands.values() if ph.current_bet}
+    hand = game.active_hand
+    return (
+        next(s for s, b in bets.items() if b == hand.small_blind),
+        next(s for s, b in bets.items() if b == hand.big_blind),
+    )
+
+
+def test_seat_ring():
+    """Test O(1) ring moves, removal and lookup from seats outside the ring."""
+    ring = SeatRing(10, [1, 4, 7, 9])
+    assert list(ring) == [1, 4, 7, 9] and len(ring) == 4
+    assert ring.next(9) == 1 and ring.prev(1) == 9
+    ring.remove(4)
+    assert ring.next(1) == 7 and ring.prev(7) == 1 and 4 not in ring
+    assert ring.first_after(4) == 7
+    assert ring.first_after(9) == 1
+    for seat in (1, 7, 9):
+        ring.remove(seat)
+    assert ring.first_after(0) is None and len(ring) == 0
+
+    assert next_occupied([None, "a", None, "b"], 1) == 3
+    assert next_occupied([None, "a", None, "b"], 3) == 1
+
+
+@pytest.mark.parametrize("players", [6, 9, 10])
+def test_preflop_order_starts_after_big_blind(players):
+    """Test that the player after the big blind acts first and the big blind closes the round."""
+    game, loop = seated_game(players)
+    run(loop, loop.start_game)
+    hand = game.active_hand
+
+    assert hand.dealer_position == 0
+    assert blind_seats(game) == (1, 2)
+    assert actions.get_current_player_nickname(game) == "p3"
+
+    order = []
+    while hand.betting_round == BettingRound.PREFLOP:
+        nickname = actions.get_current_player_nickname(game)
+        order.append(nickname)
+        if "check" in actions.get_valid_actions(game, nickname):
+            actions.check(game, nickname)
+        else:
+            actions.call(game, nickname)
+    assert order == [f"p{(3 + i) % players}" for i in range(players)]
+
+    # Postflop the first player after the button acts first
+    assert actions.get_current_player_nickname(game) == "p1"
+    assert hand.get_total_pot() == players * hand.big_blind
+
+
+@pytest.mark.parametrize("players", [6, 9, 10])
+def test_raise_reopens_action(players):
+    """Test that a raise makes everyone else act again and folded players are skipped."""
+    game, loop = seated_game(players)
+    run(loop, loop.start_game)
+    hand = game.active_hand
+
+    actions.fold(game, "p3")
+    actions.raise_bet(game, "p4", 60)
+    # Everyone from p5 round to p2 calls, then action is closed by p3's fold
+    acted = []
+    while hand.betting_round == BettingRound.PREFLOP:
+        nickname = actions.get_current_player_nickname(game)
+        acted.append(nickname)
+        actions.call(game, nickname)
+    expected = [f"p{s}" for s in list(range(5, players)) + [0, 1, 2]]
+    assert acted == expected
+    assert hand.players_in_hand == players - 1
+
+
+@pytest.mark.parametrize("players", [6, 9, 10])
+def test_button_skips_eliminated_seats(players):
+    """Test that seats keep their numbers and the button and blinds skip eliminated players."""
+    game, loop = seated_game(players)
+    run(loop, loop.start_game)
+
+    # Seats 1 and 2 bust before the next hand
+    game.active_hand = None
+    for seat in (1, 2):
+        player = game.seats[seat]
+        player.chips = 0
+        player.is_eliminated = True
+
+    run(loop, loop.start_hand)
+    hand = game.active_hand
+    assert game.dealer_position == 3
+    assert blind_seats(game) == (4, 5)
+    assert hand.seats[1] is None and hand.seats[2] is None
+    assert [p.seat for p in game.players] == list(range(players))
+    assert game.get_player_position("p5") == 5
+
+    # Round the table until the button wraps past the empty seats
+    for _ in range(players - 3):
+        game.active_hand = None
+        run(loop, loop.start_hand)
+    assert game.dealer_position == 0
+    assert blind_seats(game) == (3, 4)
+
+
+def test_heads_up_button_posts_small_blind():
+    """Test heads-up blinds on a big table with the two players far apart."""
+    game, loop = seated_game(10)
+    for player in game.players:
+        if player.seat not in (2, 8):
+            player.is_eliminated = True
+            player.chips = 0
+    game.dealer_position = 8
+    game.current_hand_num = 1
+    run(loop, loop.start_hand)
+
+    assert game.dealer_position == 2
+    assert blind_seats(game) == (2, 8)
+    assert actions.get_current_player_nickname(game) == "p2"
+
+
+@pytest.mark.parametrize("players", [6, 9, 10])
+def test_full_tables_conserve_chips(players):
+    """Test that simulated full tables play out without breaking an invariant."""
+    report = run_simulation(tables=3, players=players, policy="random,passive,fuzz", seed=5, config=FULL_RING)
+    assert not report.errors, report.errors
+    assert all(t.finished for t in report.tables)
@@ -0,0 +1,44 @@
+"""Tests for memoized game state serialization."""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.game import actions
+from app.game.poker import FULL_DECK
+from benchmarks.helpers import dealt_game
+
+
+def test_unchanged_state_reuses_fragments():
+    """Test that repeated calls share fragments, and hole cards only go to their owner."""
+    game = dealt_game(3)
+    first, again = game.to_dict("p1"), game.to_dict("p1")
+    assert first == again
+    assert first["players"][0] is again["players"][0]
+    assert first["active_hand"]["player_hands"]["p1"] is again["active_hand"]["player_hands"]["p1"]
+
+    hands = game.to_dict("p2")["active_hand"]["player_hands"]
+    assert hands["p1"]["hole_cards"] is None and hands["p2"]["hole_cards"] is not None
+    assert game.to_dict()["active_hand"]["player_hands"]["p2"]["hole_cards"] is None
+    assert FULL_DECK[0].to_dict() is FULL_DECK[0].to_dict()
+
+
+def test_mutations_are_serialized():
+    """Test that assignments, bets and in-place changes (board, seating) all show up."""
+    game = dealt_game(3)
+    before = game.to_dict()
+    nickname = actions.get_current_player_nickname(game)
+    actions.call(game, nickname)
+    after = game.to_dict()
+    assert after["active_hand"]["current_seat"] != before["active_hand"]["current_seat"]
+    seat = game.get_player(nickname).seat
+    assert after["players"][seat]["chips"] < before["players"][seat]["chips"]
+    assert after["active_hand"]["player_hands"][nickname]["current_bet"] > 0
+
+    game.active_hand.community_cards.extend(FULL_DECK[:3])
+    assert len(game.to_dict()["active_hand"]["community_cards"]) == 3
+
+    game.add_player("late", 1000)
+    assert game.to_dict()["player_count"] == 4
+    game.current_hand_num += 1
+    assert game.to_dict()["current_hand_num"] == before["current_hand_num"] + 1
@@ -0,0 +1,98 @@
+"""Tests for the game engine, driven through the headless simulator."""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncio
+
+import pytest
+
+from app.config import HAND_LIMIT, TURN_TIMER_SECONDS
+from app.game.game_loop import NEXT_HAND_DELAY_SECONDS
+from app.game.models import Game
+from app.game.table_config import TABLE_PRESETS, BlindLevel, TableConfig
+from app.sim import InvariantViolation, TableSimulator, check_invariants, run_simulation, run_virtual
+
+
+def test_passive_tables_play_to_hand_limit():
+    """Test that call-down bots play every hand up to the limit."""
+    report = run_simulation(tables=3, players=4, policy="passive", seed=1)
+    assert report.errors == []
+    assert all(t.finished for t in report.tables)
+    assert all(t.hands == HAND_LIMIT for t in report.tables)
+
+
+def test_fuzz_conserves_chips():
+    """Test that random, invalid and timed-out actions never create or lose chips."""
+    report = run_simulation(tables=40, players=4, policy="random,fuzz,sleepy,aggressive", seed=100)
+    assert report.errors == []
+    assert all(t.finished for t in report.tables)
+    assert sum(t.timeouts for t in report.tables) > 0
+
+
+def test_heads_up_all_in_runs_out_board():
+    """Test that a heads-up all-in deals out the board and finishes the game."""
+    report = run_simulation(tables=10, players=2, policy="aggressive", seed=7)
+    assert report.errors == []
+    assert all(t.finished for t in report.tables)
+
+
+def test_simulation_is_reproducible():
+    """Test that the same seed plays the same games."""
+    first = run_simulation(tables=5, players=3, policy="random", seed=42)
+    second = run_simulation(tables=5, players=3, policy="random", seed=42)
+    assert [(t.hands, t.actions) for t in first.tables] == [(t.hands, t.actions) for t in second.tables]
+
+
+def test_check_invariants_detects_lost_chips():
+    """Test that the invariant check notices chips disappearing."""
+    game = Game()
+    game.add_player("alice", 1000)
+    game.add_player("bob", 1000)
+    check_invariants(game, 2000)
+
+    game.players[0].chips -= 1
+    try:
+        check_invariants(game, 2000)
+        assert False, "Expected InvariantViolation"
+    except InvariantViolation:
+        pass
+
+
+def test_blind_levels_escalate_by_hand_count():
+    """Test that a per-table config raises the blinds without touching globals."""
+    config = TableConfig(
+        blind_levels=(BlindLevel(5, 10), BlindLevel(10, 20), BlindLevel(50, 100)),
+        level_hands=3,
+        hand_limit=9,
+        turn_timer_seconds=5,
+    )
+    assert [config.blinds_for(n).big_blind for n in (1, 3, 4, 7, 100)] == [10, 10, 20, 100, 100]
+    assert config.blinds_for(1, elapsed_seconds=10_000).big_blind == 10
+
+    timed = config.with_changes(level_hands=None, level_seconds=60)
+    assert [timed.blinds_for(1, t).big_blind for t in (0, 59, 60, 150)] == [10, 10, 20, 100]
+
+    report = run_simulation(tables=5, players=4, policy="passive", seed=3, config=config)
+    assert report.errors == []
+    assert all(t.hands == 9 for t in report.tables)
+
+
+def test_table_turn_timer_is_used_for_timeouts():
+    """Test that the table's turn timer, not the global one, fires for idle players."""
+    config = TABLE_PRESETS["turbo"].with_changes(hand_limit=2, turn_timer_seconds=2)
+    never_acts = lambda view, rng: None
+    sim = TableSimulator(table_id=0, policies=[never_acts, never_acts], seed=1, config=config)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        result = await sim.run()
+        return result, loop.time() - start
+
+    result, virtual_seconds = run_virtual(run())
+    assert result.finished and result.hands == 2
+    # Each hand: one 2 s timeout (the small blind folds), then the pause after the hand
+    assert virtual_seconds == pytest.approx(2 * (2 + NEXT_HAND_DELAY_SECONDS), abs=0.1)
+    assert virtual_seconds < TURN_TIMER_SECONDS
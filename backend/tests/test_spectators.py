@@ -0,0 +1,134 @@
+"""Tests for spectator channels: shared encoding, hidden or delayed hole cards, slow spectators."""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.api import websocket as websocket_module
+from app.api.spectators import SpectatorChannel
+from app.api.websocket import connection_manager, game_broadcast
+from app.game import game_manager
+from app.sim import run_virtual
+
+
+class FakeSocket:
+    """Records what a spectator is sent; `stalled` sockets never finish a send."""
+
+    def __init__(self, stalled: bool = False):
+        self.stalled = stalled
+        self.sent: list[str] = []
+        self.closed_with = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        if self.stalled:
+            await asyncio.Event().wait()
+        self.sent.append(text)
+
+    async def close(self, code: int = 1000, reason: str = ""):
+        self.closed_with = code
+
+    def types(self) -> list[str]:
+        return [json.loads(text)["type"] for text in self.sent]
+
+
+def hand_started(nickname: str, cards: list) -> dict:
+    return {"type": "hand_started", "payload": {"hand_number": 1, "hole_cards": cards, "dealer": "a"}}
+
+
+def test_one_encode_per_event_for_many_spectators(monkeypatch):
+    """Test that 100 spectators share one encoded copy and never see hole cards."""
+    encodes = []
+
+    def counting_encode(message):
+        encodes.append(message["type"])
+        return json.dumps(message)
+
+    monkeypatch.setattr(websocket_module, "encode_message", counting_encode)
+    sockets = [FakeSocket() for _ in range(100)]
+
+    async def run():
+        channel = SpectatorChannel("g1", delay=0)
+        for socket in sockets:
+            channel.add(socket)
+        channel.publish(hand_started("a", ["Ah", "Kd"]), "a")
+        channel.publish({"type": "blinds_posted", "payload": {}})
+        channel.publish({"type": "player_action", "payload": {"action": "call"}})
+        await asyncio.sleep(0.1)
+        channel.close()
+
+    run_virtual(run())
+    assert encodes == ["blinds_posted", "player_action"]
+    for socket in sockets:
+        assert socket.types() == ["blinds_posted", "player_action"]
+    # The very same string object went to every spectator
+    assert len({id(socket.sent[0]) for socket in sockets}) == 1
+
+
+def test_delayed_channel_reveals_hole_cards():
+    """Test that a delayed channel publishes everyone's cards, late, before the next public event."""
+    socket = FakeSocket()
+    arrivals = []
+
+    async def run():
+        channel = SpectatorChannel("g1", delay=30)
+        channel.add(socket)
+        channel.publish(hand_started("a", ["Ah", "Kd"]), "a")
+        channel.publish(hand_started("b", ["2c", "2s"]), "b")
+        channel.publish({"type": "blinds_posted", "payload": {}})
+        await asyncio.sleep(29)
+        arrivals.append(len(socket.sent))
+        await asyncio.sleep(2)
+        channel.close()
+
+    run_virtual(run())
+    assert arrivals[0] == 0
+    assert socket.types() == ["hole_cards", "blinds_posted"]
+    assert json.loads(socket.sent[0])["payload"]["hole_cards"] == {"a": ["Ah", "Kd"], "b": ["2c", "2s"]}
+
+
+def test_slow_spectator_is_dropped_without_blocking_others():
+    """Test that a stalled spectator fills only its own queue and is then disconnected."""
+    fast, stalled = FakeSocket(), FakeSocket(stalled=True)
+    events = 300
+
+    async def run():
+        channel = SpectatorChannel("g1", delay=0)
+        channel.add(fast)
+        channel.add(stalled)
+        for i in range(events):
+            # Publishing never waits on spectators
+            channel.publish({"type": "player_action", "payload": {"i": i}})
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.1)
+        remaining = len(channel)
+        channel.close()
+        return remaining
+
+    assert run_virtual(run()) == 1
+    assert len(fast.sent) == events
+    assert stalled.closed_with == 4001
+
+
+def test_spectators_join_through_connection_manager():
+    """Test the snapshot on joining, game broadcasts reaching spectators, and channel cleanup."""
+    game = game_manager.create_game("host")
+    socket = FakeSocket()
+
+    async def run():
+        assert await connection_manager.connect_spectator(FakeSocket(), "missing") == "Game not found"
+        assert await connection_manager.connect_spectator(socket, game.id) is None
+        await game_broadcast(game.id, hand_started("host", ["Ah", "Kd"]), "host")
+        await game_broadcast(game.id, {"type": "turn", "payload": {"current_player": "host"}})
+        await asyncio.sleep(0.1)
+        connection_manager.disconnect_spectator(game.id, socket)
+        return game.id in connection_manager._spectator_channels
+
+    assert run_virtual(run()) is False
+    assert socket.types() == ["spectating", "turn"]
+    assert json.loads(socket.sent[0])["payload"]["game"]["id"] == game.id
+    game_manager.remove_game(game.id)
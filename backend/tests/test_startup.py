@@ -0,0 +1,107 @@
+"""Tests for cold start work: the startup profiler and schema versioning."""
+
+import asyncio
+from contextlib import asynccontextmanager
+import subprocess
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from app.db import queries
+from app.startup import StartupProfiler
+
+
+def test_startup_profiler_times_imports_and_phases(tmp_path, monkeypatch):
+    """Test import self/total times and phase records."""
+    (tmp_path / "cold_outer.py").write_text("import time\ntime.sleep(0.02)\nimport cold_inner\n")
+    (tmp_path / "cold_inner.py").write_text("import time\ntime.sleep(0.05)\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    profiler = StartupProfiler()
+    profiler.install()
+    try:
+        import cold_outer  # noqa: F401
+    finally:
+        profiler.uninstall()
+        sys.modules.pop("cold_outer", None)
+        sys.modules.pop("cold_inner", None)
+    with profiler.phase("connect_db"):
+        pass
+    profiler.finish()
+
+    outer_self, outer_total = profiler.imports["cold_outer"]
+    inner_self, inner_total = profiler.imports["cold_inner"]
+    assert inner_self == inner_total >= 0.05
+    assert outer_total == pytest.approx(outer_self + inner_total)
+    assert outer_self >= 0.02
+    assert profiler.slowest_imports(1)[0][0] == "cold_inner"
+    assert [p["name"] for p in profiler.to_dict()["phases"]] == ["connect_db"]
+    assert not profiler.importing
+
+
+class FakeDatabase:
+    """Just enough of `databases.Database` to record what a migration runs."""
+
+    def __init__(self, version=None):
+        self.version = version
+        self.statements: list[str] = []
+
+    async def fetch_val(self, query):
+        if self.version is None:
+            raise RuntimeError('relation "schema_version" does not exist')
+        return self.version
+
+    async def execute(self, query, values=None):
+        self.statements.append(" ".join(query.split()))
+        if values and "version" in values:
+            self.version = values["version"]
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+
+def test_schema_migrates_once(monkeypatch):
+    """Test that DDL runs on a new database and a current one only reads its version."""
+    database = FakeDatabase()
+    monkeypatch.setattr(queries, "database", database)
+
+    assert asyncio.run(queries.migrate_schema()) == queries.SCHEMA_VERSION
+    assert database.version == queries.SCHEMA_VERSION
+    assert database.statements[0].startswith("CREATE TABLE IF NOT EXISTS schema_version")
+    assert any("game_result_players" in s for s in database.statements)
+
+    database.statements.clear()
+    assert asyncio.run(queries.migrate_schema()) == 0
+    assert database.statements == []
+
+
+def test_schema_migrates_from_older_version(monkeypatch):
+    """Test that only the migrations after the stored version run."""
+    database = FakeDatabase(version=1)
+    monkeypatch.setattr(queries, "database", database)
+    monkeypatch.setattr(queries, "MIGRATIONS", queries.MIGRATIONS + [["ALTER TABLE game_results ADD COLUMN hands INTEGER"]])
+    monkeypatch.setattr(queries, "SCHEMA_VERSION", 2)
+
+    assert asyncio.run(queries.migrate_schema()) == 1
+    assert database.statements[1:] == [
+        "ALTER TABLE game_results ADD COLUMN hands INTEGER",
+        "INSERT INTO schema_version (version) VALUES (:version)",
+    ]
+    assert database.version == 2
+
+
+def test_app_import_leaves_optional_engine_parts_unloaded():
+    """Test that importing the app doesn't load equity, bots, tournaments or hand history."""
+    lazy = [
+        "app.game.equity", "app.game.history", "app.bots.manager", "app.bots.strategies",
+        "app.tournament.manager", "app.tournament.tournament", "app.tournament.standings",
+    ]
+    code = f"import sys, app.main; print([m for m in {lazy!r} if m in sys.modules])"
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=Path(__file__).parent.parent,
+        capture_output=True, text=True, check=True,
+    )
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,86 @@
+"""Tests for the in-memory frontend cache: encodings, ETags and cache headers."""
+
+import gzip
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from starlette.requests import Request
+
+from app.static_assets import (
+    IMMUTABLE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL, AssetCache, parse_accept_encoding,
+)
+
+APP_JS = b"export const answer = 42;\n" * 100
+
+
+def make_request(**headers) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "headers": [(k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()],
+    })
+
+
+def build(tmp_path: Path) -> AssetCache:
+    (tmp_path / "_app" / "immutable").mkdir(parents=True)
+    (tmp_path / "index.html").write_text("<html>" + "<div></div>" * 50 + "</html>")
+    (tmp_path / "_app" / "immutable" / "app.abc123.js").write_bytes(APP_JS)
+    (tmp_path / "_app" / "immutable" / "app.abc123.js.gz").write_bytes(b"prebuilt")
+    (tmp_path / "icon.png").write_bytes(b"\x89PNG" + bytes(1000))
+    cache = AssetCache(tmp_path)
+    cache.load()
+    return cache
+
+
+def test_accept_encoding_parsing():
+    """Test q-values, wildcards and refusals in Accept-Encoding."""
+    assert parse_accept_encoding("gzip, deflate, br;q=0.5") == {"gzip": 1.0, "deflate": 1.0, "br": 0.5}
+    assert parse_accept_encoding("identity;q=0, *;q=0.1") == {"identity": 0.0, "*": 0.1}
+    assert parse_accept_encoding("") == {}
+
+
+def test_files_are_cached_with_compressed_variants(tmp_path):
+    """Test indexing: prebuilt siblings are reused and not served as paths, binaries stay plain."""
+    cache = build(tmp_path)
+
+    assert sorted(cache.assets) == ["_app/immutable/app.abc123.js", "icon.png", "index.html"]
+    app_js = cache.get("/_app/immutable/app.abc123.js")
+    assert app_js.cache_control == IMMUTABLE_CACHE_CONTROL
+    assert app_js.encoded["gzip"] == b"prebuilt"
+    assert cache.get("icon.png").encoded == {}
+    index = cache.get("index.html")
+    assert index.cache_control == REVALIDATE_CACHE_CONTROL
+    assert gzip.decompress(index.encoded["gzip"]) == index.body
+
+
+def test_responses_negotiate_encoding_and_etag(tmp_path):
+    """Test Content-Encoding, Vary, per-variant ETags and 304s."""
+    cache = build(tmp_path)
+    index = cache.get("index.html")
+
+    plain = cache.response(make_request(), index)
+    assert plain.body == index.body and "content-encoding" not in plain.headers
+    assert plain.headers["vary"] == "Accept-Encoding"
+
+    zipped = cache.response(make_request(accept_encoding="gzip, deflate"), index)
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(zipped.body) == index.body
+    assert zipped.headers["etag"] != plain.headers["etag"]
+
+    refused = cache.response(make_request(accept_encoding="gzip;q=0"), index)
+    assert "content-encoding" not in refused.headers
+
+    etag = zipped.headers["etag"]
+    cached = cache.response(make_request(accept_encoding="gzip", if_none_match=f"W/{etag}"), index)
+    assert cached.status_code == 304 and cached.body == b""
+    stale = cache.response(make_request(accept_encoding="gzip", if_none_match='"old"'), index)
+    assert stale.status_code == 200
+
+
+def test_spa_fallback(tmp_path):
+    """Test that client-side routes get index.html but missing build files do not."""
+    cache = build(tmp_path)
+    assert cache.lookup("") is cache.get("index.html")
+    assert cache.lookup("game/abc") is cache.get("index.html")
+    assert cache.lookup("_app/immutable/missing.js") is None
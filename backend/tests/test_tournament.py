@@ -0,0 +1,131 @@
+"""Tests for multi-table tournaments: standings index, balancing and final placements."""
+
+import asyncio
+import random
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.game import game_loop as game_loop_module
+from app.game.table_config import TABLE_PRESETS
+from app.sim import POLICIES, run_virtual, turn_view
+from app.tournament import Standings, Tournament, TournamentStatus, TournamentTableLoop, tournament_manager
+from app.tournament.tournament import TableSizes
+
+
+class Field:
+    """Plays every seat of a tournament with a simulator policy and watches the tables."""
+
+    def __init__(self, tournament: Tournament, policy: str, seed: int):
+        self.tournament = tournament
+        self.policy = POLICIES[policy]
+        self.rng = random.Random(seed)
+        self.tasks: set[asyncio.Task] = set()
+        self.unbalanced_deals = 0
+        self.max_tables = 0
+        self.moves = 0
+
+    async def broadcast(self, game_id: str, message: dict, viewer_nickname=None):
+        loop = self.tournament.tables.get(game_id)
+        msg_type = message["type"]
+        if msg_type == "blinds_posted":
+            # A table only deals once it is within one player of the smallest table
+            smallest = self.tournament.sizes.smallest(exclude=game_id)
+            if smallest and self.tournament.sizes[game_id] - smallest[0] > 1:
+                self.unbalanced_deals += 1
+            self.max_tables = max(self.max_tables, len(self.tournament.tables))
+        elif msg_type == "table_changed":
+            self.moves += 1
+        elif msg_type == "turn" and loop:
+            nickname = message["payload"]["current_player"]
+            decision = self.policy(turn_view(loop.game, nickname), self.rng)
+            if decision is None:
+                return  # Let the turn timer fold them
+            asyncio.get_running_loop().call_later(decision.delay, self._act, loop, nickname, decision)
+
+    def _act(self, loop, nickname, decision):
+        task = asyncio.ensure_future(loop.handle_action(nickname, decision.action, decision.params))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+
+def play(entrants: int, policy: str = "random", seed: int = 1) -> tuple[Tournament, Field]:
+    tournament = Tournament("p0", TABLE_PRESETS["turbo"], seed=seed)
+    for i in range(entrants):
+        tournament.register(f"p{i}")
+    field = Field(tournament, policy, seed)
+
+    async def run():
+        await tournament.start(field.broadcast)
+        await asyncio.wait_for(tournament.finished.wait(), 7 * 24 * 3600)
+
+    run_virtual(run())
+    return tournament, field
+
+
+def test_standings_match_sorted_order():
+    """Test Fenwick-tree ranks and k-th stacks against a sort after random updates."""
+    rng = random.Random(3)
+    standings = Standings(total_chips=10_000)
+    stacks = {}
+    for _ in range(2000):
+        nickname = f"p{rng.randrange(60)}"
+        if nickname in stacks and rng.random() < 0.1:
+            standings.remove(nickname)
+            del stacks[nickname]
+        else:
+            stacks[nickname] = rng.randrange(0, 10_001)
+            standings.set(nickname, stacks[nickname])
+
+    ordered = sorted(stacks.values(), reverse=True)
+    assert len(standings) == len(stacks)
+    for nickname, chips in stacks.items():
+        assert standings.rank(nickname) == 1 + sum(1 for c in ordered if c > chips)
+    for rank in range(1, len(ordered) + 1):
+        assert standings.chips_at_rank(rank) == ordered[rank - 1]
+    assert [c for _, c in standings.leaders(5)] == ordered[:5]
+
+
+def test_table_sizes_find_smallest():
+    """Test the size buckets used for balancing decisions."""
+    sizes = TableSizes(max_size=6)
+    for table_id, size in (("a", 6), ("b", 4), ("c", 5)):
+        sizes.set(table_id, size)
+    assert sizes.smallest() == (4, "b")
+    assert sizes.smallest(exclude="b") == (5, "c")
+    sizes.set("b", 6)
+    sizes.remove("c")
+    assert sizes.smallest() == (6, "a") and len(sizes) == 2
+
+
+def test_tournament_plays_down_to_one_winner():
+    """Test a 40-player field: balanced deals, tables broken, every place awarded once."""
+    tournament, field = play(40)
+
+    assert tournament.status == TournamentStatus.FINISHED
+    assert field.max_tables == 7
+    assert field.unbalanced_deals == 0
+    assert field.moves > 0
+
+    positions = sorted(p["position"] for p in tournament.placements)
+    assert positions == list(range(1, 41))
+    winner = tournament.placements[0]
+    assert winner["position"] == 1 and winner["chips"] == 40 * tournament.config.starting_chips
+    assert [p["points"] for p in tournament.placements[:4]] == [10, 5, 2, 1]
+
+    # Every table is closed and unregistered
+    assert not tournament.tables
+    assert not any(isinstance(loop, TournamentTableLoop) for loop in game_loop_module.game_loops.values())
+
+
+def test_tournament_registration_rules():
+    """Test registration and start checks in the tournament manager."""
+    tournament = tournament_manager.create_tournament("host")
+    assert tournament_manager.register(tournament.id, "host") == (None, "A player with this nickname is already registered")
+    _, error = tournament_manager.check_start(tournament.id, "host")
+    assert error == "Need at least 2 players to start"
+
+    tournament_manager.register(tournament.id, "guest")
+    assert tournament_manager.check_start(tournament.id, "guest")[1] == "Only the creator can start the tournament"
+    assert tournament_manager.check_start(tournament.id, "host") == (tournament, None)
+    assert tournament.to_dict()["entrant_count"] == 2
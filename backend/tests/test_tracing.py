@@ -0,0 +1,56 @@
+"""Tests for per-hand span tracing."""
+
+import json
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.sim import run_simulation
+from app.tracing import NO_SPAN, Tracer, tracer
+
+
+def test_child_span_outside_traced_hand_is_noop():
+    """Test that spans below an untraced step are not recorded."""
+    local = Tracer(sample_rate=0.0, capacity=10)
+    assert local.sample() is False
+    assert local.child("encode") is NO_SPAN
+    with local.span("action", "g1", 3, player="alice"):
+        with local.child("encode"):
+            pass
+    assert [s.name for s in local.spans] == ["encode", "action"]
+    assert local.spans[0].game_id == "g1" and local.spans[0].hand_number == 3
+
+
+def test_ring_buffer_keeps_newest():
+    """Test that the buffer drops the oldest spans when full."""
+    local = Tracer(sample_rate=1.0, capacity=3)
+    for i in range(5):
+        with local.span("action", "g1", i):
+            pass
+    assert [s.hand_number for s in local.spans] == [2, 3, 4]
+
+
+def test_simulated_hands_emit_lifecycle_spans():
+    """Test that a traced game records every lifecycle step, exportable in both formats."""
+    tracer.clear()
+    tracer.sample_rate = 1.0
+    try:
+        report = run_simulation(tables=1, players=3, policy="random", seed=5)
+    finally:
+        tracer.sample_rate = 0.0
+    assert report.errors == []
+
+    names = {s.name for s in tracer.spans}
+    assert {"start_hand", "post_blinds", "action", "resolve_hand", "check_eliminations"} <= names
+    assert names & {"deal_community_cards", "run_out"}  # Boards are dealt street by street or all at once
+    hands = {s.hand_number for s in tracer.spans}
+    assert hands == set(range(1, report.hands + 1))
+
+    lines = list(tracer.export_jsonl())
+    assert len(lines) == len(tracer.spans)
+    assert json.loads(lines[0])["game_id"] == tracer.spans[0].game_id
+
+    chrome = tracer.export_chrome()["traceEvents"]
+    assert sum(1 for e in chrome if e["ph"] == "X") == len(tracer.spans)
+    assert sum(1 for e in chrome if e["ph"] == "M") == 1
+    tracer.clear()
@@ -0,0 +1,128 @@
+"""
+Build the preflop equity table shipped as app/game/data/preflop_equity.bin.
+
+For each of the 169 starting hands, deals random opponent hands and boards
+and scores them with hand_value. Every deal is used against 1, 2 and 3
+opponents (the first n opponent hands), so one simulation fills all three
+columns. Equity is the average share of the pot, with ties split.
+
+    python -m tools.gen_preflop_tables                  # 50,000 deals per hand
+    python -m tools.gen_preflop_tables --trials 2000 --output /tmp/quick.bin
+
+File layout (little-endian): header PREFLOP_HEADER_FORMAT (magic, version,
+max opponents, hands, trials), then 169 x max-opponents uint16 equities
+scaled to 0-65535, row-major by starting_hand_index.
+"""
+
+import argparse
+import multiprocessing
+import random
+import struct
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.game.poker import (
+    FULL_DECK,
+    PREFLOP_HEADER_FORMAT,
+    PREFLOP_TABLE_MAGIC,
+    PREFLOP_TABLE_PATH,
+    PREFLOP_TABLE_VERSION,
+    STARTING_HANDS,
+    Card,
+    Rank,
+    Suit,
+    hand_value,
+    starting_hand_name,
+)
+
+MAX_OPPONENTS = 3
+DEFAULT_TRIALS = 50_000
+
+
+def representative_cards(index: int) -> list[Card]:
+    """Two hole cards for a starting hand index (suits are arbitrary)."""
+    row, col = divmod(index, 13)
+    if row == col:
+        return [Card(Rank(row + 2), Suit.CLUBS), Card(Rank(row + 2), Suit.DIAMONDS)]
+    if row > col:
+        return [Card(Rank(row + 2), Suit.CLUBS), Card(Rank(col + 2), Suit.CLUBS)]
+    return [Card(Rank(col + 2), Suit.CLUBS), Card(Rank(row + 2), Suit.DIAMONDS)]
+
+
+def simulate_hand(args: tuple[int, int, int]) -> tuple[int, list[float]]:
+    """Equity of one starting hand against 1..MAX_OPPONENTS random hands."""
+    index, trials, seed = args
+    rng = random.Random(seed * 1000 + index)
+    hero = representative_cards(index)
+    deck = [c for c in FULL_DECK if c not in hero]
+    needed = 5 + 2 * MAX_OPPONENTS
+    shares = [0.0] * MAX_OPPONENTS
+
+    for _ in range(trials):
+        cards = rng.sample(deck, needed)
+        board = cards[:5]
+        mine = hand_value(hero + board)
+        best_other = -1
+        ties = 0
+        for n in range(MAX_OPPONENTS):
+            value = hand_value(cards[5 + 2 * n:7 + 2 * n] + board)
+            if value > best_other:
+                best_other, ties = value, 1
+            elif value == best_other:
+                ties += 1
+            # Result against the first n + 1 opponents
+            if mine > best_other:
+                shares[n] += 1.0
+            elif mine == best_other:
+                shares[n] += 1.0 / (ties + 1)
+
+    return index, [s / trials for s in shares]
+
+
+def build_table(trials: int, seed: int, workers: int, progress: bool = False) -> list[list[float]]:
+    table: list[list[float]] = [[] for _ in range(STARTING_HANDS)]
+    jobs = [(index, trials, seed) for index in range(STARTING_HANDS)]
+    start = time.perf_counter()
+    with multiprocessing.Pool(workers) as pool:
+        for done, (index, equities) in enumerate(pool.imap_unordered(simulate_hand, jobs), 1):
+            table[index] = equities
+            if progress:
+                elapsed = time.perf_counter() - start
+                print(
+                    f"\r{done}/{STARTING_HANDS} {starting_hand_name(index):>3} "
+                    f"{' '.join(f'{e:.3f}' for e in equities)}  {elapsed:.0f}s",
+                    end="", file=sys.stderr, flush=True,
+                )
+    if progress:
+        print(file=sys.stderr)
+    return table
+
+
+def write_table(path: Path, table: list[list[float]], trials: int):
+    header = struct.pack(
+        PREFLOP_HEADER_FORMAT, PREFLOP_TABLE_MAGIC, PREFLOP_TABLE_VERSION, MAX_OPPONENTS, STARTING_HANDS, trials
+    )
+    values = [round(e * 65535) for row in table for e in row]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(header + struct.pack(f"<{len(values)}H", *values))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Build the preflop equity table.")
+    parser.add_argument("--trials", type=int, default=DEFAULT_TRIALS, help="random deals per starting hand")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, help="processes to use (default: all cores)")
+    parser.add_argument("--output", type=Path, default=PREFLOP_TABLE_PATH)
+    args = parser.parse_args(argv)
+
+    table = build_table(args.trials, args.seed, args.workers, progress=True)
+    write_table(args.output, table, args.trials)
+    print(f"Wrote {args.output} ({args.output.stat().st_size} bytes)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,400 @@
+"""
+WebSocket load generator.
+
+Drives a running server (or a local uvicorn it starts itself) with scripted bot
+clients over the real REST and WebSocket endpoints, and reports connection
+counts, action fan-out latency and server CPU / memory.
+
+    python -m tools.loadgen --spawn --tables 25 --players 4 --lobby 50 --duration 60 \\
+        --output results/loadgen-25x4.json
+"""
+
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse
+
+import websockets
+
+
+BACKEND_DIR = Path(__file__).parent.parent
+PONG = json.dumps({"type": "pong"})
+
+
+@dataclass
+class Stats:
+    game_connections: int = 0
+    lobby_connections: int = 0
+    peak_connections: int = 0
+    failed_connections: int = 0
+    messages_received: int = 0
+    actions_sent: int = 0
+    games_started: int = 0
+    games_finished: int = 0
+    errors: list[str] = field(default_factory=list)
+    fanout_latencies: list[float] = field(default_factory=list)  # seconds
+    # (game_id, nickname) -> time the player's last action was sent
+    pending_actions: dict[tuple[str, str], float] = field(default_factory=dict)
+
+    def connected(self, lobby: bool = False):
+        if lobby:
+            self.lobby_connections += 1
+        else:
+            self.game_connections += 1
+        self.peak_connections = max(self.peak_connections, self.game_connections + self.lobby_connections)
+
+    def disconnected(self, lobby: bool = False):
+        if lobby:
+            self.lobby_connections -= 1
+        else:
+            self.game_connections -= 1
+
+
+def percentiles(samples: list[float]) -> dict:
+    """p50/p90/p99/max of latency samples, in milliseconds."""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def pick(pct: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] * 1000, 3)
+
+    return {
+        "count": len(ordered),
+        "p50": pick(50),
+        "p90": pick(90),
+        "p99": pick(99),
+        "max": round(ordered[-1] * 1000, 3),
+    }
+
+
+class ServerProcess:
+    """CPU and memory of the server process, read from /proc (Linux only)."""
+
+    def __init__(self, pid: Optional[int]):
+        self.pid = pid
+        self.rss_samples: list[int] = []
+
+    @property
+    def available(self) -> bool:
+        return self.pid is not None and Path(f"/proc/{self.pid}/stat").exists()
+
+    def cpu_seconds(self) -> Optional[float]:
+        if not self.available:
+            return None
+        fields = Path(f"/proc/{self.pid}/stat").read_text().rsplit(")", 1)[1].split()
+        # utime and stime are fields 14 and 15 of /proc/<pid>/stat
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+    def rss_bytes(self) -> Optional[int]:
+        if not self.available:
+            return None
+        for line in Path(f"/proc/{self.pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+        return None
+
+    def sample(self):
+        rss = self.rss_bytes()
+        if rss is not None:
+            self.rss_samples.append(rss)
+
+
+async def http_json(base_url: str, method: str, path: str, body: Optional[dict] = None) -> dict:
+    """Make a JSON request with the standard library, off the event loop."""
+    url = urlparse(base_url)
+
+    def request() -> dict:
+        conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=10)
+        try:
+            payload = json.dumps(body) if body is not None else None
+            conn.request(method, path, body=payload, headers={"Content-Type": "application/json"})
+            response = conn.getresponse()
+            data = json.loads(response.read() or b"{}")
+            if response.status >= 400:
+                raise RuntimeError(f"{method} {path} -> {response.status}: {data}")
+            return data
+        finally:
+            conn.close()
+
+    return await asyncio.to_thread(request)
+
+
+class BotClient:
+    """One scripted player connected to /ws/game/{id}."""
+
+    def __init__(self, ws_url: str, game_id: str, nickname: str, creator: str,
+                 stats: Stats, rng: random.Random, think: float):
+        self.ws_url = ws_url
+        self.game_id = game_id
+        self.nickname = nickname
+        self.is_creator = nickname == creator
+        self.stats = stats
+        self.rng = rng
+        self.think = think
+        self.ws = None
+
+    async def run(self, stop: asyncio.Event, start_game: bool = False):
+        uri = f"{self.ws_url}/ws/game/{self.game_id}?nickname={self.nickname}"
+        try:
+            async with websockets.connect(uri, max_queue=None) as ws:
+                self.ws = ws
+                self.stats.connected()
+                try:
+                    if start_game:
+                        await ws.send(json.dumps({"type": "start_game"}))
+                    await self._listen(ws, stop)
+                finally:
+                    self.stats.disconnected()
+        except Exception as e:  # noqa: BLE001 - any failure is a data point
+            self.stats.failed_connections += 1
+            self.stats.errors.append(f"{self.nickname}@{self.game_id[:8]}: {type(e).__name__}: {e}")
+
+    async def _listen(self, ws, stop: asyncio.Event):
+        while not stop.is_set():
+            try:
+                raw = await asyncio.wait_for(ws.recv(), timeout=0.5)
+            except asyncio.TimeoutError:
+                continue
+            received = time.perf_counter()
+            message = json.loads(raw)
+            msg_type = message.get("type")
+            payload = message.get("payload", {})
+            if msg_type == "ping":
+                await _pong(ws)
+                continue
+            self.stats.messages_received += 1
+
+            if msg_type == "player_action":
+                actor = payload.get("nickname")
+                sent = self.stats.pending_actions.get((self.game_id, actor))
+                if actor != self.nickname and sent is not None:
+                    self.stats.fanout_latencies.append(received - sent)
+            elif msg_type == "turn" and payload.get("current_player") == self.nickname:
+                asyncio.create_task(self._act(ws, payload.get("valid_actions", {})))
+            elif msg_type == "game_started" and self.is_creator:
+                self.stats.games_started += 1
+            elif msg_type == "game_ended":
+                if self.is_creator:
+                    self.stats.games_finished += 1
+                return
+
+    async def _act(self, ws, valid_actions: dict):
+        await asyncio.sleep(self.rng.uniform(0, self.think))
+        roll = self.rng.random()
+        if "check" in valid_actions:
+            action = "check"
+        elif roll < 0.15:
+            action = "fold"
+        else:
+            action = "call"
+        self.stats.pending_actions[(self.game_id, self.nickname)] = time.perf_counter()
+        try:
+            await ws.send(json.dumps({"type": "action", "action": action, "params": {}}))
+            self.stats.actions_sent += 1
+        except websockets.ConnectionClosed:
+            pass
+
+
+async def _pong(ws):
+    """Answer a heartbeat ping, as the web client does (the server closes silent sockets)."""
+    try:
+        await ws.send(PONG)
+    except websockets.ConnectionClosed:
+        pass
+
+
+async def lobby_client(ws_url: str, stats: Stats, stop: asyncio.Event):
+    """A passive lobby subscriber that only receives lobby_update messages."""
+    try:
+        async with websockets.connect(f"{ws_url}/ws/lobby", max_queue=None) as ws:
+            stats.connected(lobby=True)
+            try:
+                while not stop.is_set():
+                    try:
+                        raw = await asyncio.wait_for(ws.recv(), timeout=0.5)
+                    except asyncio.TimeoutError:
+                        continue
+                    if json.loads(raw).get("type") == "ping":
+                        await _pong(ws)
+                    else:
+                        stats.messages_received += 1
+            finally:
+                stats.disconnected(lobby=True)
+    except Exception as e:  # noqa: BLE001
+        stats.failed_connections += 1
+        stats.errors.append(f"lobby: {type(e).__name__}: {e}")
+
+
+async def run_table(base_url: str, ws_url: str, players: int, stats: Stats, stop: asyncio.Event,
+                    rng: random.Random, think: float):
+    """Create a game over REST, join all players, connect them and start playing."""
+    tag = f"{rng.getrandbits(32):08x}"
+    nicknames = [f"{tag}-p{i}" for i in range(players)]
+    created = await http_json(base_url, "POST", "/api/games", {"nickname": nicknames[0]})
+    game_id = created["game"]["id"]
+    for nickname in nicknames[1:]:
+        await http_json(base_url, "POST", f"/api/games/{game_id}/join", {"nickname": nickname})
+
+    bots = [BotClient(ws_url, game_id, nickname, nicknames[0], stats, rng, think) for nickname in nicknames]
+    # Everyone else must be connected before the creator starts the game
+    tasks = [asyncio.create_task(bot.run(stop)) for bot in bots[1:]]
+    while not stop.is_set() and not all(t.done() for t in tasks) and not all(b.ws for b in bots[1:]):
+        await asyncio.sleep(0.05)
+    tasks.append(asyncio.create_task(bots[0].run(stop, start_game=True)))
+    await asyncio.gather(*tasks)
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spawn_server(port: int) -> subprocess.Popen:
+    """Start uvicorn for app.main:app without a database."""
+    env = dict(os.environ, DATABASE_URL="")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+
+
+async def wait_for_health(base_url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            await http_json(base_url, "GET", "/api/health")
+            return
+        except Exception:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.2)
+
+
+async def run_load(args) -> dict:
+    server = None
+    base_url = args.url
+    pid = args.server_pid
+    if args.spawn:
+        port = free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        server = spawn_server(port)
+        pid = server.pid
+    ws_url = base_url.replace("http", "ws", 1)
+
+    try:
+        await wait_for_health(base_url)
+        proc = ServerProcess(pid)
+        proc.sample()
+        cpu_start = proc.cpu_seconds()
+
+        stats = Stats()
+        stop = asyncio.Event()
+        rng = random.Random(args.seed)
+        started = time.perf_counter()
+
+        lobby_tasks = [asyncio.create_task(lobby_client(ws_url, stats, stop)) for _ in range(args.lobby)]
+        table_tasks = []
+        for _ in range(args.tables):
+            table_tasks.append(asyncio.create_task(
+                run_table(base_url, ws_url, args.players, stats, stop, random.Random(rng.random()), args.think)
+            ))
+            if args.ramp:
+                await asyncio.sleep(args.ramp)
+
+        deadline = started + args.duration
+        while time.perf_counter() < deadline and not all(t.done() for t in table_tasks):
+            proc.sample()
+            await asyncio.sleep(1.0)
+        proc.sample()
+        game_connections_at_stop = stats.game_connections
+        stop.set()
+        results = await asyncio.gather(*table_tasks, *lobby_tasks, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                stats.errors.append(f"{type(result).__name__}: {result}")
+        elapsed = time.perf_counter() - started
+        cpu_end = proc.cpu_seconds()
+    finally:
+        if server:
+            server.terminate()
+            server.wait(timeout=10)
+
+    cpu = (cpu_end - cpu_start) if cpu_start is not None and cpu_end is not None else None
+    rss = proc.rss_samples
+    mb = 1024 * 1024
+    return {
+        "config": {
+            "url": base_url,
+            "tables": args.tables,
+            "players": args.players,
+            "lobby_clients": args.lobby,
+            "duration": args.duration,
+            "think": args.think,
+            "seed": args.seed,
+        },
+        "elapsed_seconds": round(elapsed, 2),
+        "connections": {
+            "peak": stats.peak_connections,
+            "game_at_stop": game_connections_at_stop,
+            "failed": stats.failed_connections,
+        },
+        "games": {"started": stats.games_started, "finished": stats.games_finished},
+        "messages_received": stats.messages_received,
+        "messages_per_sec": round(stats.messages_received / elapsed, 1),
+        "actions_sent": stats.actions_sent,
+        "fanout_latency_ms": percentiles(stats.fanout_latencies),
+        "server": {
+            "pid": pid,
+            "cpu_seconds": round(cpu, 3) if cpu is not None else None,
+            "cpu_percent": round(100 * cpu / elapsed, 1) if cpu is not None else None,
+            "cpu_seconds_per_table": round(cpu / args.tables, 4) if cpu is not None and args.tables else None,
+            "rss_start_mb": round(rss[0] / mb, 1) if rss else None,
+            "rss_peak_mb": round(max(rss) / mb, 1) if rss else None,
+            "rss_end_mb": round(rss[-1] / mb, 1) if rss else None,
+            "rss_growth_mb": round((rss[-1] - rss[0]) / mb, 1) if rss else None,
+        },
+        "errors": stats.errors[:50],
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load test the game server with bot WebSocket clients.")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", default="http://127.0.0.1:8000", help="server to test")
+    target.add_argument("--spawn", action="store_true", help="start a local uvicorn on a free port")
+    parser.add_argument("--server-pid", type=int, help="pid of the server, for CPU/memory (with --url)")
+    parser.add_argument("--tables", type=int, default=10)
+    parser.add_argument("--players", type=int, default=4, help="players per table")
+    parser.add_argument("--lobby", type=int, default=0, help="extra clients subscribed to /ws/lobby")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds to run")
+    parser.add_argument("--think", type=float, default=0.2, help="max seconds a bot waits before acting")
+    parser.add_argument("--ramp", type=float, default=0.0, help="seconds between starting tables")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_load(args))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text)
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
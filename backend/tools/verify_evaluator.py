@@ -0,0 +1,360 @@
+"""
+Verify a hand evaluator against the reference evaluator in app.game.poker.
+
+A candidate is any function that takes a list of Cards and returns a key that
+sorts like hand strength (an int, a tuple, a HandResult, ...). It matches the
+reference when every reference hand class maps to exactly one candidate key
+and the mapping preserves order. Each worker only needs to return one map
+entry per distinct class (7,462 for five cards), so checking all 2,598,960
+five-card hands is cheap to merge.
+
+    python -m tools.verify_evaluator app.game.poker:evaluate_hand
+    python -m tools.verify_evaluator mymodule:fast_eval --seven 1000000 --workers 4
+    python -m tools.verify_evaluator mymodule:fast_eval --exhaustive-seven --output eval.json
+"""
+
+import argparse
+from dataclasses import dataclass, field
+from importlib import import_module
+from itertools import combinations, islice
+import json
+import multiprocessing
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.game.poker import FULL_DECK, HandRank, HandResult, evaluate_five_cards, evaluate_hand
+
+
+# Number of hands in each class, over all 5-card and all 7-card hands
+FIVE_CARD_CLASS_COUNTS = {
+    HandRank.HIGH_CARD: 1302540,
+    HandRank.PAIR: 1098240,
+    HandRank.TWO_PAIR: 123552,
+    HandRank.THREE_OF_A_KIND: 54912,
+    HandRank.STRAIGHT: 10200,
+    HandRank.FLUSH: 5108,
+    HandRank.FULL_HOUSE: 3744,
+    HandRank.FOUR_OF_A_KIND: 624,
+    HandRank.STRAIGHT_FLUSH: 40,
+}
+SEVEN_CARD_CLASS_COUNTS = {
+    HandRank.HIGH_CARD: 23294460,
+    HandRank.PAIR: 58627800,
+    HandRank.TWO_PAIR: 31433400,
+    HandRank.THREE_OF_A_KIND: 6461620,
+    HandRank.STRAIGHT: 6180020,
+    HandRank.FLUSH: 4047644,
+    HandRank.FULL_HOUSE: 3473184,
+    HandRank.FOUR_OF_A_KIND: 224848,
+    HandRank.STRAIGHT_FLUSH: 41584,
+}
+# Distinct hand values: 5-card hands can make 7,462; best-of-7 hands only 4,824
+FIVE_CARD_DISTINCT = 7462
+SEVEN_CARD_DISTINCT = 4824
+
+REFERENCE = "reference"
+
+# Hands evaluated per batch inside a worker
+BATCH_SIZE = 50_000
+
+
+def load_evaluator(spec: str) -> Callable:
+    """Resolve 'reference' or 'package.module:function'."""
+    if spec == REFERENCE:
+        return evaluate_hand
+    module_name, _, attr = spec.partition(":")
+    if not attr:
+        raise ValueError(f"Evaluator must look like module:function, got {spec!r}")
+    return getattr(import_module(module_name), attr)
+
+
+def normalize(result):
+    """Make HandResults hashable and comparable by value; leave other keys alone."""
+    if isinstance(result, HandResult):
+        return (int(result.rank), tuple(int(v) for v in result.values))
+    return result
+
+
+@dataclass
+class ChunkResult:
+    hands: int = 0
+    # reference key -> (candidate key, example hand as text)
+    mapping: dict = field(default_factory=dict)
+    # reference key -> (other candidate key, example) where a class got two candidate keys
+    conflicts: list = field(default_factory=list)
+    class_counts: dict = field(default_factory=dict)
+    reference_seconds: float = 0.0
+    candidate_seconds: float = 0.0
+
+    def merge(self, other: "ChunkResult"):
+        self.hands += other.hands
+        self.reference_seconds += other.reference_seconds
+        self.candidate_seconds += other.candidate_seconds
+        self.conflicts.extend(other.conflicts)
+        for rank, count in other.class_counts.items():
+            self.class_counts[rank] = self.class_counts.get(rank, 0) + count
+        for ref_key, (cand_key, example) in other.mapping.items():
+            seen = self.mapping.get(ref_key)
+            if seen is None:
+                self.mapping[ref_key] = (cand_key, example)
+            elif seen[0] != cand_key and len(self.conflicts) < 20:
+                self.conflicts.append((ref_key, seen, (cand_key, example)))
+
+
+_candidate: Optional[Callable] = None
+
+
+def _init_worker(spec: str):
+    global _candidate
+    _candidate = load_evaluator(spec)
+
+
+def _check_hands(hands) -> ChunkResult:
+    """Evaluate hands with both evaluators, in batches to bound memory."""
+    total = ChunkResult()
+    hands = iter(hands)
+    while True:
+        batch = list(islice(hands, BATCH_SIZE))
+        if not batch:
+            return total
+        total.merge(_check_batch(batch))
+
+
+def _check_batch(hands: list) -> ChunkResult:
+    """Evaluate a batch with both evaluators and collect the class mapping."""
+    reference = evaluate_five_cards
+    candidate = _candidate
+    result = ChunkResult()
+    mapping = result.mapping
+    counts = result.class_counts
+    ref_keys = []
+
+    start = time.perf_counter()
+    for cards in hands:
+        ref = evaluate_hand(cards) if len(cards) > 5 else reference(cards)
+        ref_keys.append((int(ref.rank), tuple(int(v) for v in ref.values)))
+    result.reference_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cand_keys = [normalize(candidate(cards)) for cards in hands]
+    result.candidate_seconds = time.perf_counter() - start
+
+    for cards, ref_key, cand_key in zip(hands, ref_keys, cand_keys):
+        counts[ref_key[0]] = counts.get(ref_key[0], 0) + 1
+        seen = mapping.get(ref_key)
+        if seen is None:
+            mapping[ref_key] = (cand_key, " ".join(str(c) for c in cards))
+        elif seen[0] != cand_key and len(result.conflicts) < 20:
+            result.conflicts.append((ref_key, seen, (cand_key, " ".join(str(c) for c in cards))))
+    result.hands = len(hands)
+    return result
+
+
+def _five_card_chunk(first: int) -> ChunkResult:
+    """All five-card hands whose lowest card is FULL_DECK[first]."""
+    deck = FULL_DECK
+    head = deck[first]
+    return _check_hands(
+        [head, *(deck[i] for i in rest)] for rest in combinations(range(first + 1, 52), 4)
+    )
+
+
+def _seven_card_chunk(pair: tuple[int, int]) -> ChunkResult:
+    """All seven-card hands whose two lowest cards are FULL_DECK[pair[0]], FULL_DECK[pair[1]]."""
+    deck = FULL_DECK
+    a, b = pair
+    head = [deck[a], deck[b]]
+    return _check_hands(
+        head + [deck[i] for i in rest] for rest in combinations(range(b + 1, 52), 5)
+    )
+
+
+def _sampled_chunk(args: tuple[int, int, int]) -> ChunkResult:
+    """`count` random hands of `size` cards, from a per-chunk seed."""
+    seed, count, size = args
+    rng = random.Random(seed)
+    return _check_hands(rng.sample(FULL_DECK, size) for _ in range(count))
+
+
+@dataclass
+class Report:
+    evaluator: str
+    mode: str
+    hands: int
+    seconds: float
+    errors: list[str]
+    class_counts: dict
+    distinct_classes: int
+    reference_evals_per_sec: float
+    candidate_evals_per_sec: float
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def to_dict(self) -> dict:
+        return {
+            "evaluator": self.evaluator,
+            "mode": self.mode,
+            "ok": self.ok,
+            "hands": self.hands,
+            "seconds": round(self.seconds, 2),
+            "distinct_classes": self.distinct_classes,
+            "class_counts": {HandRank(r).name: c for r, c in sorted(self.class_counts.items())},
+            "evals_per_sec": {
+                "reference": round(self.reference_evals_per_sec),
+                "candidate": round(self.candidate_evals_per_sec),
+            },
+            "errors": self.errors,
+        }
+
+
+def check_ordering(total: ChunkResult) -> list[str]:
+    """Candidate keys must be one per reference class and sort in the same order."""
+    errors = []
+    for ref_key, first, second in total.conflicts:
+        errors.append(
+            f"Reference class {ref_key} got two candidate keys: "
+            f"{first[0]!r} ({first[1]}) and {second[0]!r} ({second[1]})"
+        )
+
+    ordered = sorted(total.mapping.items())
+    for (lo_ref, (lo_cand, lo_ex)), (hi_ref, (hi_cand, hi_ex)) in zip(ordered, ordered[1:]):
+        if not lo_cand < hi_cand:
+            errors.append(
+                f"Order mismatch: reference ranks {hi_ref} ({hi_ex}) above {lo_ref} ({lo_ex}), "
+                f"but candidate gives {hi_cand!r} vs {lo_cand!r}"
+            )
+            if len(errors) >= 20:
+                break
+    return errors
+
+
+def verify(
+    spec: str,
+    mode: str = "five",
+    samples: int = 200_000,
+    workers: Optional[int] = None,
+    seed: int = 0,
+    progress: bool = False,
+) -> Report:
+    """
+    Compare an evaluator to the reference.
+
+    mode is "five" (all 2,598,960 five-card hands), "seven" (`samples` random
+    seven-card hands), "seven-exhaustive" (all 133,784,560 seven-card hands) or
+    "five-sampled" (`samples` random five-card hands).
+    """
+    chunk_size = 10_000
+    if mode == "five":
+        func, jobs = _five_card_chunk, list(range(48))
+    elif mode == "seven-exhaustive":
+        func, jobs = _seven_card_chunk, [(a, b) for a in range(46) for b in range(a + 1, 47)]
+    elif mode in ("seven", "five-sampled"):
+        size = 7 if mode == "seven" else 5
+        func = _sampled_chunk
+        jobs = [
+            (seed * 1_000_003 + i, min(chunk_size, samples - i * chunk_size), size)
+            for i in range((samples + chunk_size - 1) // chunk_size)
+        ]
+    else:
+        raise ValueError(f"Unknown mode: {mode}")
+
+    total = ChunkResult()
+    started = time.perf_counter()
+    workers = workers or multiprocessing.cpu_count()
+
+    if workers == 1:
+        _init_worker(spec)
+        results = map(func, jobs)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(workers, initializer=_init_worker, initargs=(spec,))
+        results = pool.imap_unordered(func, jobs)
+
+    try:
+        for done, chunk in enumerate(results, 1):
+            total.merge(chunk)
+            if progress:
+                elapsed = time.perf_counter() - started
+                print(
+                    f"\r{done}/{len(jobs)} chunks, {total.hands:,} hands, "
+                    f"{total.hands / elapsed:,.0f} hands/s",
+                    end="", file=sys.stderr, flush=True,
+                )
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+    if progress:
+        print(file=sys.stderr)
+
+    errors = check_ordering(total)
+    if mode == "five":
+        expected_counts, expected_distinct = FIVE_CARD_CLASS_COUNTS, FIVE_CARD_DISTINCT
+    elif mode == "seven-exhaustive":
+        expected_counts, expected_distinct = SEVEN_CARD_CLASS_COUNTS, SEVEN_CARD_DISTINCT
+    else:
+        expected_counts, expected_distinct = None, None
+
+    if expected_counts:
+        for rank, expected in expected_counts.items():
+            got = total.class_counts.get(int(rank), 0)
+            if got != expected:
+                errors.append(f"{rank.name}: reference counted {got:,} hands, expected {expected:,}")
+        if len(total.mapping) != expected_distinct:
+            errors.append(f"Found {len(total.mapping):,} distinct hand values, expected {expected_distinct:,}")
+
+    return Report(
+        evaluator=spec,
+        mode=mode,
+        hands=total.hands,
+        seconds=time.perf_counter() - started,
+        errors=errors,
+        class_counts=total.class_counts,
+        distinct_classes=len(total.mapping),
+        reference_evals_per_sec=total.hands / total.reference_seconds if total.reference_seconds else 0.0,
+        candidate_evals_per_sec=total.hands / total.candidate_seconds if total.candidate_seconds else 0.0,
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check an evaluator against the reference evaluator.")
+    parser.add_argument("evaluator", nargs="?", default=REFERENCE, help="module:function, or 'reference'")
+    parser.add_argument("--skip-five", action="store_true", help="skip the exhaustive five-card check")
+    parser.add_argument("--seven", type=int, default=200_000, help="random seven-card hands to check (0 to skip)")
+    parser.add_argument("--exhaustive-seven", action="store_true", help="check all 133,784,560 seven-card hands")
+    parser.add_argument("--workers", type=int, help="processes to use (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="write the JSON report (incl. evaluations/sec) here")
+    args = parser.parse_args(argv)
+
+    modes = []
+    if not args.skip_five:
+        modes.append(("five", 0))
+    if args.exhaustive_seven:
+        modes.append(("seven-exhaustive", 0))
+    elif args.seven:
+        modes.append(("seven", args.seven))
+
+    reports = []
+    for mode, samples in modes:
+        print(f"Checking {args.evaluator} ({mode})", file=sys.stderr)
+        report = verify(args.evaluator, mode, samples=samples, workers=args.workers, seed=args.seed, progress=True)
+        reports.append(report.to_dict())
+
+    text = json.dumps(reports, indent=2)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text)
+    print(text)
+    return 0 if all(r["ok"] for r in reports) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
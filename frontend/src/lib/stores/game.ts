@@ -3,6 +3,7 @@
 export interface GamePlayer {
   nickname: string;
   chips: number;
+  seat: number;
   is_eliminated: boolean;
   elimination_position: number | null;
 }
@@ -15,6 +16,7 @@ export interface Game {
   player_count: number;
   current_hand_num: number;
   dealer_position: number;
+  seat_count: number;
   created_at: string;
   active_hand?: any;
 }
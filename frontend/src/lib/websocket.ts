@@ -31,6 +31,11 @@ class WebSocketClient {
         this.ws.onmessage = (event) => {
           try {
             const message = JSON.parse(event.data);
+            if (message.type === 'ping') {
+              // Heartbeat: the server closes sockets that stop answering
+              this.send('pong');
+              return;
+            }
             this.emit(message.type, message);
           } catch (e) {
             console.error('Failed to parse message:', event.data);